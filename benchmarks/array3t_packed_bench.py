@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Memory footprint and bulk conversion time of Array3val with dict and packed storage
+
+python3 -m benchmarks.array3t_packed_bench [number of items]
+"""
+
+import sys
+from timeit import default_timer
+import tracemalloc
+
+from pyMathBitPrecise.array3t import Array3t, ARRAY3T_STORAGE_DICT, ARRAY3T_STORAGE_PACKED
+from pyMathBitPrecise.bits3t import Bits3t
+
+
+def measure(storage: str, n: int):
+    t = Array3t(Bits3t(32), n, storage=storage)
+    data = [(i * 2654435761) & 0xffffffff for i in range(n)]
+    tracemalloc.start()
+    start = default_timer()
+    v = t.from_py(data)
+    from_py_time = default_timer() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = default_timer()
+    res = v.to_py()
+    to_py_time = default_timer() - start
+    assert res == data
+    return size, from_py_time, to_py_time
+
+
+def main(n: int):
+    print(f"items: {n:d}")
+    for storage in (ARRAY3T_STORAGE_DICT, ARRAY3T_STORAGE_PACKED):
+        size, from_py_time, to_py_time = measure(storage, n)
+        print(f"{storage:6s} {size / n:6.1f} B/item, from_py {from_py_time:.3f}s, to_py {to_py_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 16)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+ctpop/ctlz/cttz compared with the original bisection and SWAR loops and with the batched kernels
+
+python3 -m benchmarks.bit_count_bench [number of values]
+"""
+
+from random import Random
+import sys
+from timeit import default_timer
+
+import numpy as np
+
+from pyMathBitPrecise.bit_utils import ctpop, ctlz, cttz, _ctpop_swar, \
+    _ctlz_bisection, _cttz_bisection
+from pyMathBitPrecise.bits3t_batch import batch_ctpop, batch_ctlz, batch_cttz
+from pyMathBitPrecise.limb_utils import ints_to_limbs, limb_cnt
+
+
+def main(n: int):
+    rand = Random(0)
+    print(f"values: {n:d}")
+    for width in (32, 64, 512):
+        values = [rand.getrandbits(width) >> rand.randrange(width) for _ in range(n)]
+        if width <= 64:
+            arr = np.array(values, dtype=np.uint64)
+        else:
+            arr = ints_to_limbs(values, limb_cnt(width))
+        for name, fn, orig_fn, kernel in (
+                ("ctpop", ctpop, _ctpop_swar, batch_ctpop),
+                ("ctlz", ctlz, _ctlz_bisection, batch_ctlz),
+                ("cttz", cttz, _cttz_bisection, batch_cttz),
+            ):
+            results = []
+            for f in (orig_fn, fn):
+                start = default_timer()
+                for v in values:
+                    f(v, width)
+                results.append(default_timer() - start)
+
+            start = default_timer()
+            res = kernel(arr, width)
+            results.append(default_timer() - start)
+            assert res.tolist() == [fn(v, width) for v in values], name
+            orig, new, batch = results
+            print(f"{width:4d}b {name:5s} original {orig:.4f}s, int {new:.4f}s ({orig / new:.1f}x),"
+                  f" batch {batch:.4f}s ({orig / batch:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
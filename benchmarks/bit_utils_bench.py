@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Byte table implementations of bit_utils functions compared with the original loops over bits
+
+python3 -m benchmarks.bit_utils_bench [number of iterations]
+"""
+
+from random import Random
+import sys
+from timeit import default_timer
+
+from pyMathBitPrecise.bit_utils import reverse_bits, _reverse_bits_bitwise, \
+    byte_mask_to_bit_mask_int, _byte_mask_to_bit_mask_int_bitwise, \
+    bit_mask_to_byte_mask_int, _bit_mask_to_byte_mask_int_bitwise, \
+    mask_bytes, _mask_bytes_bitwise
+
+
+def main(n: int):
+    rand = Random(0)
+    for width in (32, 64, 512, 4096):
+        data = rand.getrandbits(width)
+        byte_mask = rand.getrandbits(width // 8)
+        bit_mask = byte_mask_to_bit_mask_int(byte_mask, width // 8)
+        for name, table_fn, bitwise_fn, args in (
+                ("reverse_bits", reverse_bits, _reverse_bits_bitwise, (data, width)),
+                ("byte_mask_to_bit_mask_int", byte_mask_to_bit_mask_int, _byte_mask_to_bit_mask_int_bitwise,
+                 (byte_mask, width // 8)),
+                ("bit_mask_to_byte_mask_int", bit_mask_to_byte_mask_int, _bit_mask_to_byte_mask_int_bitwise,
+                 (bit_mask, width)),
+                ("mask_bytes", mask_bytes, _mask_bytes_bitwise, (data, byte_mask, width // 8)),
+            ):
+            assert table_fn(*args) == bitwise_fn(*args), name
+            results = []
+            for fn in (bitwise_fn, table_fn):
+                start = default_timer()
+                for _ in range(n):
+                    fn(*args)
+                results.append(default_timer() - start)
+            bitwise, table = results
+            print(f"{width:5d}b {name:26s} loop {bitwise:.4f}s, table {table:.4f}s ({bitwise / table:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
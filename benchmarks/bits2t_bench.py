@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Same model evaluated with three-state (Bits3t) and two-state (Bits2t) types
+
+python3 -m benchmarks.bits2t_bench [number of iterations]
+"""
+
+import sys
+from timeit import default_timer
+
+from pyMathBitPrecise.bits2t import get_bits_t
+
+
+def crc_like_model(two_state: bool, n: int) -> int:
+    t = get_bits_t(32, two_state=two_state)
+    poly = t.from_py(0x04C11DB7)
+    acc = t.from_py(0xffffffff)
+    for i in range(n):
+        acc = acc ^ (i & 0xff)
+        msb = acc[31]
+        acc = acc << 1
+        if msb:
+            acc = acc ^ poly
+        if acc < 0x1000:
+            acc = acc + 1
+    return int(acc)
+
+
+def main(n: int):
+    results = []
+    for two_state in (False, True):
+        start = default_timer()
+        results.append(crc_like_model(two_state, n))
+        duration = default_timer() - start
+        print(f"two_state={two_state!r:5} {duration:.3f}s")
+    assert results[0] == results[1], results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Batched kernels from bits3t_batch compared with the same operators applied on each Bits3val
+
+python3 -m benchmarks.bits3t_batch_bench [number of values]
+"""
+
+from operator import and_, or_, xor, lt
+from random import Random
+import sys
+from timeit import default_timer
+
+import numpy as np
+
+from pyMathBitPrecise.bits3t import Bits3t
+from pyMathBitPrecise.bits3t_batch import batch_and, batch_or, batch_xor, \
+    batch_cmp, batch_eq, batch_get_bit_range, batch_concat, batch_sext
+from pyMathBitPrecise.limb_utils import ints_to_limbs, limb_cnt
+
+
+def random_operand(rand: Random, t: Bits3t, n: int):
+    w = t.bit_length()
+    values = []
+    for i in range(n):
+        vld = t.all_mask() if i % 4 else rand.getrandbits(w)
+        values.append(t._from_py(rand.getrandbits(w) & vld, vld))
+    if w <= 64:
+        arrays = (np.array([v.val for v in values], dtype=np.uint64),
+                  np.array([v.vld_mask for v in values], dtype=np.uint64))
+    else:
+        K = limb_cnt(w)
+        arrays = (ints_to_limbs([v.val for v in values], K),
+                  ints_to_limbs([v.vld_mask for v in values], K))
+    return values, arrays
+
+
+def main(n: int):
+    rand = Random(0)
+    print(f"values: {n:d}")
+    for t in (Bits3t(8), Bits3t(64), Bits3t(256)):
+        a, _a = random_operand(rand, t, n)
+        b, _b = random_operand(rand, t, n)
+        w = t.bit_length()
+        for name, op, kernel in (
+                ("&", and_, batch_and),
+                ("|", or_, batch_or),
+                ("^", xor, batch_xor),
+                ("<", lt, lambda *args: batch_cmp(*args, w, t.signed, lt)),
+                ("_eq", lambda x, y: x._eq(y), lambda *args: batch_eq(*args, w)),
+                ("[w-1:1]", lambda x, y: x[w - 1:1],
+                 lambda a_val, a_vld, b_val, b_vld: batch_get_bit_range(a_val, a_vld, w, 1, w - 2)),
+                ("_concat", lambda x, y: x._concat(y),
+                 lambda a_val, a_vld, b_val, b_vld: batch_concat(a_val, a_vld, w, b_val, b_vld, w)),
+                ("_sext", lambda x, y: x._sext(w + 8),
+                 lambda a_val, a_vld, b_val, b_vld: batch_sext(a_val, a_vld, w, w + 8)),
+            ):
+            start = default_timer()
+            for x, y in zip(a, b):
+                op(x, y)
+            scalar = default_timer() - start
+
+            start = default_timer()
+            kernel(*_a, *_b)
+            batch = default_timer() - start
+            print(f"{t} {name} Bits3val {scalar:.4f}s, batch {batch:.4f}s ({scalar / batch:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Operators on fully valid values compared to values with some invalid (X) bits
+
+python3 -m benchmarks.bits3val_full_valid_bench [number of iterations]
+"""
+
+from operator import add, sub, and_, or_, xor, lt, ne, lshift, rshift
+import sys
+from timeit import default_timer
+
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+
+
+def run_binary_ops(a: Bits3val, b: Bits3val, n: int):
+    ops = (add, sub, and_, or_, xor, lt, ne)
+    for _ in range(n):
+        for op in ops:
+            op(a, b)
+        a._eq(b)
+    return len(ops) + 1
+
+
+def run_unary_ops(a: Bits3val, n: int):
+    w = a._dtype.bit_length()
+    for _ in range(n):
+        ~a
+        lshift(a, 3)
+        rshift(a, 3)
+        a[w // 2:]
+        a._zext(w + 8)
+    return 5
+
+
+def main(n: int):
+    for w in (8, 64, 512):
+        t = Bits3t(w)
+        m = t.all_mask()
+        full = (t.from_py(m // 3), t.from_py(m // 5))
+        partial = (t.from_py(m // 3, vld_mask=m ^ 1), t.from_py(m // 5, vld_mask=m >> 1))
+        for name, (a, b) in (("fully valid", full), ("partially X", partial)):
+            start = default_timer()
+            op_cnt = run_binary_ops(a, b, n)
+            op_cnt += run_unary_ops(a, n)
+            duration = default_timer() - start
+            print(f"{t} {name:12s} {duration:.3f}s, {duration / (n * op_cnt) * 1e9:.0f} ns/op")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
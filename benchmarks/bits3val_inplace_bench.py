@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Accumulator loops with in-place operators (acc += x) compared to acc = acc + x
+
+python3 -m benchmarks.bits3val_inplace_bench [number of iterations]
+"""
+
+import sys
+from timeit import default_timer
+
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+
+
+class CountAllocations():
+    """
+    Count newly constructed Bits3val objects
+    """
+
+    def __init__(self):
+        self.cnt = 0
+
+    def __enter__(self):
+        self._orig_init = orig_init = Bits3val.__init__
+
+        def __init__(*args, **kwargs):
+            self.cnt += 1
+            orig_init(*args, **kwargs)
+
+        Bits3val.__init__ = __init__
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Bits3val.__init__ = self._orig_init
+
+
+def acc_out_of_place(acc: Bits3val, x: Bits3val, m: Bits3val, n: int):
+    for _ in range(n):
+        acc = acc + x
+        acc = acc ^ m
+        acc = acc & m
+        acc = acc << 1
+        acc = acc >> 1
+    return acc
+
+
+def acc_in_place(acc: Bits3val, x: Bits3val, m: Bits3val, n: int):
+    for _ in range(n):
+        acc += x
+        acc ^= m
+        acc &= m
+        acc <<= 1
+        acc >>= 1
+    return acc
+
+
+def main(n: int):
+    for t in (Bits3t(32), Bits3t(512)):
+        x = t.from_py(3)
+        m = t.from_py(t.all_mask() >> 1)
+        results = []
+        for fn in (acc_out_of_place, acc_in_place):
+            start = default_timer()
+            res = fn(t.from_py(0), x, m, n)
+            duration = default_timer() - start
+            results.append(res)
+            with CountAllocations() as allocs:
+                fn(t.from_py(0), x, m, n)
+            print(f"{t} {fn.__name__:16s} {duration:.3f}s, {(allocs.cnt - 1) / n:.1f} Bits3val allocations/iteration")
+        assert results[0]._is(results[1])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
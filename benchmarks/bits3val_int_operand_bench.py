@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Binary operators with int operand (x + 1, 1 + x) compared to the operators with Bits3val operand
+
+python3 -m benchmarks.bits3val_int_operand_bench [number of iterations]
+"""
+
+import sys
+from timeit import default_timer
+
+from pyMathBitPrecise.bits3t import Bits3t
+
+
+def main(n: int):
+    for t in (Bits3t(32), Bits3t(32, signed=True), Bits3t(512)):
+        x = t.from_py(5)
+        i = 3
+        _i = t.from_py(i)
+        for name, op, rop in (
+                ("+", x.__add__, x.__radd__),
+                ("-", x.__sub__, x.__rsub__),
+                ("&", x.__and__, x.__rand__),
+                ("^", x.__xor__, x.__rxor__),
+                ("<", x.__lt__, x.__rlt__),
+                ("_eq", x._eq, x.__req__),
+            ):
+            results = []
+            for o in (_i, i):
+                start = default_timer()
+                for _ in range(n):
+                    op(o)
+                results.append(default_timer() - start)
+
+            start = default_timer()
+            for _ in range(n):
+                rop(i)
+            results.append(default_timer() - start)
+            val, int_, rint = results
+            print(f"{t} x {name:3s} value {val:.3f}s, x {name:3s} int {int_:.3f}s ({val / int_:.2f}x),"
+                  f" int {name:3s} x {rint:.3f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
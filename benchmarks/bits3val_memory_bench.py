@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Memory footprint of values, compares the slotted layout with the previous __dict__ based layout
+
+python3 -m benchmarks.bits3val_memory_bench [number of values]
+"""
+
+import sys
+import tracemalloc
+
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+
+
+class Bits3valWithDict(Bits3val):
+    """
+    Bits3val with the per-instance __dict__ (the layout before __slots__ were used)
+    """
+
+
+def bytes_per_value(value_cls, t: Bits3t, n: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    # values are small ints which are cached by the interpreter, only the value objects are measured
+    values = [value_cls(t, i & 0xff, 0xff) for i in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(s.size_diff for s in after.compare_to(before, "filename"))
+    # the list itself is not a part of the value
+    size -= sys.getsizeof(values)
+    return size / n
+
+
+def main(n: int):
+    t = Bits3t(8)
+    with_dict = bytes_per_value(Bits3valWithDict, t, n)
+    slotted = bytes_per_value(Bits3val, t, n)
+    print(f"values: {n:d}")
+    print(f"__dict__ layout (before): {with_dict:.1f} B/value")
+    print(f"__slots__ layout (after): {slotted:.1f} B/value")
+    print(f"saved:                    {with_dict - slotted:.1f} B/value ({100 * (1 - slotted / with_dict):.0f}%)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Operators of generic Bits3val compared to Bits3val subclass specialized for the type
+
+python3 -m benchmarks.bits3val_specialized_bench [number of iterations]
+"""
+
+from operator import add, sub, mul, and_, xor, lt, ge
+import sys
+from timeit import default_timer
+
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+from pyMathBitPrecise.bits3val_specialized import get_specialized_bits3val_cls
+
+
+def run_ops(a: Bits3val, b: Bits3val, ops, n: int):
+    for _ in range(n):
+        for op in ops:
+            op(a, b)
+            op(a, 3)
+
+
+def main(n: int):
+    ops = (add, sub, mul, and_, xor, lt, ge)
+    for t in (Bits3t(8, signed=True), Bits3t(32), Bits3t(64, signed=True)):
+        spec_cls = get_specialized_bits3val_cls(t.bit_length(), t.signed)
+        durations = []
+        for cls in (Bits3val, spec_cls):
+            a = cls(t, 5, t.all_mask())
+            b = cls(t, t.all_mask() >> 1, t.all_mask())
+            start = default_timer()
+            run_ops(a, b, ops, n)
+            durations.append(default_timer() - start)
+        generic, specialized = durations
+        print(f"{t} generic {generic:.3f}s, specialized {specialized:.3f}s ({generic / specialized:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -1,15 +1,59 @@
-from typing import Optional, Union, Dict, List
+from typing import Optional, Union, Dict, List, Tuple
 
-from pyMathBitPrecise.bit_utils import ValidityError
+from pyMathBitPrecise.bit_utils import ValidityError, apply_write_with_mask_int, \
+    _byte_mask_operand, mask
 from copy import copy
 
+# items are stored as a dict of item values, (default)
+ARRAY3T_STORAGE_DICT = "dict"
+# items are stored in a value and a validity bytearray, item values are created on access
+ARRAY3T_STORAGE_PACKED = "packed"
+# items are stored in packed pages of Array3t.page_size items, pages are allocated on first write
+ARRAY3T_STORAGE_PAGED = "paged"
+# default number of items in page for ARRAY3T_STORAGE_PAGED
+ARRAY3T_PAGE_SIZE = 4096
+# items are stored in a value and a validity plane in a memory mapped file, see :mod:`pyMathBitPrecise.array3t_mmap`
+ARRAY3T_STORAGE_MMAP = "mmap"
+
 
 class Array3t():
+    """
+    Type of an array of items of the same type
 
-    def __init__(self, element_t, size: int, name: Optional[str]=None):
+    :ivar ~.storage: specifies how the values of this type store the items
+        (ARRAY3T_STORAGE_DICT, ARRAY3T_STORAGE_PACKED, ARRAY3T_STORAGE_PAGED, ARRAY3T_STORAGE_MMAP)
+    :ivar ~.page_size: number of items in page for ARRAY3T_STORAGE_PAGED
+    :ivar ~._value_cls: class of values of this type
+    :note: the storage does not change the meaning of the type, types with different storage are equal
+    """
+    __slots__ = ("element_t", "size", "name", "storage", "page_size", "_value_cls")
+
+    def __init__(self, element_t, size: int, name: Optional[str]=None,
+                 storage: str=ARRAY3T_STORAGE_DICT, page_size: int=ARRAY3T_PAGE_SIZE):
         self.element_t = element_t
         self.size = int(size)
         self.name = name
+        self.storage = storage
+        self.page_size = int(page_size)
+        if storage == ARRAY3T_STORAGE_DICT:
+            value_cls = Array3val
+        elif storage == ARRAY3T_STORAGE_PACKED:
+            from pyMathBitPrecise.array3t_packed import Array3valPacked
+            value_cls = Array3valPacked
+            value_cls._check_element_t(element_t)
+        elif storage == ARRAY3T_STORAGE_PAGED:
+            from pyMathBitPrecise.array3t_paged import Array3valPaged
+            value_cls = Array3valPaged
+            value_cls._check_element_t(element_t)
+            if self.page_size <= 0:
+                raise ValueError("Page size has to be > 0", page_size)
+        elif storage == ARRAY3T_STORAGE_MMAP:
+            from pyMathBitPrecise.array3t_mmap import Array3valMmap
+            value_cls = Array3valMmap
+            value_cls._check_element_t(element_t)
+        else:
+            raise ValueError("Unknown storage", storage)
+        self._value_cls = value_cls
 
     def __eq__(self, other):
         return isinstance(other, self.__class__)\
@@ -27,7 +71,7 @@ class Array3t():
         """
         from_py without normalization
         """
-        return Array3val(self, val, vld_mask)
+        return self._value_cls(self, val, vld_mask)
 
     def from_py(self, val: Union[List["value"], Dict[int, "value"], None],
                 vld_mask: Optional[int]=None) -> "Array3val":
@@ -37,6 +81,9 @@ class Array3t():
             and is much slower than the value specified
             by 'val' and 'vld_mask'. Does support x.
         """
+        if self._value_cls is not Array3val:
+            return self._value_cls.from_py(self, val, vld_mask)
+
         if val is None:
             val = {}
             vld_mask = 0
@@ -68,6 +115,7 @@ class Array3val():
     :note: use Array3t.from_py if you want to check the the type of val
     :ivar vld_mask: if 0 the value is entirely invalid else some item may be valid
     """
+    __slots__ = ("_dtype", "val", "vld_mask")
 
     def __init__(self, t: Array3t, val: Dict[int, object], vld_mask: int):
         """
@@ -86,6 +134,19 @@ class Array3val():
         ":return: size of this array"
         return self._dtype.size
 
+    def to_py(self) -> List[object]:
+        """
+        :return: list of pythonic values of items, None for invalid items
+        """
+        res = []
+        for i in range(self._dtype.size):
+            v = self.val.get(i, None)
+            if v is None or not v.vld_mask:
+                res.append(None)
+            else:
+                res.append(v.to_py())
+        return res
+
     def __getitem__(self, index):
         try:
             index = int(index)
@@ -121,5 +182,63 @@ class Array3val():
 
         self.val[index] = val
 
+    def _strobe_write_operands(self, index: int, data: Union[int, "Bits3val"],
+                               strobe: Union[int, "Bits3val", None]) -> Tuple[int, int, int, int, int, Optional[int]]:
+        """
+        Check arguments of :meth:`~.write_with_strobe`
+
+        :return: tuple (index, number of items, data val, data vld_mask, strobe val, strobe vld_mask or None)
+        """
+        element_t = self._dtype.element_t
+        w = element_t.bit_length()
+        if w % 8:
+            raise ValueError("Write with byte mask requires item width to be a multiple of 8", element_t)
+        if isinstance(data, int):
+            data_w = w
+            d_val = element_t._int_operand_to_val(data)
+            d_vld = element_t._all_mask
+        else:
+            data_w = data._dtype.bit_length()
+            if data_w % w:
+                raise TypeError("Width of data has to be a multiple of item width", data._dtype, element_t)
+            d_val = data.val
+            d_vld = data.vld_mask
+        item_cnt = data_w // w
+        index = int(index)
+        if index < 0 or index + item_cnt > self._dtype.size:
+            raise IndexError(index, item_cnt)
+        s_val, s_vld = _byte_mask_operand(strobe, data_w // 8)
+        return index, item_cnt, d_val, d_vld, s_val, s_vld
+
+    def write_with_strobe(self, index: int, data: Union[int, "Bits3val"],
+                          strobe: Union[int, "Bits3val", None]=None):
+        """
+        Write bytes of data selected by strobe (byte enable mask) to items (e.g. for AXI memory model),
+        bit i of strobe enables the write of byte i of data.
+        The data wider than item is a burst write to items index, index + 1, ... (item index is at LSB side of data).
+
+        :param strobe: byte mask with width of data // 8, None means all bytes
+        :see: :func:`pyMathBitPrecise.bit_utils.apply_write_with_mask_int`
+        """
+        index, item_cnt, d_val, d_vld, s_val, s_vld = self._strobe_write_operands(index, data, strobe)
+        element_t = self._dtype.element_t
+        w = element_t.bit_length()
+        nb = w // 8
+        m = element_t._all_mask
+        sm = mask(nb)
+        for i in range(index, index + item_cnt):
+            _s_val = s_val & sm
+            _s_vld = None if s_vld is None else s_vld & sm
+            if _s_val or (_s_vld is not None and _s_vld != sm):
+                cur = self[i]
+                val, vld = apply_write_with_mask_int(cur.val, cur.vld_mask, d_val & m, d_vld & m,
+                                                     _s_val, w, _s_vld)
+                self[i] = element_t._from_py(val, m if vld == m else vld)
+            d_val >>= w
+            d_vld >>= w
+            s_val >>= nb
+            if s_vld is not None:
+                s_vld >>= nb
+
     def __repr__(self):
         return f"<{self.__class__.__name__:s} {self.val}>"
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Memory mapped storage of :class:`~.Array3val`
+
+The image file has a header of ARRAY3T_MMAP_HEADER_SIZE bytes followed by the value plane
+and the validity plane, both with the same layout as in :class:`~.Array3valPacked`.
+"""
+
+from io import BytesIO
+import mmap
+import os
+import struct
+from typing import Optional, Union, Self, Sequence, Dict, BinaryIO
+
+from pyMathBitPrecise.array3t import Array3t, ARRAY3T_STORAGE_MMAP, \
+    ARRAY3T_STORAGE_PACKED
+from pyMathBitPrecise.array3t_packed import Array3valPacked
+from pyMathBitPrecise.bit_utils import mask
+from pyMathBitPrecise.bits3t import Bits3t
+
+ARRAY3T_MMAP_MAGIC = b"PMBPA3T\0"
+ARRAY3T_MMAP_VERSION = 1
+# the planes start aligned after header
+ARRAY3T_MMAP_HEADER_SIZE = 64
+# number of bytes copied at once by :func:`~.write_array3_mmap_image`
+ARRAY3T_MMAP_CHUNK_SIZE = 1 << 20
+# magic, version, element width, element signed (0: False, 1: True, 2: None), number of items
+_HEADER = struct.Struct("<8sIIB3xQ")
+_SIGNED_TO_HEADER = {False: 0, True: 1, None: 2}
+_HEADER_TO_SIGNED = {v: k for k, v in _SIGNED_TO_HEADER.items()}
+
+
+def _pack_header(element_t: Bits3t, size: int) -> bytes:
+    h = _HEADER.pack(ARRAY3T_MMAP_MAGIC, ARRAY3T_MMAP_VERSION, element_t.bit_length(),
+                     _SIGNED_TO_HEADER[element_t.signed], size)
+    return h + bytes(ARRAY3T_MMAP_HEADER_SIZE - len(h))
+
+
+def _unpack_header(header: bytes) -> tuple[int, Optional[bool], int]:
+    """
+    :return: tuple element width, element signed, number of items
+    """
+    if len(header) < _HEADER.size:
+        raise ValueError("Image file too small for header", len(header))
+    magic, version, width, signed, size = _HEADER.unpack_from(header)
+    if magic != ARRAY3T_MMAP_MAGIC:
+        raise ValueError("Not an Array3t image file", magic)
+    if version != ARRAY3T_MMAP_VERSION:
+        raise ValueError("Unsupported version of Array3t image file", version)
+    return width, _HEADER_TO_SIGNED[signed], size
+
+
+class Array3valMmap(Array3valPacked):
+    """
+    Value of :class:`~.Array3t` with ARRAY3T_STORAGE_MMAP storage.
+    Same as :class:`~.Array3valPacked` but the planes are memoryviews of a memory mapped image file
+    (or of an anonymous mapping if constructed by from_py), items are read and written directly in the mapping.
+
+    :ivar ~.val: memoryview of value plane
+    :ivar ~.vld_mask: memoryview of validity plane
+    :ivar ~._mmap: the mmap object which owns the planes
+    :note: use :meth:`~.open` to map an image file, :func:`~.write_array3_mmap_image` to create it
+    """
+    __slots__ = ("_mmap",)
+
+    def __init__(self, t: Array3t, val: memoryview, vld_mask: memoryview, mmap_obj: Optional[mmap.mmap]=None):
+        super(Array3valMmap, self).__init__(t, val, vld_mask)
+        self._mmap = mmap_obj
+
+    @classmethod
+    def _from_mmap(cls, t: Array3t, m: mmap.mmap) -> Self:
+        plane_size = cls._item_bytes(t.element_t) * t.size
+        mv = memoryview(m)
+        val = mv[ARRAY3T_MMAP_HEADER_SIZE:ARRAY3T_MMAP_HEADER_SIZE + plane_size]
+        vld = mv[ARRAY3T_MMAP_HEADER_SIZE + plane_size:ARRAY3T_MMAP_HEADER_SIZE + 2 * plane_size]
+        mv.release()
+        return cls(t, val, vld, m)
+
+    @classmethod
+    def from_py(cls, t: Array3t,
+                val: Union[Sequence[object], Dict[int, object], bytes, bytearray, memoryview, None],
+                vld_mask: Union[bytes, bytearray, memoryview, int, None]=None) -> Self:
+        """
+        Construct value in anonymous memory mapping, arguments are the same as for :meth:`Array3valPacked.from_py`
+        """
+        v = Array3valPacked.from_py(
+            Array3t(t.element_t, t.size, storage=ARRAY3T_STORAGE_PACKED), val, vld_mask)
+        plane_size = len(v.val)
+        m = mmap.mmap(-1, ARRAY3T_MMAP_HEADER_SIZE + 2 * plane_size)
+        m[:ARRAY3T_MMAP_HEADER_SIZE] = _pack_header(t.element_t, t.size)
+        self = cls._from_mmap(t, m)
+        self.val[:] = v.val
+        self.vld_mask[:] = v.vld_mask
+        return self
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike], writable: bool=True,
+             element_t: Optional[Bits3t]=None) -> Self:
+        """
+        Map an image file created by :func:`~.write_array3_mmap_image`
+
+        :param writable: if True the writes are written to the file,
+            else the mapping is read-only and writes raise TypeError
+        :param element_t: type of items, it has to have the same width and signedness as in image header
+            (if None Bits3t is constructed from header)
+        """
+        with open(path, "r+b" if writable else "rb") as f:
+            header = f.read(ARRAY3T_MMAP_HEADER_SIZE)
+            width, signed, size = _unpack_header(header)
+            if element_t is None:
+                element_t = Bits3t(width, signed)
+            elif element_t.bit_length() != width or element_t.signed != signed:
+                raise TypeError("Item type does not match the image", element_t, width, signed)
+
+            t = Array3t(element_t, size, storage=ARRAY3T_STORAGE_MMAP)
+            expected_size = ARRAY3T_MMAP_HEADER_SIZE + 2 * cls._item_bytes(element_t) * size
+            file_size = os.fstat(f.fileno()).st_size
+            if file_size != expected_size:
+                raise ValueError("Incorrect size of image file", file_size, expected_size)
+
+            m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        return cls._from_mmap(t, m)
+
+    def __copy__(self):
+        t = self._dtype
+        return Array3valPacked(Array3t(t.element_t, t.size, name=t.name, storage=ARRAY3T_STORAGE_PACKED),
+                               bytearray(self.val), bytearray(self.vld_mask))
+
+    def flush(self):
+        """
+        Write modified pages to the image file
+        """
+        self._mmap.flush()
+
+    def close(self):
+        """
+        Unmap the image file
+
+        :attention: all memoryviews from :meth:`~.plane_views` have to be released before
+        """
+        m = self._mmap
+        if m is None:
+            return
+        self.val.release()
+        self.vld_mask.release()
+        m.close()
+        self._mmap = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _dump_size(dump: Union[str, os.PathLike, bytes, bytearray, memoryview]) -> int:
+    if isinstance(dump, (bytes, bytearray, memoryview)):
+        return memoryview(dump).nbytes
+    return os.stat(dump).st_size
+
+
+def _open_dump(dump: Union[str, os.PathLike, bytes, bytearray, memoryview]) -> BinaryIO:
+    if isinstance(dump, (bytes, bytearray, memoryview)):
+        return BytesIO(dump)
+    return open(dump, "rb")
+
+
+def write_array3_mmap_image(path: Union[str, os.PathLike], element_t: Bits3t,
+                            val_dump: Union[str, os.PathLike, bytes, bytearray, memoryview],
+                            vld_dump: Union[str, os.PathLike, bytes, bytearray, memoryview, None]=None,
+                            chunk_size: int=ARRAY3T_MMAP_CHUNK_SIZE) -> Array3t:
+    """
+    Create an image file for :meth:`Array3valMmap.open` from raw binary dumps,
+    the dumps are copied by chunks and are never loaded whole to memory.
+
+    :param val_dump: path to a file or bytes-like object with the raw value plane
+        (ceil(width / 8) bytes per item, little endian)
+    :param vld_dump: same as val_dump for the validity plane, if None all items are valid
+    :return: type of the array in the image
+    """
+    nb = Array3valPacked._item_bytes(element_t)
+    plane_size = _dump_size(val_dump)
+    if plane_size % nb:
+        raise ValueError("Size of value dump is not a multiple of item size", plane_size, nb)
+    if vld_dump is not None and _dump_size(vld_dump) != plane_size:
+        raise ValueError("Size of validity dump differs from value dump", _dump_size(vld_dump), plane_size)
+    size = plane_size // nb
+    # chunks have to contain whole items
+    chunk_size = max(chunk_size - chunk_size % nb, nb)
+    w = element_t.bit_length()
+    top_mask = mask(w % 8) if w % 8 else None
+    full_vld = element_t._all_mask.to_bytes(nb, "little")
+    full_vld_int = int.from_bytes(full_vld * (chunk_size // nb), "little")
+
+    with open(path, "wb") as f:
+        f.write(_pack_header(element_t, size))
+        val_f = _open_dump(val_dump)
+        vld_f = None if vld_dump is None else _open_dump(vld_dump)
+        try:
+            for off in range(0, plane_size, chunk_size):
+                val = val_f.read(chunk_size)
+                if top_mask is not None and max(val[nb - 1::nb]) > top_mask:
+                    raise ValueError("Not enough bits to represent value", element_t, off // nb)
+                if vld_f is None:
+                    vld = full_vld * (len(val) // nb)
+                else:
+                    vld = vld_f.read(chunk_size)
+                    vld_int = int.from_bytes(vld, "little")
+                    if vld_int & ~full_vld_int:
+                        raise ValueError("Mask in incorrect format", element_t, off // nb)
+                    val = (int.from_bytes(val, "little") & vld_int).to_bytes(len(val), "little")
+                f.seek(ARRAY3T_MMAP_HEADER_SIZE + off)
+                f.write(val)
+                f.seek(ARRAY3T_MMAP_HEADER_SIZE + plane_size + off)
+                f.write(vld)
+        finally:
+            val_f.close()
+            if vld_f is not None:
+                vld_f.close()
+        # for empty dumps
+        f.truncate(ARRAY3T_MMAP_HEADER_SIZE + 2 * plane_size)
+
+    return Array3t(element_t, size, storage=ARRAY3T_STORAGE_MMAP)
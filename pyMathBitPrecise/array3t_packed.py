@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from array import array
+import sys
+from typing import Optional, Union, Dict, List, Self, Sequence, Tuple
+
+from pyMathBitPrecise.array3t import Array3t, Array3val
+from pyMathBitPrecise.bit_utils import ValidityError, mask, apply_write_with_mask_int
+
+# typecode of array.array for item size in bytes, (unsigned, signed)
+_ARRAY_TYPECODES = {}
+for _tc_u, _tc_s in zip("BHILQ", "bhilq"):
+    _ARRAY_TYPECODES.setdefault(array(_tc_u).itemsize, (_tc_u, _tc_s))
+del _tc_u, _tc_s
+
+
+def _array_typecode(element_t) -> Optional[str]:
+    """
+    :return: typecode of array.array which has exactly the same layout as the items of element_t
+        in packed storage, None if there is not any
+    """
+    w = element_t.bit_length()
+    if w % 8:
+        return None
+    tc = _ARRAY_TYPECODES.get(w // 8, None)
+    if tc is None:
+        return None
+    return tc[1] if element_t.signed else tc[0]
+
+
+class Array3valPacked(Array3val):
+    """
+    Value of :class:`~.Array3t` with ARRAY3T_STORAGE_PACKED storage.
+    Items are stored in two bytearrays (value and validity plane),
+    each item occupies ceil(element_width / 8) bytes in little endian.
+    Item values are created on access.
+
+    :ivar ~.val: bytearray, always unsigned representation of item values
+    :ivar ~.vld_mask: bytearray, validity masks of items, if bit in mask is '0'
+        the corresponding bit in val is invalid
+    :attention: the item value returned from __getitem__ is not a reference into this array,
+        it has to be written back by __setitem__ if it is modified in place
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def _check_element_t(element_t):
+        if not hasattr(element_t, "_normalize_val_and_mask"):
+            raise TypeError("Packed storage requires Bits3t like item type", element_t)
+
+    @staticmethod
+    def _item_bytes(element_t) -> int:
+        return (element_t.bit_length() + 7) // 8
+
+    @classmethod
+    def from_py(cls, t: Array3t,
+                val: Union[Sequence[object], Dict[int, object], bytes, bytearray, memoryview, None],
+                vld_mask: Union[bytes, bytearray, memoryview, int, None]=None) -> Self:
+        """
+        Construct value from pythonic value
+
+        :param val: list or dict of item values or None (same as for ARRAY3T_STORAGE_DICT)
+            or a bytes-like raw image of the value plane
+        :param vld_mask: a bytes-like raw image of the validity plane (for bytes-like val)
+            or a validity flag for the list/dict (0 means that the whole array is invalid)
+        :note: a list of ints of 8/16/32/64b items is converted at once,
+            a bytes-like val is copied at once
+        """
+        element_t = t.element_t
+        nb = cls._item_bytes(element_t)
+        plane_size = nb * t.size
+        full_vld = element_t._all_mask.to_bytes(nb, "little") * t.size
+        if val is None:
+            return cls(t, bytearray(plane_size), bytearray(plane_size))
+
+        if isinstance(val, (bytes, bytearray, memoryview)):
+            _val = bytearray(val)
+            if len(_val) != plane_size:
+                raise ValueError("Incorrect size of value plane", len(_val), plane_size)
+            if element_t.bit_length() % 8:
+                # check that the padding bits are 0
+                top_mask = mask(element_t.bit_length() % 8)
+                if _val and max(_val[nb - 1::nb]) > top_mask:
+                    raise ValueError("Not enough bits to represent value", element_t)
+            if vld_mask is None:
+                _vld = bytearray(full_vld)
+            else:
+                _vld = bytearray(vld_mask)
+                if len(_vld) != plane_size:
+                    raise ValueError("Incorrect size of validity plane", len(_vld), plane_size)
+                vld_int = int.from_bytes(_vld, "little")
+                if vld_int & ~int.from_bytes(full_vld, "little"):
+                    raise ValueError("Mask in incorrect format", element_t)
+                _val = bytearray((int.from_bytes(_val, "little") & vld_int).to_bytes(plane_size, "little"))
+            return cls(t, _val, _vld)
+
+        if vld_mask is not None and not vld_mask:
+            # whole array invalid
+            return cls(t, bytearray(plane_size), bytearray(plane_size))
+
+        if isinstance(val, dict):
+            self = cls(t, bytearray(plane_size), bytearray(plane_size))
+            for k, v in val.items():
+                k = int(k)
+                if k < 0:
+                    raise ValueError("item index < 0", k)
+
+                if k >= t.size:
+                    raise ValueError("item index >= array size", k)
+                self._set_item(k, *element_t._normalize_val_and_mask(v, None))
+            return self
+
+        if len(val) > t.size:
+            raise ValueError("item index >= array size", t.size)
+
+        tc = _array_typecode(element_t)
+        if tc is not None and len(val) == t.size:
+            try:
+                a = array(tc, val)
+            except (TypeError, OverflowError):
+                # None, str and other values which require normalization or error reporting
+                a = None
+            if a is not None:
+                if sys.byteorder != "little":
+                    a.byteswap()
+                return cls(t, bytearray(a.tobytes()), bytearray(full_vld))
+
+        vals = bytearray(plane_size)
+        vlds = bytearray(plane_size)
+        normalize = element_t._normalize_val_and_mask
+        off = 0
+        for v in val:
+            v, m = normalize(v, None)
+            vals[off:off + nb] = v.to_bytes(nb, "little")
+            vlds[off:off + nb] = m.to_bytes(nb, "little")
+            off += nb
+        return cls(t, vals, vlds)
+
+    def __copy__(self):
+        return self.__class__(self._dtype, bytearray(self.val), bytearray(self.vld_mask))
+
+    def _get_item(self, index: int) -> tuple[int, int]:
+        """
+        :return: tuple val, vld_mask of item on specified index
+        """
+        nb = self._item_bytes(self._dtype.element_t)
+        off = index * nb
+        end = off + nb
+        return (int.from_bytes(self.val[off:end], "little"),
+                int.from_bytes(self.vld_mask[off:end], "little"))
+
+    def _set_item(self, index: int, val: int, vld_mask: int):
+        """
+        Set val, vld_mask of item on specified index without any check
+        """
+        nb = self._item_bytes(self._dtype.element_t)
+        off = index * nb
+        end = off + nb
+        self.val[off:end] = val.to_bytes(nb, "little")
+        self.vld_mask[off:end] = vld_mask.to_bytes(nb, "little")
+
+    def plane_views(self, start: int=0, size: Optional[int]=None) -> Tuple[memoryview, memoryview]:
+        """
+        :return: tuple of memoryviews of value and validity plane for items start:start+size (without copy)
+        """
+        t = self._dtype
+        if size is None:
+            size = t.size - start
+        if start < 0 or size < 0 or start + size > t.size:
+            raise IndexError(start, size)
+        nb = self._item_bytes(t.element_t)
+        off = start * nb
+        end = off + size * nb
+        return (memoryview(self.val)[off:end], memoryview(self.vld_mask)[off:end])
+
+    def write_with_strobe(self, index: int, data: Union[int, "Bits3val"],
+                          strobe: Union[int, "Bits3val", None]=None):
+        """
+        :see: :meth:`Array3val.write_with_strobe`
+        :note: the items of a burst are continuous in the planes and are updated at once
+        """
+        index, item_cnt, d_val, d_vld, s_val, s_vld = self._strobe_write_operands(index, data, strobe)
+        nb = self._item_bytes(self._dtype.element_t)
+        off = index * nb
+        end = off + item_cnt * nb
+        val, vld = apply_write_with_mask_int(
+            int.from_bytes(self.val[off:end], "little"), int.from_bytes(self.vld_mask[off:end], "little"),
+            d_val, d_vld, s_val, (end - off) * 8, s_vld)
+        self.val[off:end] = val.to_bytes(end - off, "little")
+        self.vld_mask[off:end] = vld.to_bytes(end - off, "little")
+
+    def __getitem__(self, index):
+        element_t = self._dtype.element_t
+        try:
+            index = int(index)
+        except ValidityError:
+            return element_t.from_py(None)
+
+        if index < 0 or index >= self._dtype.size:
+            raise IndexError(index)
+
+        val, vld = self._get_item(index)
+        all_mask = element_t._all_mask
+        if vld == all_mask:
+            vld = all_mask
+        return element_t._from_py(val, vld)
+
+    def __setitem__(self, index, val):
+        try:
+            index = int(index)
+        except ValidityError:
+            # index unknown, any item may be overwritten
+            self.vld_mask[:] = bytes(len(self.vld_mask))
+            self.val[:] = bytes(len(self.val))
+            return
+
+        if index < 0 or index >= self._dtype.size:
+            raise IndexError(index)
+
+        element_t = self._dtype.element_t
+        try:
+            t = val._dtype
+        except AttributeError:
+            t = None
+
+        if t is not None:
+            assert t == element_t, (t, element_t)
+            self._set_item(index, val.val, val.vld_mask)
+        else:
+            self._set_item(index, *element_t._normalize_val_and_mask(val, None))
+
+    def to_py(self) -> List[Optional[int]]:
+        """
+        :return: list of pythonic values of items, None for invalid items
+        :raise ValidityError: if some item is only partially valid
+        :note: fully valid array of 8/16/32/64b items is converted at once
+        """
+        t = self._dtype
+        element_t = t.element_t
+        nb = self._item_bytes(element_t)
+        tc = _array_typecode(element_t)
+        if tc is not None and self.vld_mask == element_t._all_mask.to_bytes(nb, "little") * t.size:
+            a = array(tc)
+            a.frombytes(self.val)
+            if sys.byteorder != "little":
+                a.byteswap()
+            return a.tolist()
+
+        res = []
+        for i in range(t.size):
+            val, vld = self._get_item(i)
+            if vld:
+                res.append(self.__getitem__(i).to_py())
+            else:
+                res.append(None)
+        return res
+
+    def __repr__(self):
+        items = [self.__getitem__(i) for i in range(self._dtype.size)]
+        return f"<{self.__class__.__name__:s} {items}>"
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from typing import Optional, Union, Dict, Self, Sequence, Tuple
+
+from pyMathBitPrecise.array3t import Array3t, Array3val, ARRAY3T_STORAGE_PACKED
+from pyMathBitPrecise.array3t_packed import Array3valPacked, _ARRAY_TYPECODES
+from pyMathBitPrecise.bit_utils import ValidityError
+
+# value plane, validity plane of the page (the same layout as Array3valPacked.val, vld_mask)
+Array3Page = Tuple[bytearray, bytearray]
+# immutable chain of layers of shared pages, tuple (layer, older layers) or None,
+# layer is a dict page index -> page or None for a page released in this layer
+Array3PageLayers = Optional[Tuple[Dict[int, Optional[Array3Page]], "Array3PageLayers"]]
+
+
+def _push_page_layer(layers: Array3PageLayers, layer: Dict[int, Optional[Array3Page]]) -> Array3PageLayers:
+    """
+    Add the layer on top of the chain of layers,
+    the layers of similar size are merged (as in LSM-tree) to keep the number of layers logarithmic
+
+    :note: the layers are shared between values and they are never modified, the merge creates a new dict
+    """
+    while layers is not None and len(layers[0]) <= 2 * len(layer):
+        older, layers = layers
+        merged = dict(older)
+        merged.update(layer)
+        layer = merged
+    if layers is None:
+        # nothing to release in the bottom layer
+        layer = {i: page for i, page in layer.items() if page is not None}
+    return (layer, layers)
+
+
+def _valid_item_cnt(vld: bytearray, item_bytes: int) -> int:
+    """
+    :return: number of items in validity plane which have at least one bit valid
+    """
+    item_cnt = len(vld) // item_bytes
+    tc = _ARRAY_TYPECODES.get(item_bytes, None)
+    if tc is not None:
+        return item_cnt - memoryview(vld).cast(tc[0]).tolist().count(0)
+
+    invalid = bytes(item_bytes)
+    return sum(1 for off in range(0, len(vld), item_bytes)
+               if vld[off:off + item_bytes] != invalid)
+
+
+class Array3PagedStats():
+    """
+    Occupancy statistics of :class:`~.Array3valPaged`
+
+    :ivar ~.page_size: number of items in page
+    :ivar ~.page_cnt: number of pages needed to cover the whole array
+    :ivar ~.page_occupancy: dictionary page index -> number of items with some bit valid
+        (for allocated pages only)
+    """
+    __slots__ = ("page_size", "page_cnt", "page_occupancy")
+
+    def __init__(self, page_size: int, page_cnt: int, page_occupancy: Dict[int, int]):
+        self.page_size = page_size
+        self.page_cnt = page_cnt
+        self.page_occupancy = page_occupancy
+
+    @property
+    def allocated_page_cnt(self) -> int:
+        return len(self.page_occupancy)
+
+    @property
+    def valid_item_cnt(self) -> int:
+        return sum(self.page_occupancy.values())
+
+    @property
+    def occupancy(self) -> float:
+        """
+        :return: ratio of items with some bit valid to the number of items in allocated pages
+        """
+        allocated = self.allocated_page_cnt * self.page_size
+        if not allocated:
+            return 0.0
+        return self.valid_item_cnt / allocated
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__:s} pages {self.allocated_page_cnt:d}/{self.page_cnt:d}, "
+                f"valid items {self.valid_item_cnt:d}, occupancy {self.occupancy:.3f}>")
+
+
+class Array3valPaged(Array3val):
+    """
+    Value of :class:`~.Array3t` with ARRAY3T_STORAGE_PAGED storage.
+    Items are stored in pages of Array3t.page_size items, each page has the same layout as :class:`~.Array3valPacked`.
+    Pages are allocated on first write of a value which is not entirely invalid,
+    reads from unallocated pages do not allocate any page
+    (the item is a new invalid value, as any item returned from __getitem__ it may be modified by the caller).
+    Copies (:meth:`~.snapshot`, __copy__) share the pages, a page is copied on the first write
+    to it (copy-on-write). The shared pages are in immutable layers, the pages written after the snapshot
+    are in a private dict of the value, a write after a snapshot copies only the touched page.
+
+    :ivar ~.val: private dict page index -> tuple (value plane, validity plane)
+        or None if the page from _shared was released in this value
+    :ivar ~.vld_mask: if 0 the value is entirely invalid else some item may be valid
+    :ivar ~._shared: immutable layers of pages shared with other values (see :func:`~._push_page_layer`),
+        the pages in val have priority
+    :attention: the item value returned from __getitem__ is not a reference into this array,
+        it has to be written back by __setitem__ if it is modified in place
+    """
+    __slots__ = ("_shared", )
+
+    def __init__(self, t: Array3t, val: Dict[int, Array3Page], vld_mask: int):
+        """
+        :param t: type of this value
+        :param val: dict page index -> page, (pages are considered shared)
+        :param vld_mask: validity flag for this value
+        """
+        super(Array3valPaged, self).__init__(t, {}, vld_mask)
+        self._shared = (dict(val), None) if val else None
+
+    _check_element_t = staticmethod(Array3valPacked._check_element_t)
+    _item_bytes = staticmethod(Array3valPacked._item_bytes)
+
+    @classmethod
+    def from_py(cls, t: Array3t,
+                val: Union[Sequence[object], Dict[int, object], bytes, bytearray, memoryview, None],
+                vld_mask: Union[bytes, bytearray, memoryview, int, None]=None) -> Self:
+        """
+        Construct value from pythonic value
+
+        :param val: dict index -> item value for sparse initialization,
+            list of item values or bytes-like raw image of the value plane for items from index 0,
+            or None
+        :param vld_mask: a bytes-like raw image of the validity plane (for bytes-like val)
+        """
+        self = cls(t, {}, 1)
+        if val is None:
+            self.vld_mask = 0
+        elif isinstance(val, dict):
+            size = t.size
+            for k, v in val.items():
+                k = int(k)
+                if k < 0:
+                    raise ValueError("item index < 0", k)
+
+                if k >= size:
+                    raise ValueError("item index >= array size", k)
+                self.__setitem__(k, v)
+        else:
+            self.write_range(0, val, vld_mask)
+        return self
+
+    def _freeze(self):
+        """
+        Move the private pages to the shared layers
+        """
+        if self.val:
+            self._shared = _push_page_layer(self._shared, self.val)
+            self.val = {}
+
+    def snapshot(self) -> Self:
+        """
+        :return: a copy of this value which shares all pages with this value
+        :note: pages are copied on the first write to them in any of the values
+        :note: O(pages written since last snapshot), amortized (the shared layers are merged sometimes)
+        """
+        self._freeze()
+        res = self.__class__(self._dtype, None, self.vld_mask)
+        res._shared = self._shared
+        return res
+
+    __copy__ = snapshot
+
+    def restore(self, snapshot: Self):
+        """
+        Set the content of this value to the content of the snapshot,
+        the snapshot remains unchanged and can be restored again
+        """
+        assert snapshot._dtype == self._dtype, (snapshot._dtype, self._dtype)
+        snapshot._freeze()
+        self._shared = snapshot._shared
+        self.val = {}
+        self.vld_mask = snapshot.vld_mask
+
+    def _shared_page(self, page_i: int) -> Optional[Array3Page]:
+        """
+        :return: the page from shared layers or None
+        """
+        layers = self._shared
+        while layers is not None:
+            layer, layers = layers
+            try:
+                return layer[page_i]
+            except KeyError:
+                pass
+        return None
+
+    def _get_page(self, page_i: int) -> Optional[Array3Page]:
+        """
+        :return: the page for read or None if the page is not allocated
+        """
+        try:
+            return self.val[page_i]
+        except KeyError:
+            return self._shared_page(page_i)
+
+    def _pages(self) -> Dict[int, Array3Page]:
+        """
+        :return: dict of all allocated pages (a new dict)
+        """
+        layers = []
+        shared = self._shared
+        while shared is not None:
+            layer, shared = shared
+            layers.append(layer)
+        res = {}
+        for layer in reversed(layers):
+            res.update(layer)
+        res.update(self.val)
+        return {i: page for i, page in res.items() if page is not None}
+
+    def _page_for_write(self, page_i: int, allocate: bool=True) -> Optional[Array3Page]:
+        """
+        :return: page with specified index which is not shared with any other value,
+            allocate it if it does not exist and allocate is True else return None
+        """
+        pages = self.val
+        try:
+            page = pages[page_i]
+        except KeyError:
+            page = self._shared_page(page_i)
+            if page is not None:
+                page = pages[page_i] = (bytearray(page[0]), bytearray(page[1]))
+                return page
+        else:
+            if page is not None:
+                return page
+
+        if not allocate:
+            return None
+        t = self._dtype
+        plane_size = t.page_size * self._item_bytes(t.element_t)
+        page = pages[page_i] = (bytearray(plane_size), bytearray(plane_size))
+        return page
+
+    def _check_range(self, start: int, size: int):
+        if start < 0 or size < 0 or start + size > self._dtype.size:
+            raise IndexError(start, size)
+
+    def __getitem__(self, index):
+        t = self._dtype
+        element_t = t.element_t
+        try:
+            index = int(index)
+        except ValidityError:
+            return element_t.from_py(None)
+
+        if index < 0 or index >= t.size:
+            raise IndexError(index)
+
+        page_i, i = divmod(index, t.page_size)
+        page = self._get_page(page_i)
+        if page is None:
+            return element_t.from_py(None)
+
+        nb = self._item_bytes(element_t)
+        off = i * nb
+        end = off + nb
+        val = int.from_bytes(page[0][off:end], "little")
+        vld = int.from_bytes(page[1][off:end], "little")
+        all_mask = element_t._all_mask
+        if vld == all_mask:
+            vld = all_mask
+        return element_t._from_py(val, vld)
+
+    def __setitem__(self, index, val):
+        t = self._dtype
+        try:
+            index = int(index)
+        except ValidityError:
+            # index unknown, any item may be overwritten
+            self.val = {}
+            self._shared = None
+            return
+
+        if index < 0 or index >= t.size:
+            raise IndexError(index)
+
+        element_t = t.element_t
+        try:
+            _t = val._dtype
+        except AttributeError:
+            _t = None
+
+        if _t is not None:
+            assert _t == element_t, (_t, element_t)
+            v, m = val.val, val.vld_mask
+        else:
+            v, m = element_t._normalize_val_and_mask(val, None)
+
+        page_i, i = divmod(index, t.page_size)
+        # unallocated page is already invalid and does not have to be allocated for invalid value
+        page = self._page_for_write(page_i, allocate=bool(m))
+        if page is None:
+            return
+
+        nb = self._item_bytes(element_t)
+        off = i * nb
+        end = off + nb
+        page[0][off:end] = v.to_bytes(nb, "little")
+        page[1][off:end] = m.to_bytes(nb, "little")
+
+    def read_range(self, start: int, size: int) -> Array3valPacked:
+        """
+        Read items start:start+size page by page
+
+        :return: packed array with a copy of the items
+        """
+        self._check_range(start, size)
+        t = self._dtype
+        res = Array3t(t.element_t, size, storage=ARRAY3T_STORAGE_PACKED).from_py(None)
+        nb = self._item_bytes(t.element_t)
+        page_size = t.page_size
+        res_val = res.val
+        res_vld = res.vld_mask
+        i = start
+        end = start + size
+        while i < end:
+            page_i, off = divmod(i, page_size)
+            cnt = min(page_size - off, end - i)
+            page = self._get_page(page_i)
+            if page is not None:
+                dst = (i - start) * nb
+                src = off * nb
+                n = cnt * nb
+                res_val[dst:dst + n] = page[0][src:src + n]
+                res_vld[dst:dst + n] = page[1][src:src + n]
+            i += cnt
+        return res
+
+    def write_range(self, start: int,
+                    val: Union[Array3valPacked, Sequence[object], bytes, bytearray, memoryview],
+                    vld_mask: Union[bytes, bytearray, memoryview, None]=None):
+        """
+        Write items from index start page by page
+
+        :param val: packed array with items or anything accepted by from_py of packed Array3t
+            (list of item values, bytes-like raw image of the value plane)
+        :param vld_mask: bytes-like raw image of the validity plane if val is bytes-like
+        """
+        t = self._dtype
+        nb = self._item_bytes(t.element_t)
+        if not isinstance(val, Array3valPacked):
+            if isinstance(val, (bytes, bytearray, memoryview)):
+                size = len(val) // nb
+            else:
+                size = len(val)
+            val = Array3t(t.element_t, size, storage=ARRAY3T_STORAGE_PACKED).from_py(val, vld_mask)
+        else:
+            assert val._dtype.element_t == t.element_t, (val._dtype, t)
+
+        size = val._dtype.size
+        self._check_range(start, size)
+        page_size = t.page_size
+        src_val = val.val
+        src_vld = val.vld_mask
+        i = start
+        end = start + size
+        while i < end:
+            page_i, off = divmod(i, page_size)
+            cnt = min(page_size - off, end - i)
+            src = (i - start) * nb
+            n = cnt * nb
+            vld = src_vld[src:src + n]
+            # whole chunk invalid does not allocate page
+            page = self._page_for_write(page_i, allocate=vld.count(0) != n)
+            if page is not None:
+                dst = off * nb
+                page[0][dst:dst + n] = src_val[src:src + n]
+                page[1][dst:dst + n] = vld
+            i += cnt
+
+    def to_py(self) -> Dict[int, object]:
+        """
+        :return: dict index -> pythonic value of the item for all items with some bit valid
+        :raise ValidityError: if some item is only partially valid
+        """
+        t = self._dtype
+        page_size = t.page_size
+        res = {}
+        for page_i in sorted(self._pages().keys()):
+            start = page_i * page_size
+            size = min(page_size, t.size - start)
+            for i, v in enumerate(self.read_range(start, size).to_py(), start):
+                if v is not None:
+                    res[i] = v
+        return res
+
+    def trim(self):
+        """
+        Release pages which do not contain any valid bit
+        """
+        pages = self.val
+        shared = self._shared
+        for page_i, (_, vld) in self._pages().items():
+            if vld.count(0) == len(vld):
+                if shared is None:
+                    del pages[page_i]
+                else:
+                    # the page may be in shared layers
+                    pages[page_i] = None
+
+    def page_stats(self) -> Array3PagedStats:
+        t = self._dtype
+        nb = self._item_bytes(t.element_t)
+        page_size = t.page_size
+        occupancy = {i: _valid_item_cnt(vld, nb) for i, (_, vld) in sorted(self._pages().items())}
+        return Array3PagedStats(page_size, (t.size + page_size - 1) // page_size, occupancy)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.to_py()}>"
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 # -*- coding: UTF-8 -*-
+from functools import lru_cache
 import math
 from typing import List, Tuple, Generator, Union, Optional, Literal, Sequence
 
@@ -144,9 +145,35 @@ def bit_set_to(val: int, bitNo: int, bitVal: int) -> int:
         raise ValueError(("Invalid value of bit to set", bitVal))
 
 
+@lru_cache(maxsize=None)
+def _byte_mask_to_bit_mask_table(byte_width: int) -> Tuple[bytes, ...]:
+    """
+    :return: table byte of byte mask -> byte_width bytes of bit mask (little endian),
+        built on first use (byte_width has to be a multiple of 8)
+    """
+    lane = byte_width // 8
+    return tuple(
+        b"".join(b"\xff" * lane if (i >> b) & 1 else bytes(lane) for b in range(8))
+        for i in range(256)
+    )
+
+
 def byte_mask_to_bit_mask_int(m: int, width: int, byte_width:int=8) -> int:
     """
     Expands each bit byte_width times to convert from byte mask to bit mask
+
+    :note: if byte_width is a multiple of 8 each byte of the mask is expanded at once using a 256 item table
+    """
+    if byte_width % 8 == 0 and byte_width:
+        nb = (width + 7) // 8
+        table = _byte_mask_to_bit_mask_table(byte_width)
+        return int.from_bytes(b"".join([table[b] for b in (m & mask(width)).to_bytes(nb, "little")]), "little")
+    return _byte_mask_to_bit_mask_int_bitwise(m, width, byte_width)
+
+
+def _byte_mask_to_bit_mask_int_bitwise(m: int, width: int, byte_width:int=8) -> int:
+    """
+    :see: :func:`~.byte_mask_to_bit_mask_int`, implementation with a loop over the bits
     """
     res = 0
     mTmp = m
@@ -164,19 +191,52 @@ def byte_mask_to_bit_mask(m: "Bits3Val", byte_width:int=8) -> "Bits3Val":
     """
     Replicate each bit byte_width times
     """
-    res = None
-    for b in m:
-        if res is None:
-            res = b._sext(byte_width)
-        else:
-            res = b._sext(byte_width)._concat(res)
+    t = m._dtype
+    w = t.bit_length()
+    if byte_width % 8 == 0:
+        resT = t.__class__._get(w * byte_width, signed=m._SIGNED_FOR_CONCAT_RESULT)
+        val = byte_mask_to_bit_mask_int(m.val, w, byte_width)
+        if m._is_full_valid():
+            return resT._from_py(val, resT._all_mask)
+        return resT.from_py(val, byte_mask_to_bit_mask_int(m.vld_mask, w, byte_width))
 
-    return res
+    from pyMathBitPrecise.bits3t import Concat, Replicate
+    return Concat(*(Replicate(byte_width, m[i]) for i in reversed(range(w))))
+
+
+@lru_cache(maxsize=None)
+def _bit_mask_to_byte_mask_table() -> bytes:
+    """
+    :return: bytes.translate table byte of bit mask -> "1" for 0xff, "0" for 0x00, "x" for the rest,
+        built on first use
+    """
+    table = bytearray(b"x" * 256)
+    table[0x00] = ord("0")
+    table[0xff] = ord("1")
+    return bytes(table)
 
 
 def bit_mask_to_byte_mask_int(m: int, width: int, byte_width:int=8) -> int:
     """
     Compresses all bit in byte to 1 bit to convert from bit mask to byte mask
+
+    :note: for byte_width=8 the bytes are translated to digits of the result at once
+    """
+    assert width % byte_width == 0
+    if byte_width != 8:
+        return _bit_mask_to_byte_mask_int_bitwise(m, width, byte_width)
+
+    nb = width // 8
+    if nb == 0:
+        return 0
+    digits = (m & mask(width)).to_bytes(nb, "big").translate(_bit_mask_to_byte_mask_table())
+    assert b"x" not in digits, "Each byte must be entirely set or entirely unset"
+    return int(digits, 2)
+
+
+def _bit_mask_to_byte_mask_int_bitwise(m: int, width: int, byte_width:int=8) -> int:
+    """
+    :see: :func:`~.bit_mask_to_byte_mask_int`, implementation with a loop over the bytes
     """
     assert width % byte_width == 0
     mTmp = m
@@ -205,6 +265,50 @@ def apply_set_and_clear(val: int, set_flag: int, clear_flag: int):
     return (val & ~clear_flag) | set_flag
 
 
+def _byte_mask_operand(byte_mask: Union["Bits3val", int, None], width: int) -> Tuple[int, Optional[int]]:
+    """
+    :param width: expected width of the byte mask
+    :return: tuple (val, vld_mask) of byte mask, vld_mask is None for fully valid int, None means all bytes
+    """
+    if byte_mask is None:
+        return mask(width), None
+    elif isinstance(byte_mask, int):
+        if byte_mask < 0 or byte_mask > mask(width):
+            raise ValueError("Byte mask out of range", byte_mask, width)
+        return byte_mask, None
+    else:
+        if byte_mask._dtype.bit_length() != width:
+            raise TypeError("Width of byte mask does not match the data", byte_mask._dtype, width)
+        return byte_mask.val, byte_mask.vld_mask
+
+
+def apply_write_with_mask_int(cur_val: int, cur_vld: int, data_val: int, data_vld: int,
+                              byte_mask: int, width: int, byte_mask_vld: Optional[int]=None) -> Tuple[int, int]:
+    """
+    Update bytes of current value selected by byte mask (write strobe) from new data, operands are specified
+    by val and vld_mask.
+
+    :param width: width of the data in bits, the byte_mask has width // 8 bits
+    :param byte_mask_vld: validity mask of byte_mask, None means fully valid
+    :return: tuple (val, vld_mask), same as for :func:`~.apply_write_with_mask`
+        (a byte with invalid mask bit is valid only if the bits in both current and new data are valid 0)
+    """
+    assert width % 8 == 0, width
+    nb = width // 8
+    all_mask = mask(width)
+    if byte_mask_vld is None or byte_mask_vld == mask(nb):
+        m = byte_mask_to_bit_mask_int(byte_mask, nb)
+        keep = ~m & all_mask
+        return (cur_val & keep) | (data_val & m), (cur_vld & keep) | (data_vld & m)
+
+    m = byte_mask_to_bit_mask_int(byte_mask & byte_mask_vld, nb)
+    m_x = byte_mask_to_bit_mask_int(~byte_mask_vld & mask(nb), nb)
+    keep = ~(m | m_x) & all_mask
+    val = (cur_val & keep) | (data_val & m)
+    vld = (cur_vld & keep) | (data_vld & m) | (m_x & cur_vld & ~cur_val & data_vld & ~data_val)
+    return val, vld
+
+
 def apply_write_with_mask(current_data: "Bits3val", new_data: "Bits3val", write_mask: "Bits3val") -> "Bits3val":
     """
     :return: an updated value current_data which has bytes defined by write_mask updated from new_data
@@ -306,6 +410,13 @@ def mask_bytes(val: int, byte_mask: int, mask_bit_length: int) -> int:
         is represented by a vector of bits where each bit is mask
         for byte in data vector.
     """
+    return val & byte_mask_to_bit_mask_int(byte_mask, mask_bit_length)
+
+
+def _mask_bytes_bitwise(val: int, byte_mask: int, mask_bit_length: int) -> int:
+    """
+    :see: :func:`~.mask_bytes`, implementation with a loop over the bits of byte_mask
+    """
     res = 0
     for i, m in enumerate(iter_bits(byte_mask, mask_bit_length)):
         if m:
@@ -321,6 +432,49 @@ INT_BASES = {
     "h": 16,
 }
 
+# str.translate tables for :func:`~.parse_int_literal`
+# x -> 0 for value digits
+_LITERAL_VAL_TABLE = str.maketrans("xX", "00")
+
+
+def _literal_vld_table(base: int) -> dict:
+    """
+    :return: str.translate table which converts each digit of the base to the maximum digit and x to 0
+    """
+    digits = "0123456789abcdef"[:base]
+    max_digit = digits[-1]
+    table = {ord(d): max_digit for d in digits + digits.upper()}
+    table[ord("x")] = table[ord("X")] = "0"
+    return table
+
+
+# base -> str.translate table for validity digits
+_LITERAL_VLD_TABLES = {base: _literal_vld_table(base) for base in INT_BASES.values() if base != 10}
+
+
+def parse_int_literal(s: str) -> Tuple[int, Optional[int]]:
+    """
+    Parse string literal with base specifier (0b, 0o, 0d, 0h), x (or X) marks an invalid digit
+    (e.g. "0b01x1", "0hx0").
+
+    :note: the value and validity digits are converted by str.translate and int(), there is no loop over the digits
+    :return: tuple (val, vld_mask), vld_mask is None if there is no x in the literal
+        (the validity of bits above the digits of the literal is 0)
+    :raise ValueError: for incorrect format or x in decimal literal
+    """
+    if not (s.startswith("0") and len(s) > 2):
+        raise ValueError(s)
+    try:
+        base = INT_BASES[s[1]]
+    except KeyError:
+        raise ValueError("Unknown base specifier in literal", s) from None
+    digits = s[2:]
+    if "x" not in digits and "X" not in digits:
+        return int(digits, base), None
+    if base == 10:
+        raise ValueError("Invalid digits (x) are not supported in decimal literal", s)
+    return int(digits.translate(_LITERAL_VAL_TABLE), base), int(digits.translate(_LITERAL_VLD_TABLES[base]), base)
+
 
 class ValidityError(ValueError):
     """
@@ -354,9 +508,28 @@ def normalize_slice(s: slice, obj_width: int) -> Tuple[int, int]:
     return firstBitNo, size
 
 
+@lru_cache(maxsize=None)
+def _reverse_bits_table() -> bytes:
+    """
+    :return: bytes.translate table byte -> byte with reversed bits, built on first use
+    """
+    return bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
 def reverse_bits(val: int, width: int):
     """
     Reverse bits in integer value of specified width
+
+    :note: the bits are reversed in each byte using a table and the bytes are read in reversed order
+    """
+    nb = (width + 7) // 8
+    b = (val & mask(width)).to_bytes(nb, "little").translate(_reverse_bits_table())
+    return int.from_bytes(b, "big") >> (nb * 8 - width)
+
+
+def _reverse_bits_bitwise(val: int, width: int):
+    """
+    :see: :func:`~.reverse_bits`, implementation with a loop over the bits
     """
     v = 0
     for i in range(width):
@@ -497,28 +670,44 @@ def int_to_int_list(v: int, item_width: int, number_of_items: int):
     return res
 
 
-def reverse_byte_order(val: "Bits3val"):
+def reverse_byte_order(val: "Bits3val", word_width: int=8) -> "Bits3val":
     """
-    Reverse byteorder (littleendian/bigendian) of signal or value
+    Reverse byteorder (littleendian/bigendian) of value (or order of words of word_width bits)
+
+    :note: if the width is not a multiple of word_width the lowest word is shorter
+        and it becomes the highest word of the result
+    :see: :func:`~.reverse_word_order_int`
     """
-    w = val._dtype.bit_length()
-    i = w
-    items = []
+    t = val._dtype
+    w = t.bit_length()
+    resT = t.__class__._get(w, signed=val._SIGNED_FOR_CONCAT_RESULT)
+    v = reverse_word_order_int(val.val, w, word_width)
+    if val._is_full_valid():
+        return resT._from_py(v, resT._all_mask)
+    return resT._from_py(v, reverse_word_order_int(val.vld_mask, w, word_width))
 
-    while i > 0:
-        # take last 8 bytes or rest
-        lower = max(i - 8, 0)
-        items.append(val[i:lower])
-        i -= 8
 
-    # Concat(*items)
-    top = None
-    for s in items:
-        if top is None:
-            top = s
+def reverse_word_order_int(val: int, width: int, word_width: int=8) -> int:
+    """
+    Reverse order of words of word_width bits (byteorder littleendian/bigendian for word_width=8)
+
+    :note: the words are taken from MSB, if the width is not a multiple of word_width
+        the lowest word is shorter and it becomes the highest word of the result
+    :note: words of whole bytes are reordered using int.to_bytes/int.from_bytes
+    """
+    r = width % word_width
+    full_w = width - r
+    v = val >> r
+    if word_width % 8 == 0:
+        b = v.to_bytes(full_w // 8, "big")
+        wb = word_width // 8
+        if wb == 1:
+            v = int.from_bytes(b, "little")
         else:
-            top = top._concat(s)
-    return top
+            v = int.from_bytes(b"".join(b[i:i + wb] for i in range(len(b) - wb, -1, -wb)), "big")
+    else:
+        v = int_list_to_int(int_to_int_list(v, word_width, full_w // word_width)[::-1], word_width)
+    return ((val & mask(r)) << full_w) | v
 
 
 def reverse_byte_order_int(val: int, width: int):
@@ -576,9 +765,18 @@ def round_up_to_power_of_2(x: int):
     return int(2 ** math.ceil(math.log2(x)))
 
 
-def ctlz(Val: int, width: int) -> int:
+def ctlz(val: int, width: int) -> int:
     """
     Count leading zeros
+
+    :note: uses int.bit_length(), see :func:`~._ctlz_bisection` for the original implementation
+    """
+    return width - val.bit_length()
+
+
+def _ctlz_bisection(Val: int, width: int) -> int:
+    """
+    :see: :func:`~.ctlz`, implementation with bisection method
     """
     if Val == 0:
         return width
@@ -608,12 +806,12 @@ def _ctpop_u64(v: int) -> int:
     v = v - ((v >> 1) & 0x5555555555555555)
     v = (v & 0x3333333333333333) + ((v >> 2) & 0x3333333333333333)
     v = (v + (v >> 4)) & 0x0F0F0F0F0F0F0F0F
-    return (v * 0x0101010101010101) >> 56
+    return ((v * 0x0101010101010101) & mask(64)) >> 56
 
 
-def ctpop(val: int, width: int):
+def _ctpop_swar(val: int, width: int):
     """
-    count number of 1 in val (population count)
+    :see: :func:`~.ctpop`, implementation with SWAR arithmetic on 64b chunks
     """
     res = 0
     mask_u64 = mask(64)
@@ -626,16 +824,57 @@ def ctpop(val: int, width: int):
     return res
 
 
+def _ctpop_bin(val: int, width: int):
+    """
+    :see: :func:`~.ctpop`, implementation with count of "1" in binary string
+    """
+    return bin(val & mask(width)).count("1")
+
+
+if hasattr(int, "bit_count"):
+    # python >= 3.10
+
+    def ctpop(val: int, width: int):
+        """
+        count number of 1 in val (population count)
+
+        :note: uses int.bit_count()
+        """
+        return (val & mask(width)).bit_count()
+
+else:
+
+    def ctpop(val: int, width: int):
+        """
+        count number of 1 in val (population count)
+
+        :note: SWAR arithmetic for a single 64b chunk, string count for wider values
+        """
+        if width <= 64:
+            return _ctpop_u64(val & mask(width))
+        return _ctpop_bin(val, width)
+
+
 def cttz(val: int, width:int):
     """
     Count trailing zeros
+
+    :note: uses (x & -x).bit_length() - 1, see :func:`~._cttz_bisection` for the original implementation
+    """
+    if val == 0:
+        return width
+    return (val & -val).bit_length() - 1
+
+
+def _cttz_bisection(val: int, width:int):
+    """
+    :see: :func:`~.cttz`, implementation with bisection method
     """
     if val == 0:
         return width
     if val & 0x1:
         return 0
 
-    # ctpop method: (x & -x).bit_length() - 1
     # Bisection method.
     ZeroBits = 0
     if not is_power_of_2(width):
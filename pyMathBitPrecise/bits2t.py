@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Two-state (0/1, without X) variant of :class:`~.Bits3t`/:class:`~.Bits3val`.
+
+The API is the same as for :class:`~.Bits3val`, just the value is always fully valid and there is no vld_mask
+computation in operators. An attempt to create an invalid value raises :class:`~.ValidityError`.
+Values can be converted between two-state and three-state variant
+(:meth:`~.Bits2val.to_bits3val`, :meth:`~.Bits2t.from_bits3val`).
+
+The :func:`~.get_bits_t` can be used to switch whole model between two-state and three-state
+types by a single flag.
+"""
+
+from enum import Enum
+from typing import Union, Optional, Self, Literal, Iterable, List
+
+from pyMathBitPrecise.bit_utils import get_bit, get_bit_range, \
+    to_signed, set_bit_range, bit_set_to, bit_field, ValidityError, normalize_slice, \
+    parse_int_literal
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val, _NOT_SPECIFIED
+
+
+class Bits2t(Bits3t):
+    """
+    Meta type for integer of specified size where each bit can be only '1' or '0'
+
+    :see: :class:`~.Bits3t`
+    """
+    __slots__ = ()
+    # does not add any property to the key
+    _INTERNED = True
+
+    def _normalize_val(self, val: Union[int, bytes, str, Enum, Bits3val]) -> int:
+        """
+        :return: unsigned representation of the value
+        """
+        if type(val) is int:
+            # fast path for the most common case
+            if val < 0:
+                if not self.signed:
+                    raise ValueError("Negative value for unsigned int", val)
+                if val < -(1 << (self._bit_length - 1)):
+                    raise ValueError("Value too small to fit in this type", val)
+                return val & self._all_mask
+            elif self.signed and val >> (self._bit_length - 1):
+                raise ValueError("Value too large to fit in this type", val)
+            elif val > self._all_mask:
+                raise ValueError("Not enough bits to represent value",
+                                 val, "on", self._bit_length, "bit" if self._bit_length == 1 else "bits")
+            return val
+        elif isinstance(val, (Bits3val, Bits2val)):
+            return self.from_bits3val(val).val
+
+        val, vld = self._normalize_val_and_mask(val, None)
+        if vld != self._all_mask:
+            raise ValidityError("Two-state type can not represent value with invalid bits", self, val, vld)
+        return val
+
+    def from_py(self, val: Union[int, bytes, str, Enum], vld_mask: Optional[int]=None) -> "Bits2val":
+        """
+        Construct value from pythonic value
+
+        :note: vld_mask is accepted for compatibility with :meth:`Bits3t.from_py`, it has to be all ones
+        """
+        if vld_mask is not None and vld_mask != self._all_mask:
+            raise ValidityError("Two-state type can not represent value with invalid bits", self, val, vld_mask)
+        if val is None:
+            raise ValidityError("Two-state type can not represent value with invalid bits", self, val)
+        return Bits2val(self, self._normalize_val(val))
+
+    def from_py_literals(self, literals: Iterable[str]) -> List["Bits2val"]:
+        """
+        Construct values from many string literals in a single call
+
+        :see: :meth:`Bits3t.from_py_literals`
+        """
+        res = []
+        for literal in literals:
+            val, vld = parse_int_literal(literal)
+            if vld is not None:
+                raise ValidityError("Two-state type can not represent value with invalid bits", self, literal)
+            res.append(Bits2val(self, self._normalize_val(val)))
+        return res
+
+    def _from_py(self, val: int, vld_mask: Optional[int]=None) -> "Bits2val":
+        """
+        from_py without normalization
+
+        :attention: val has to be unsigned and in range of this type
+        """
+        return Bits2val(self, val)
+
+    def from_bits3val(self, v: Union[Bits3val, "Bits2val"]) -> "Bits2val":
+        """
+        Convert a value of :class:`~.Bits3t` (or other two-state) type of same width to a value of this type
+
+        :raise ValidityError: if the value has some invalid bits
+        """
+        if v._dtype.bit_length() != self._bit_length:
+            raise TypeError("Width of the value does not match", self, v._dtype)
+        if not v._is_full_valid():
+            raise ValidityError("Two-state type can not represent value with invalid bits", self, v)
+        return Bits2val(self, v.val)
+
+    @classmethod
+    def from_bits3t(cls, t: Bits3t) -> "Bits2t":
+        """
+        :return: two-state variant of :class:`~.Bits3t` type
+        """
+        return cls._get(t.bit_length(), signed=t.signed, name=t.name, force_vector=t.force_vector,
+                        strict_sign=t.strict_sign, strict_width=t.strict_width)
+
+    def to_bits3t(self) -> Bits3t:
+        """
+        :return: three-state variant of this type
+        """
+        return Bits3t._get(self._bit_length, signed=self.signed, name=self.name, force_vector=self.force_vector,
+                           strict_sign=self.strict_sign, strict_width=self.strict_width)
+
+    def enable_const_pool(self):
+        """
+        :raise TypeError: the const pool is not supported for two-state types
+            (:class:`~.Bits2val` operators do not check for shared values)
+        """
+        raise TypeError("Const pool is not supported for two-state types", self)
+
+    def enable_specialization(self):
+        """
+        :raise TypeError: the specialization is not supported for two-state types
+            (the specialized classes are subclasses of :class:`~.Bits3val`)
+        """
+        raise TypeError("Specialization is not supported for two-state types", self)
+
+
+def get_bits_t(bit_length: int, signed: Optional[bool]=False, two_state: bool=False, **kwargs) -> Bits3t:
+    """
+    :return: :class:`~.Bits2t` if two_state else :class:`~.Bits3t` type
+    """
+    if two_state:
+        return Bits2t(bit_length, signed=signed, **kwargs)
+    else:
+        return Bits3t(bit_length, signed=signed, **kwargs)
+
+
+class Bits2val():
+    """
+    Class for value of :class:`~.Bits2t` type
+
+    :ivar ~._dtype: reference on type of this value
+    :ivar ~.val: always unsigned representation int value
+    :note: the vld_mask is a read only property which returns all ones,
+        it is there for compatibility with :class:`~.Bits3val`
+    """
+    __slots__ = ("_dtype", "val")
+    _BOOL = Bits2t(1)
+    _SIGNED_FOR_SLICE_RESULT = False
+    _SIGNED_FOR_CONCAT_RESULT = False
+
+    def __init__(self, t: Bits2t, val: int):
+        if not isinstance(t, Bits2t):
+            raise TypeError(t)
+        if type(val) != int:
+            raise TypeError(val)
+        self._dtype = t
+        self.val = val
+
+    @property
+    def vld_mask(self) -> int:
+        return self._dtype._all_mask
+
+    def __copy__(self) -> Self:
+        return self.__class__(self._dtype, self.val)
+
+    def to_bits3val(self) -> Bits3val:
+        """
+        Convert to a value of three-state type
+        """
+        t = self._dtype.to_bits3t()
+        return t._from_py(self.val, t._all_mask)
+
+    def to_py(self) -> int:
+        return int(self)
+
+    def _is_full_valid(self) -> bool:
+        """
+        :return: always True, two-state value is always fully valid
+        """
+        return True
+
+    def __int__(self) -> int:
+        "int(self)"
+        t = self._dtype
+        if t.signed:
+            return to_signed(self.val, t._bit_length)
+        else:
+            return self.val
+
+    def __bool__(self) -> bool:
+        "bool(self)"
+        return bool(self.val)
+
+    def _auto_cast(self, dtype):
+        """
+        Cast value to a compatible type
+        """
+        return dtype.from_py(int(self))
+
+    def _operand_val(self, other: Union[int, "Bits2val", Bits3val]) -> int:
+        """
+        :return: unsigned value of other operand converted to type of self
+        """
+        if isinstance(other, Bits2val):
+            return other.val
+        elif isinstance(other, int):
+            return self._dtype._normalize_val(other)
+        elif isinstance(other, Bits3val):
+            if not other._is_full_valid():
+                raise ValidityError("Two-state type can not represent value with invalid bits", self._dtype, other)
+            return other.val
+        else:
+            raise TypeError(other)
+
+    def _cmp_operand_val(self, other: Union[int, "Bits2val", Bits3val]) -> int:
+        """
+        :return: unsigned value of other operand of compare operator
+        """
+        if isinstance(other, (Bits2val, Bits3val)):
+            t = self._dtype
+            ot = other._dtype
+            if bool(t.signed) != bool(ot.signed) or t._bit_length != ot.bit_length():
+                raise TypeError("Value compare supports only same width and sign type", t, ot)
+        return self._operand_val(other)
+
+    def _new_of_type(self, t: Bits2t, val: int, vld_mask: int) -> Self:
+        """
+        Construct a new value of other type
+
+        :see: :meth:`~.Bits3val._new_of_type`
+        :raise ValidityError: if vld_mask is not all ones
+        """
+        if vld_mask != t._all_mask:
+            raise ValidityError("Two-state type can not represent value with invalid bits", t, val, vld_mask)
+        if self.__class__ is Bits2val:
+            return t._from_py(val)
+        v = self.__copy__()
+        v._dtype = t
+        v.val = val
+        return v
+
+    def _cast_sign(self, signed: Optional[bool], **typeMutateKwArgs) -> Self:
+        """
+        Cast signed-unsigned value
+        """
+        t = self._dtype
+        if t.signed == signed:
+            return self
+        resT = t._createMutated(signed=signed, **typeMutateKwArgs)
+        return resT._from_py(self.val)
+
+    def _concat(self, other: Union["Bits2val", Bits3val]) -> Self:
+        """
+        Concatenate two bit vectors together (self will be at MSB side)
+        Verilog: {self, other}, VHDL: self & other
+        """
+        if not isinstance(other, (Bits2val, Bits3val)):
+            raise TypeError(other)
+        if not other._is_full_valid():
+            raise ValidityError("Two-state type can not represent value with invalid bits", self._dtype, other)
+        other_w = other._dtype.bit_length()
+        resT = self._dtype.__class__._get(self._dtype._bit_length + other_w,
+                                          signed=self._SIGNED_FOR_CONCAT_RESULT)
+        return resT._from_py((self.val << other_w) | other.val)
+
+    def _ext(self, newWidth: int, signed: Union[bool, Literal[_NOT_SPECIFIED]]=_NOT_SPECIFIED) -> Self:
+        """
+        :note: preserves sign of type
+        """
+        if signed is _NOT_SPECIFIED:
+            signed = self._dtype.signed
+        if signed:
+            return self._sext(newWidth)
+        else:
+            return self._zext(newWidth)
+
+    def _sext(self, newWidth: int) -> Self:
+        """
+        signed extension, pad with MSB bit on MSB side to newWidth result width
+        :see: :meth:`Bits3val._ext`
+        """
+        t = self._dtype
+        w = t._bit_length
+        if newWidth == w:
+            return self
+        assert newWidth > w, (newWidth, w)
+        resTy = t._createMutated(newWidth)
+        val = self.val
+        if get_bit(val, w - 1):
+            val |= bit_field(w, newWidth)
+        return resTy._from_py(val)
+
+    def _zext(self, newWidth: int) -> Self:
+        """
+        zero extension, pad with 0 on msb side to newWidth result width
+        :see: :meth:`Bits3val._ext`
+        """
+        t = self._dtype
+        w = t._bit_length
+        if newWidth == w:
+            return self
+        assert newWidth > w, (newWidth, w)
+        return t._createMutated(newWidth)._from_py(self.val)
+
+    def _trunc(self, newWidth: int) -> Self:
+        assert newWidth > 0, newWidth
+        w = self._dtype._bit_length
+        assert newWidth <= w, newWidth
+        resTy = self._dtype._createMutated(newWidth)
+        return resTy._from_py(self.val & resTy._all_mask)
+
+    def _extOrTrunc(self, newWidth: int, signed: Union[bool, Literal[_NOT_SPECIFIED]]=_NOT_SPECIFIED) -> Self:
+        w = self._dtype._bit_length
+        if w < newWidth:
+            return self._ext(newWidth, signed)
+        elif w > newWidth:
+            return self._trunc(newWidth)
+        else:
+            return self
+
+    def __getitem__(self, key: Union[int, slice, Self]) -> Self:
+        "self[key]"
+        if isinstance(key, slice):
+            firstBitNo, size = normalize_slice(key, self._dtype._bit_length)
+            val = get_bit_range(self.val, firstBitNo, size)
+        elif isinstance(key, (int, Bits2val, Bits3val)):
+            size = 1
+            _i = int(key)
+            if _i < 0 or _i >= self._dtype._bit_length:
+                raise IndexError("Index out of range", _i)
+            val = get_bit(self.val, _i)
+        else:
+            raise TypeError(key)
+
+        new_t = self._dtype._createMutated(size, signed=self._SIGNED_FOR_SLICE_RESULT)
+        return new_t._from_py(val)
+
+    def __setitem__(self, index: Union[slice, int, Self],
+                    value: Union[int, Self]):
+        "An item assignment operator self[index] = value."
+        if isinstance(index, slice):
+            firstBitNo, size = normalize_slice(index, self._dtype._bit_length)
+            if isinstance(value, (Bits2val, Bits3val)):
+                if not value._is_full_valid():
+                    raise ValidityError("Two-state type can not represent value with invalid bits", self._dtype, value)
+                v = value.val
+            else:
+                v = value
+            self.val = set_bit_range(self.val, firstBitNo, size, v)
+        else:
+            if index is None:
+                raise TypeError(index)
+            index = int(index)
+            if value is None:
+                raise ValidityError("Two-state type can not represent value with invalid bits", self._dtype, value)
+            elif isinstance(value, (Bits2val, Bits3val)):
+                if not value._is_full_valid():
+                    raise ValidityError("Two-state type can not represent value with invalid bits", self._dtype, value)
+                v = value.val
+            else:
+                v = value
+            self.val = bit_set_to(self.val, index, v)
+
+    def __invert__(self) -> Self:
+        "Operator ~x."
+        return self._dtype._from_py(~self.val & self._dtype._all_mask)
+
+    def __neg__(self) -> Self:
+        "Operator -x."
+        # the result is the same for signed and unsigned after the cut off of the upper bits
+        return self._dtype._from_py(-self.val & self._dtype._all_mask)
+
+    def __hash__(self) -> int:
+        return hash((self._dtype, self.val))
+
+    def _is(self, other) -> bool:
+        """check if other is object with same values"""
+        return isinstance(other, Bits2val)\
+            and self._dtype == other._dtype\
+            and self.val == other.val
+
+    def _eq(self, other: Union[int, Self]) -> Self:
+        """
+        Operator self._eq(other) as self == other
+        == is not overridden in order to prevent tricky behavior if hashing partially valid values
+        """
+        return self._BOOL._from_py(int(self.val == self._cmp_operand_val(other)))
+
+    def __req__(self, other: int) -> Self:
+        "Operator ==."
+        return self._eq(other)
+
+    def __ne__(self, other: Union[int, Self]) -> Self:
+        "Operator !=."
+        return self._BOOL._from_py(int(self.val != self._cmp_operand_val(other)))
+
+    def __rne__(self, other: int) -> Self:
+        "Operator !=."
+        return self.__ne__(other)
+
+    def _cmp_vals(self, other: Union[int, Self]):
+        """
+        :return: values of self and other which can be compared by python compare operators
+        """
+        v1 = self._cmp_operand_val(other)
+        v0 = self.val
+        t = self._dtype
+        if t.signed:
+            # signed comparison of unsigned representations
+            msb = 1 << (t._bit_length - 1)
+            v0 ^= msb
+            v1 ^= msb
+        return v0, v1
+
+    def __lt__(self, other: Union[int, Self]) -> Self:
+        "Operator <."
+        v0, v1 = self._cmp_vals(other)
+        return self._BOOL._from_py(int(v0 < v1))
+
+    def __rlt__(self, other: int) -> Self:
+        "Operator <."
+        return self._dtype.from_py(other).__lt__(self)
+
+    def __gt__(self, other: Union[int, Self]) -> Self:
+        "Operator >."
+        v0, v1 = self._cmp_vals(other)
+        return self._BOOL._from_py(int(v0 > v1))
+
+    def __rgt__(self, other: int) -> Self:
+        "Operator >."
+        return self._dtype.from_py(other).__gt__(self)
+
+    def __ge__(self, other: Union[int, Self]) -> Self:
+        "Operator >=."
+        v0, v1 = self._cmp_vals(other)
+        return self._BOOL._from_py(int(v0 >= v1))
+
+    def __rge__(self, other: int) -> Self:
+        "Operator >=."
+        return self._dtype.from_py(other).__ge__(self)
+
+    def __le__(self, other: Union[int, Self]) -> Self:
+        "Operator <=."
+        v0, v1 = self._cmp_vals(other)
+        return self._BOOL._from_py(int(v0 <= v1))
+
+    def __rle__(self, other: int) -> Self:
+        "Operator <=."
+        return self._dtype.from_py(other).__le__(self)
+
+    def __xor__(self, other: Union[int, Self]) -> Self:
+        "Operator ^."
+        return self._dtype._from_py(self.val ^ self._operand_val(other))
+
+    def __rxor__(self, other: int) -> Self:
+        "Operator ^."
+        return self.__xor__(other)
+
+    def __ixor__(self, other: Union[int, Self]) -> Self:
+        "Operator ^=. (modifies self)"
+        self.val ^= self._operand_val(other)
+        return self
+
+    def __and__(self, other: Union[int, Self]) -> Self:
+        "Operator &."
+        return self._dtype._from_py(self.val & self._operand_val(other))
+
+    def __rand__(self, other: int) -> Self:
+        "Operator &."
+        return self.__and__(other)
+
+    def __iand__(self, other: Union[int, Self]) -> Self:
+        "Operator &=. (modifies self)"
+        self.val &= self._operand_val(other)
+        return self
+
+    def __or__(self, other: Union[int, Self]) -> Self:
+        "Operator |."
+        return self._dtype._from_py(self.val | self._operand_val(other))
+
+    def __ror__(self, other: int) -> Self:
+        "Operator |."
+        return self.__or__(other)
+
+    def __ior__(self, other: Union[int, Self]) -> Self:
+        "Operator |=. (modifies self)"
+        self.val |= self._operand_val(other)
+        return self
+
+    def __sub__(self, other: Union[int, Self]) -> Self:
+        "Operator -."
+        t = self._dtype
+        return t._from_py((self.val - self._operand_val(other)) & t._all_mask)
+
+    def __rsub__(self, other: Union[int, Self]) -> Self:
+        "Operator -."
+        t = self._dtype
+        return t._from_py((self._operand_val(other) - self.val) & t._all_mask)
+
+    def __isub__(self, other: Union[int, Self]) -> Self:
+        "Operator -=. (modifies self)"
+        self.val = (self.val - self._operand_val(other)) & self._dtype._all_mask
+        return self
+
+    def __add__(self, other: Union[int, Self]) -> Self:
+        "Operator +."
+        t = self._dtype
+        return t._from_py((self.val + self._operand_val(other)) & t._all_mask)
+
+    def __radd__(self, other: Union[int, Self]) -> Self:
+        "Operator +."
+        return self.__add__(other)
+
+    def __iadd__(self, other: Union[int, Self]) -> Self:
+        "Operator +=. (modifies self)"
+        self.val = (self.val + self._operand_val(other)) & self._dtype._all_mask
+        return self
+
+    def _shift_amount(self, other: Union[int, Self]) -> int:
+        sh = int(other)
+        if sh < 0:
+            raise ValueError("negative shift count")
+        return sh
+
+    def _shr(self, sh: int) -> int:
+        """
+        :return: value shifted right (logical shift for unsigned, arithmetic for signed)
+        """
+        t = self._dtype
+        w = t._bit_length
+        v = self.val
+        if sh >= w:
+            # completely shifted out (same as :func:`pyMathBitPrecise.bits3t.bitsBitOp__ashr`)
+            return 0
+        elif t.signed and v >> (w - 1):
+            return (v >> sh) | bit_field(w - sh, w)
+        return v >> sh
+
+    def __rshift__(self, other: Union[int, Self]) -> Self:
+        "Operator >>."
+        return self._dtype._from_py(self._shr(self._shift_amount(other)))
+
+    def __irshift__(self, other: Union[int, Self]) -> Self:
+        "Operator >>=. (modifies self)"
+        self.val = self._shr(self._shift_amount(other))
+        return self
+
+    def __lshift__(self, other: Union[int, Self]) -> Self:
+        "Operator <<. (shifts in 0)"
+        t = self._dtype
+        return t._from_py((self.val << self._shift_amount(other)) & t._all_mask)
+
+    def __ilshift__(self, other: Union[int, Self]) -> Self:
+        "Operator <<=. (shifts in 0, modifies self)"
+        self.val = (self.val << self._shift_amount(other)) & self._dtype._all_mask
+        return self
+
+    def _signed_vals(self, other: Union[int, Self]):
+        """
+        :return: python int values of self and other (resolved sign)
+        """
+        t = self._dtype
+        v0 = self.val
+        if isinstance(other, int):
+            v1 = other
+        else:
+            v1 = self._operand_val(other)
+        if t.signed:
+            w = t._bit_length
+            v0 = to_signed(v0, w)
+            if not isinstance(other, int):
+                v1 = to_signed(v1, w)
+        return v0, v1
+
+    def __floordiv__(self, other: Union[int, Self]) -> Self:
+        "Operator //."
+        t = self._dtype
+        v0, v1 = self._signed_vals(other)
+        return t._from_py((v0 // v1) & t._all_mask)
+
+    def __mul__(self, other: Union[int, Self]) -> Self:
+        "Operator *."
+        t = self._dtype
+        v1 = other if isinstance(other, int) else self._operand_val(other)
+        # the result is the same for signed and unsigned after the cut off of the upper bits
+        return t._from_py((self.val * v1) & t._all_mask)
+
+    def __mod__(self, other: Union[int, Self]) -> Self:
+        "Operator %."
+        t = self._dtype
+        v0, v1 = self._signed_vals(other)
+        return t._from_py((v0 % v1) & t._all_mask)
+
+    def _ternary(self, a, b):
+        """
+        Ternary operator (a if self else b).
+        """
+        if self:
+            return a
+        else:
+            return b
+
+    def __repr__(self):
+        t = self._dtype
+        typeDescrChar = 'b' if t.signed is None else 'i' if t.signed else 'u'
+        if t._bit_length == 1 and t.force_vector:
+            vecSpec = "vec"
+        else:
+            vecSpec = ""
+        return (f"<{self.__class__.__name__:s} {typeDescrChar:s}{t._bit_length:d}{vecSpec:s}"
+                f" {to_signed(self.val, t._bit_length) if t.signed else self.val:d}>")
@@ -1,18 +1,21 @@
 #!/usr/bin/env python3
 # -*- coding: UTF-8 -*-
 
+from collections import deque
 from copy import copy
+import copyreg
 from enum import Enum
-from math import log2, ceil
 from operator import le, ge, gt, lt, ne, eq, and_, or_, xor, sub, add
-from typing import Union, Optional, Callable, Self, Literal
+from typing import Union, Optional, Callable, Self, Literal, Dict, Iterable, List, Tuple
+from weakref import ref
 
 from pyMathBitPrecise.array3t import Array3t
 from pyMathBitPrecise.bit_utils import mask, get_bit, get_bit_range, \
-    to_signed, set_bit_range, bit_set_to, bit_field, to_unsigned, INT_BASES, \
-    ValidityError, normalize_slice, rotate_right, rotate_left
-from pyMathBitPrecise.bits3t_vld_masks import vld_mask_for_xor, vld_mask_for_and, \
-    vld_mask_for_or
+    to_signed, set_bit_range, bit_set_to, bit_field, to_unsigned, parse_int_literal, \
+    ValidityError, normalize_slice, rotate_right, rotate_left, \
+    apply_write_with_mask_int, _byte_mask_operand, ctpop, ctlz, cttz
+from pyMathBitPrecise.bits3t_vld_masks import vld_mask_for_xor_raw, \
+    vld_mask_for_and_raw, vld_mask_for_or_raw
 
 
 class _NOT_SPECIFIED:
@@ -21,7 +24,40 @@ class _NOT_SPECIFIED:
         raise AssertionError("This class should be used as a constant")
 
 
-class Bits3t():
+# maximum width of the type which can have const pool (values of 2**(2*BITS3T_CONST_POOL_MAX_WIDTH) items)
+BITS3T_CONST_POOL_MAX_WIDTH = 8
+# key: Bits3t._intern_key(), value: weak reference to the canonical instance of the type
+_BITS3T_INTERNED: Dict[tuple, ref] = {}
+# strong references to recently created types, to keep temporary types (e.g. type of slice)
+# alive between uses, the oldest types are left only to weak references
+_BITS3T_RECENTLY_CREATED = deque(maxlen=1024)
+
+
+def _Bits3t_get_interned(key: tuple) -> Optional["Bits3t"]:
+    """
+    :return: canonical instance of the type for the key or None if there is not any
+    """
+    r = _BITS3T_INTERNED.get(key, None)
+    if r is None:
+        return None
+    return r()
+
+
+class Bits3tMeta(type):
+    """
+    Metaclass which makes every instance of :class:`Bits3t` canonical (flyweight),
+    the type constructor returns the already existing instance if there is an equal one.
+
+    :note: The canonical instances are held only by weak reference
+        (and by strong reference for last few created types)
+        and are discarded from registry once they are not used anymore.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        return super().__call__(*args, **kwargs)._intern()
+
+
+class Bits3t(metaclass=Bits3tMeta):
     """
     Meta type for integer of specified size where
     each bit can be '1', '0' or 'X' for undefined value.
@@ -42,7 +78,31 @@ class Bits3t():
         does not have strict flag set,
         the result width/sign is taken from other operand
         (or first if both are not strict)
+    :note: instances are interned (see :class:`~.Bits3tMeta`),
+        types with same properties are the same object
+        and they must not be modified after construction
+    :note: a subclass is interned only if it overrides :meth:`~._intern_key`
+        (a subclass which adds a property has to add it to the key and to :meth:`~._createMutated`)
+        or if it sets _INTERNED = True explicitly (a subclass which does not add any property),
+        instances of other subclasses are left as they are
+    :ivar ~._hash: cached hash of the type
+    :ivar ~._const_pool: None or list of shared values for every combination of val and vld_mask,
+        index is (vld_mask << bit_length) | val, see :meth:`~.enable_const_pool`
+    :ivar ~._const_pool_py: None or dict python value -> shared value, used in :meth:`~.from_py`
+    :ivar ~._value_cls: None or class of values of this type (None means :class:`~.Bits3val`),
+        see :meth:`~.enable_specialization`
     """
+    __slots__ = ("_bit_length", "signed", "_all_mask", "name", "force_vector",
+                 "strict_sign", "strict_width", "_hash",
+                 "_const_pool", "_const_pool_py", "_value_cls", "__weakref__")
+    # if True the instances of this class are interned, see :meth:`~.__init_subclass__`
+    _INTERNED = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_INTERNED" not in cls.__dict__:
+            # a subclass may add a property which would not be in the key
+            cls._INTERNED = "_intern_key" in cls.__dict__
 
     def __init__(self, bit_length: int, signed:Optional[bool]=False, name: Optional[str]=None,
                  force_vector=False,
@@ -56,6 +116,52 @@ class Bits3t():
         self.force_vector = force_vector
         self.strict_sign = strict_sign
         self.strict_width = strict_width
+        self._const_pool = None
+        self._const_pool_py = None
+        self._value_cls = None
+
+    @classmethod
+    def _get(cls, bit_length: int, signed:Optional[bool]=False, name: Optional[str]=None,
+             force_vector=False,
+             strict_sign=True, strict_width=True) -> Self:
+        """
+        Same as constructor but does not construct a temporary object if this type already exists.
+        """
+        t = _Bits3t_get_interned((cls, bit_length, signed, name, force_vector, strict_sign, strict_width))
+        if t is None:
+            t = cls(bit_length, signed=signed, name=name, force_vector=force_vector,
+                    strict_sign=strict_sign, strict_width=strict_width)
+        return t
+
+    def _intern_key(self) -> tuple:
+        """
+        :return: tuple of all properties which are specifying this type
+        :note: subclass which adds a new property has to override this method (and :meth:`~._createMutated`)
+        """
+        return (self.__class__, self._bit_length, self.signed, self.name,
+                self.force_vector, self.strict_sign, self.strict_width)
+
+    def _intern(self) -> Self:
+        """
+        :return: canonical instance of this type, register self if there is not any
+        """
+        key = self._intern_key()
+        if not self._INTERNED:
+            self._hash = hash(key)
+            return self
+        t = _Bits3t_get_interned(key)
+        if t is None:
+            self._hash = hash(key)
+
+            def _discard(r, key=key):
+                # called when the type is garbage collected
+                if _BITS3T_INTERNED.get(key, None) is r:
+                    del _BITS3T_INTERNED[key]
+
+            _BITS3T_INTERNED[key] = ref(self, _discard)
+            _BITS3T_RECENTLY_CREATED.append(self)
+            t = self
+        return t
 
     def _createMutated(self,
             bit_length: int=_NOT_SPECIFIED,
@@ -75,15 +181,19 @@ class Bits3t():
             strict_sign = self.strict_sign
         if strict_width is _NOT_SPECIFIED:
             strict_width = self.strict_width
-        return self.__class__(bit_length, signed=signed, name=name, force_vector=force_vector, strict_sign=strict_sign, strict_width=strict_width)
+        return self.__class__._get(bit_length, signed=signed, name=name, force_vector=force_vector, strict_sign=strict_sign, strict_width=strict_width)
 
     def __copy__(self) -> Self:
-        t = self.__class__(self._bit_length, signed=self.signed,
-                           name=self.name,
-                           force_vector=self.force_vector,
-                           strict_sign=self.strict_sign,
-                           strict_width=self.strict_width)
-        return t
+        # types are interned and immutable
+        return self
+
+    def __reduce__(self):
+        if not self._INTERNED:
+            # the subclass may have an additional state
+            return (copyreg.__newobj__, (self.__class__,), self.__getstate__())
+        # construct through constructor on unpickling in order to get the canonical instance
+        return (self.__class__, (self._bit_length, self.signed, self.name,
+                                 self.force_vector, self.strict_sign, self.strict_width))
 
     def all_mask(self) -> int:
         """
@@ -130,14 +240,12 @@ class Bits3t():
         return self._bit_length
 
     def __eq__(self, other) -> bool:
+        # :note: equal types are the same object because of interning,
+        #     the rest is just for the case the other type was not created by constructor
         return (self is other
                 or (isinstance(other, Bits3t)
-                    and self._bit_length == other._bit_length
-                    and self.name == other.name
-                    and self.force_vector == other.force_vector
-                    and self.strict_sign == other.strict_sign
-                    and self.strict_width == other.strict_width
-                    and self.signed == other.signed
+                    and self._hash == other._hash
+                    and self._intern_key() == other._intern_key()
                     )
                 )
 
@@ -155,36 +263,10 @@ class Bits3t():
                 val = int.from_bytes(
                     val, byteorder="little", signed=bool(self.signed))
             elif isinstance(val, str):
-                if not (val.startswith("0") and len(val) > 2):
-                    raise ValueError(val)
-
-                base = INT_BASES[val[1]]
-                try:
-                    _val = int(val[2:], base)
-                except ValueError:
-                    _val = None
-
-                if _val is None:
+                val, _vld_mask = parse_int_literal(val)
+                if _vld_mask is not None:
                     assert vld_mask is None
-                    val = val.lower()
-                    if base == 10 and "x" in val:
-                        raise NotImplementedError()
-                    v = 0
-                    m = 0
-                    bits_per_char = ceil(log2(base))
-                    char_mask = mask(bits_per_char)
-                    for digit in val[2:]:
-                        v <<= bits_per_char
-                        m <<= bits_per_char
-                        if digit == "x":
-                            pass
-                        else:
-                            m |= char_mask
-                            v |= int(digit, base)
-                    val = v
-                    vld_mask = m
-                else:
-                    val = _val
+                    vld_mask = _vld_mask
             else:
                 try:
                     val = int(val)
@@ -194,7 +276,8 @@ class Bits3t():
                     else:
                         raise e
 
-            if vld_mask is None:
+            if vld_mask is None or vld_mask == all_mask:
+                # the all_mask object is used for fully valid values, see :meth:`Bits3val._is_full_valid`
                 vld = all_mask
             else:
                 if vld_mask > all_mask or vld_mask < 0:
@@ -223,11 +306,97 @@ class Bits3t():
                 val = val & vld
         return val, vld
 
+    def _int_operand_to_val(self, val: int) -> int:
+        """
+        Convert int operand of an operator to unsigned val of this type (the operand is always fully valid)
+
+        :note: cheap variant of :meth:`~._normalize_val_and_mask` with just a range check,
+            the slow path is used only to raise the error for out of range value
+        """
+        m = self._all_mask
+        if self.signed:
+            if -(m >> 1) - 1 <= val <= m >> 1:
+                return val & m
+        elif 0 <= val <= m:
+            return val & m
+        return self._normalize_val_and_mask(val, None)[0]
+
+    def enable_const_pool(self):
+        """
+        Precompute a shared immutable value for every combination of val and vld_mask
+        and use them in :meth:`~.from_py`, :meth:`~._from_py` instead of allocation of new values.
+
+        :attention: This changes the behavior of all values of this type (the type is shared)
+            the values returned from constructors must not be modified.
+            (The in-place operators return a new value for shared values, item assignment raises TypeError.)
+            The pool is never enabled implicitly, use a type with an unique name
+            if the values of the type are passed to a code which does not expect this.
+        """
+        w = self._bit_length
+        if w > BITS3T_CONST_POOL_MAX_WIDTH:
+            raise ValueError("Type is too wide for const pool", self, BITS3T_CONST_POOL_MAX_WIDTH)
+        if self._const_pool is not None:
+            return
+        all_mask = self._all_mask
+        value_cls = self._value_cls
+        if value_cls is None:
+            value_cls = Bits3val
+        pool = []
+        for vld in range(all_mask + 1):
+            for val in range(all_mask + 1):
+                pool.append(value_cls(self, val, vld))
+
+        pool_py = {None: pool[0]}
+        intMin, intMax = self.get_domain_range()
+        full_vld_offset = all_mask << w
+        for v in range(intMin, intMax + 1):
+            pool_py[v] = pool[full_vld_offset | (v & all_mask)]
+
+        self._const_pool = pool
+        self._const_pool_py = pool_py
+
+    def enable_specialization(self):
+        """
+        Use a :class:`~.Bits3val` subclass with operators specialized for width and signedness of this type
+        for values constructed by :meth:`~.from_py`, :meth:`~._from_py`.
+
+        :attention: The change is global, types are interned and all users of the type with same properties
+            (e.g. Bits3t(8) in an other module) get values of the specialized class.
+            Use a type with an unique name to limit the change to own values.
+
+        :see: :func:`pyMathBitPrecise.bits3val_specialized.get_specialized_bits3val_cls`
+        """
+        if self._value_cls is not None:
+            return
+        from pyMathBitPrecise.bits3val_specialized import get_specialized_bits3val_cls
+        value_cls = get_specialized_bits3val_cls(self._bit_length, self.signed)
+        self._value_cls = value_cls
+        pool = self._const_pool
+        if pool is not None:
+            # keep identity of already shared values
+            for v in pool:
+                v.__class__ = value_cls
+
+    def _is_const_pool_value(self, v: "Bits3val") -> bool:
+        """
+        :return: True if the value v is shared value from const pool of this type
+        """
+        pool = self._const_pool
+        return pool is not None and pool[(v.vld_mask << self._bit_length) | v.val] is v
+
     def _from_py(self, val: int, vld_mask: int) -> "Bits3val":
         """
         from_py without normalization
+
+        :attention: val and vld_mask have to be unsigned and in range of this type
         """
-        return Bits3val(self, val, vld_mask)
+        pool = self._const_pool
+        if pool is not None:
+            return pool[(vld_mask << self._bit_length) | val]
+        value_cls = self._value_cls
+        if value_cls is None:
+            return Bits3val(self, val, vld_mask)
+        return value_cls(self, val, vld_mask)
 
     def from_py(self, val: Union[int, bytes, str, Enum],
                 vld_mask: Optional[int]=None) -> "Bits3val":
@@ -237,23 +406,43 @@ class Bits3t():
             and is much slower than the value specified
             by 'val' and 'vld_mask'. Does support x.
         """
+        pool = self._const_pool_py
+        if pool is not None and vld_mask is None:
+            try:
+                return pool[val]
+            except (KeyError, TypeError):
+                # not in pool or unhashable
+                pass
         val, vld_mask = self._normalize_val_and_mask(val, vld_mask)
-        return Bits3val(self, val, vld_mask)
+        return self._from_py(val, vld_mask)
+
+    def from_py_literals(self, literals: Iterable[str]) -> List["Bits3val"]:
+        """
+        Construct values from many string literals in a single call
+
+        :note: same as :meth:`~.from_py` for each literal, but the values are constructed
+            directly from the parsed ints (see :func:`pyMathBitPrecise.bit_utils.parse_int_literal`)
+        """
+        m = self._all_mask
+        _from_py = self._from_py
+        to_val = self._int_operand_to_val
+        res = []
+        for literal in literals:
+            val, vld = parse_int_literal(literal)
+            if vld is None or vld == m:
+                vld = m
+            elif vld > m or vld < 0:
+                raise ValueError("Mask in incorrect format", vld, self._bit_length, m)
+            # the digits with x are 0 and thus val & vld == val
+            res.append(_from_py(to_val(val), vld))
+        return res
 
     def __getitem__(self, i):
         ":return: an item from this array"
         return Array3t(self, i)
 
     def __hash__(self):
-        return hash((
-            self._bit_length,
-            self.signed,
-            self._all_mask,
-            self.name,
-            self.force_vector,
-            self.strict_sign,
-            self.strict_width
-        ))
+        return self._hash
 
     def __repr__(self):
         """
@@ -298,7 +487,10 @@ class Bits3val():
         the signed variant would require cast to unsigned on every bitwise operation
     :ivar ~.vld_mask: always unsigned value of the mask, if bit in mask is '0'
             the corresponding bit in val is invalid
+    :note: __slots__ are used to reduce memory footprint,
+        subclass without __slots__ will have __dict__ as usual
     """
+    __slots__ = ("_dtype", "val", "vld_mask")
     _BOOL = Bits3t(1)
     _SIGNED_FOR_SLICE_RESULT = False
     _SIGNED_FOR_CONCAT_RESULT = False
@@ -317,21 +509,37 @@ class Bits3val():
     def __copy__(self) -> Self:
         return self.__class__(self._dtype, self.val, self.vld_mask)
 
+    def _writable(self) -> Self:
+        """
+        :return: self or copy of self if self is a shared value from const pool of the type
+            (the in-place operators have to modify the copy instead)
+        """
+        pool = self._dtype._const_pool
+        if pool is not None and pool[(self.vld_mask << self._dtype._bit_length) | self.val] is self:
+            return self.__copy__()
+        return self
+
     def to_py(self) -> int:
         return int(self)
 
     def _is_full_valid(self) -> bool:
         """
         :return: True if all bits in value are valid
+        :note: The fully valid values produced by operators share the _all_mask object of the type
+            and the identity check is cheaper than comparison of large ints.
         """
-        return self.vld_mask == self._dtype.all_mask()
+        vld = self.vld_mask
+        m = self._dtype._all_mask
+        return vld is m or vld == m
 
     def __int__(self) -> int:
         "int(self)"
-        if not self._is_full_valid():
+        t = self._dtype
+        vld = self.vld_mask
+        if vld is not t._all_mask and vld != t._all_mask:
             raise ValidityError(self)
-        if self._dtype.signed:
-            return to_signed(self.val, self._dtype.bit_length())
+        if t.signed:
+            return to_signed(self.val, t._bit_length)
         else:
             return self.val
 
@@ -345,6 +553,22 @@ class Bits3val():
         """
         return dtype.from_py(self.val, self.vld_mask)
 
+    def _new_of_type(self, t: Bits3t, val: int, vld_mask: int) -> Self:
+        """
+        Construct a new value of other type
+
+        :note: the class of the value is selected by the type (see :meth:`~.Bits3t._from_py`)
+            only if this value is of a class which the type uses, the class of values of an user subclass is kept
+        """
+        cls = self.__class__
+        if cls is Bits3val or cls is self._dtype._value_cls:
+            return t._from_py(val, vld_mask)
+        v = self.__copy__()
+        v._dtype = t
+        v.val = val
+        v.vld_mask = vld_mask
+        return v
+
     def _cast_sign(self, signed: Optional[bool], **typeMutateKwArgs) -> Self:
         """
         Cast signed-unsigned value
@@ -352,9 +576,8 @@ class Bits3val():
         t = self._dtype
         if t.signed == signed:
             return self
-        v = self.__copy__()
-        v._dtype = v._dtype._createMutated(signed=signed, **typeMutateKwArgs)
-        return v
+        resT = t._createMutated(signed=signed, **typeMutateKwArgs)
+        return self._new_of_type(resT, self.val, self.vld_mask)
 
     def _concat(self, other: "Bits3val") -> Self:
         """
@@ -366,15 +589,15 @@ class Bits3val():
         w = self._dtype.bit_length()
         other_w = other._dtype.bit_length()
         resWidth = w + other_w
-        resT = self._dtype.__class__(resWidth, signed=self._SIGNED_FOR_CONCAT_RESULT)
+        resT = self._dtype.__class__._get(resWidth, signed=self._SIGNED_FOR_CONCAT_RESULT)
         other_val = other.val
         assert other_val >= 0, other_val
-        v = self.__copy__()
-        assert v.val >= 0, v
-        v.val = (v.val << other_w) | other_val
-        v.vld_mask = (v.vld_mask << other_w) | other.vld_mask
-        v._dtype = resT
-        return v
+        assert self.val >= 0, self
+        if self._is_full_valid() and other._is_full_valid():
+            vld = resT._all_mask
+        else:
+            vld = (self.vld_mask << other_w) | other.vld_mask
+        return self._new_of_type(resT, (self.val << other_w) | other_val, vld)
 
     def _ext(self, newWidth: Union[int, Self], signed: Union[bool, Literal[_NOT_SPECIFIED]]=_NOT_SPECIFIED) -> Self:
         """
@@ -402,9 +625,12 @@ class Bits3val():
         newBitsMask = bit_field(w, newWidth)
         if get_bit(val, w - 1):
             val |= newBitsMask
-        vldMask = self.vld_mask
-        if get_bit(vldMask, w - 1):
-            vldMask |= newBitsMask
+        if self._is_full_valid():
+            vldMask = resTy._all_mask
+        else:
+            vldMask = self.vld_mask
+            if get_bit(vldMask, w - 1):
+                vldMask |= newBitsMask
 
         return resTy._from_py(val, vldMask)
         # alfternatively:
@@ -423,6 +649,8 @@ class Bits3val():
             return self
         assert newWidth > w, (newWidth, w)
         resTy = t._createMutated(newWidth)
+        if self._is_full_valid():
+            return resTy._from_py(self.val, resTy._all_mask)
         return resTy.from_py(self.val, vld_mask=self.vld_mask | bit_field(w, newWidth))
 
     def _trunc(self, newWidth: Union[int, Self]) -> Self:
@@ -430,7 +658,9 @@ class Bits3val():
         w = self._dtype.bit_length()
         assert newWidth <= w, newWidth
         resTy = self._dtype._createMutated(newWidth)
-        resMask = mask(newWidth)
+        resMask = resTy._all_mask
+        if self._is_full_valid():
+            return resTy._from_py(self.val & resMask, resMask)
         return resTy._from_py(self.val & resMask, self.vld_mask & resMask)
 
     def _extOrTrunc(self, newWidth: int, signed: Union[bool, Literal[_NOT_SPECIFIED]]=_NOT_SPECIFIED) -> Self:
@@ -447,6 +677,9 @@ class Bits3val():
         if isinstance(key, slice):
             firstBitNo, size = normalize_slice(key, self._dtype.bit_length())
             val = get_bit_range(self.val, firstBitNo, size)
+            if self._is_full_valid():
+                new_t = self._dtype._createMutated(size, signed=self._SIGNED_FOR_SLICE_RESULT)
+                return new_t._from_py(val, new_t._all_mask)
             vld = get_bit_range(self.vld_mask, firstBitNo, size)
         elif isinstance(key, (int, Bits3val)):
             size = 1
@@ -473,6 +706,8 @@ class Bits3val():
     def __setitem__(self, index: Union[slice, int, Self],
                     value: Union[int, Self]):
         "An item assignment operator self[index] = value."
+        if self._dtype._is_const_pool_value(self):
+            raise TypeError("Can not modify shared value from const pool of the type", self)
         if isinstance(index, slice):
             firstBitNo, size = normalize_slice(index, self._dtype.bit_length())
             if isinstance(value, Bits3val):
@@ -517,25 +752,102 @@ class Bits3val():
                     self.val = bit_set_to(self.val, index, v)
                     self.vld_mask = bit_set_to(self.vld_mask, index, m)
 
+    def _write_with_strobe(self, data: Union[int, Self],
+                           strobe: Union[int, "Bits3val", None]) -> Self:
+        """
+        Update bytes selected by strobe (byte enable mask) from data (modifies self),
+        bit i of strobe enables the write of self[8 * (i + 1):8 * i]
+
+        :note: both planes are merged at once, see :func:`pyMathBitPrecise.bit_utils.apply_write_with_mask_int`
+        :return: self or copy of self if self is a shared value from const pool (same as for in-place operators)
+        """
+        t = self._dtype
+        w = t._bit_length
+        if w % 8:
+            raise ValueError("Write with byte mask requires width to be a multiple of 8", t)
+        if isinstance(data, int):
+            d_val = t._int_operand_to_val(data)
+            d_vld = t._all_mask
+        else:
+            if data._dtype.bit_length() != w:
+                raise TypeError("Width of data does not match", t, data._dtype)
+            d_val = data.val
+            d_vld = data.vld_mask
+        s_val, s_vld = _byte_mask_operand(strobe, w // 8)
+
+        v = self._writable()
+        val, vld = apply_write_with_mask_int(v.val, v.vld_mask, d_val, d_vld, s_val, w, s_vld)
+        m = t._all_mask
+        v.val = val
+        v.vld_mask = m if vld == m else vld
+        return v
+
     def __invert__(self) -> Self:
         "Operator ~x."
         v = self.__copy__()
-        v.val = ~v.val
-        w = v._dtype.bit_length()
-        v.val &= mask(w)
-        if v.val < 0:
-            v.val = to_unsigned(v.val, w)
-
+        m = v._dtype._all_mask
+        v.val = ~v.val & m
         return v
 
     def __neg__(self) -> Self:
         "Operator -x."
         v = self.__copy__()
-        width = self._dtype.bit_length()
-        _v = -to_signed(v.val, width)
-        v.val = to_unsigned(_v, width)
+        # the result is the same for signed and unsigned after the cut off of the upper bits
+        v.val = -v.val & v._dtype._all_mask
         return v
 
+    def _bit_count_result(self, cnt: Optional[int]) -> Self:
+        """
+        :param cnt: the number of bits or None if the result is not valid
+        :return: value of unsigned variant of this type, the count always fits as it is <= width
+        """
+        t = self._dtype
+        if t.signed:
+            t = t._createMutated(signed=False)
+        if cnt is None:
+            return t.from_py(None)
+        return t._from_py(cnt, t._all_mask)
+
+    def _ctpop(self) -> Self:
+        """
+        Count the number of 1 (population count)
+
+        :note: the result is valid only for fully valid value
+        """
+        if not self._is_full_valid():
+            return self._bit_count_result(None)
+        return self._bit_count_result(ctpop(self.val, self._dtype.bit_length()))
+
+    def _ctlz(self) -> Self:
+        """
+        Count leading zeros
+
+        :note: the result is valid if all bits above the highest valid 1 are valid
+        """
+        val = self.val
+        w = self._dtype.bit_length()
+        top = val.bit_length()
+        if (self.vld_mask >> top) != (self._dtype._all_mask >> top):
+            return self._bit_count_result(None)
+        return self._bit_count_result(ctlz(val, w))
+
+    def _cttz(self) -> Self:
+        """
+        Count trailing zeros
+
+        :note: the result is valid if all bits below the lowest valid 1 are valid
+        """
+        val = self.val
+        w = self._dtype.bit_length()
+        if val == 0:
+            if not self._is_full_valid():
+                return self._bit_count_result(None)
+        else:
+            m = (val & -val) - 1
+            if self.vld_mask & m != m:
+                return self._bit_count_result(None)
+        return self._bit_count_result(cttz(val, w))
+
     def __hash__(self) -> int:
         return hash((self._dtype, self.val, self.vld_mask))
 
@@ -555,7 +867,7 @@ class Bits3val():
 
     def __req__(self, other: int) -> Self:
         "Operator ==."
-        return bitsCmp__val_EQ(self._dtype.from_py(other), self)
+        return bitsCmp__val_EQ(self, other)
 
     def __ne__(self, other: Union[int, Self]) -> Self:
         "Operator !=."
@@ -563,7 +875,7 @@ class Bits3val():
 
     def __rne__(self, other: int) -> Self:
         "Operator !=."
-        return bitsCmp__val_NE(self._dtype.from_py(other), self)
+        return bitsCmp__val_NE(self, other)
 
     def __lt__(self, other: Union[int, Self]) -> Self:
         "Operator <."
@@ -571,7 +883,8 @@ class Bits3val():
 
     def __rlt__(self, other: int) -> Self:
         "Operator <."
-        return bitsCmp__val(self._dtype.from_py(other), self, lt)
+        # other < self is self > other
+        return bitsCmp__val(self, other, gt)
 
     def __gt__(self, other: Union[int, Self]) -> Self:
         "Operator >."
@@ -579,7 +892,8 @@ class Bits3val():
 
     def __rgt__(self, other: int) -> Self:
         "Operator >."
-        return bitsCmp__val(self._dtype.from_py(other), self, gt)
+        # other > self is self < other
+        return bitsCmp__val(self, other, lt)
 
     def __ge__(self, other: Union[int, Self]) -> Self:
         "Operator >=."
@@ -587,7 +901,8 @@ class Bits3val():
 
     def __rge__(self, other: int) -> Self:
         "Operator >=."
-        return bitsCmp__val(self._dtype.from_py(other), self, ge)
+        # other >= self is self <= other
+        return bitsCmp__val(self, other, le)
 
     def __le__(self, other: Union[int, Self]) -> Self:
         "Operator <=."
@@ -595,34 +910,44 @@ class Bits3val():
 
     def __rle__(self, other: int) -> Self:
         "Operator <=."
-        return bitsCmp__val(self._dtype.from_py(other), self, le)
+        # other <= self is self >= other
+        return bitsCmp__val(self, other, ge)
 
     def __xor__(self, other: Union[int, Self]) -> Self:
         "Operator ^."
-        return bitsBitOp__val(self, other, xor, vld_mask_for_xor)
+        return bitsBitOp__val(self, other, xor, vld_mask_for_xor_raw)
 
     def __rxor__(self, other: int) -> Self:
         "Operator ^."
-        return bitsBitOp__val(self._dtype.from_py(other), self, xor,
-                              vld_mask_for_xor)
+        return bitsBitOp__val(self, other, xor, vld_mask_for_xor_raw)
+
+    def __ixor__(self, other: Union[int, Self]) -> Self:
+        "Operator ^=. (modifies self)"
+        return bitsBitOp__val_inplace(self._writable(), other, xor, vld_mask_for_xor_raw)
 
     def __and__(self, other: Union[int, Self]) -> Self:
         "Operator &."
-        return bitsBitOp__val(self, other, and_, vld_mask_for_and)
+        return bitsBitOp__val(self, other, and_, vld_mask_for_and_raw)
 
     def __rand__(self, other: int) -> Self:
         "Operator &."
-        return bitsBitOp__val(self._dtype.from_py(other), self, and_,
-                              vld_mask_for_and)
+        return bitsBitOp__val(self, other, and_, vld_mask_for_and_raw)
+
+    def __iand__(self, other: Union[int, Self]) -> Self:
+        "Operator &=. (modifies self)"
+        return bitsBitOp__val_inplace(self._writable(), other, and_, vld_mask_for_and_raw)
 
     def __or__(self, other: Union[int, Self]) -> Self:
         "Operator |."
-        return bitsBitOp__val(self, other, or_, vld_mask_for_or)
+        return bitsBitOp__val(self, other, or_, vld_mask_for_or_raw)
 
     def __ror__(self, other: int) -> Self:
         "Operator |."
-        return bitsBitOp__val(self._dtype.from_py(other), self, or_,
-                              vld_mask_for_or)
+        return bitsBitOp__val(self, other, or_, vld_mask_for_or_raw)
+
+    def __ior__(self, other: Union[int, Self]) -> Self:
+        "Operator |=. (modifies self)"
+        return bitsBitOp__val_inplace(self._writable(), other, or_, vld_mask_for_or_raw)
 
     def __sub__(self, other: Union[int, Self]) -> Self:
         "Operator -."
@@ -630,7 +955,11 @@ class Bits3val():
 
     def __rsub__(self, other: Union[int, Self]) -> Self:
         "Operator -."
-        return bitsArithOp__val(self._dtype.from_py(other), self, sub)
+        return bitsArithOp__val(self, other, sub, reflected=True)
+
+    def __isub__(self, other: Union[int, Self]) -> Self:
+        "Operator -=. (modifies self)"
+        return bitsArithOp__val_inplace(self._writable(), other, sub)
 
     def __add__(self, other: Union[int, Self]) -> Self:
         "Operator +."
@@ -638,7 +967,11 @@ class Bits3val():
 
     def __radd__(self, other: Union[int, Self]) -> Self:
         "Operator +."
-        return bitsArithOp__val(self._dtype.from_py(other), self, add)
+        return bitsArithOp__val(self, other, add)
+
+    def __iadd__(self, other: Union[int, Self]) -> Self:
+        "Operator +=. (modifies self)"
+        return bitsArithOp__val_inplace(self._writable(), other, add)
 
     def __rshift__(self, other: Union[int, Self]) -> Self:
         "Operator >>."
@@ -647,31 +980,20 @@ class Bits3val():
         else:
             return bitsBitOp__lshr(self, other)
 
+    def __irshift__(self, other: Union[int, Self]) -> Self:
+        "Operator >>=. (modifies self)"
+        if self._dtype.signed:
+            return bitsBitOp__ashr_inplace(self._writable(), other)
+        else:
+            return bitsBitOp__lshr_inplace(self._writable(), other)
+
     def __lshift__(self, other: Union[int, Self]) -> Self:
         "Operator <<. (shifts in 0)"
-        try:
-            o = int(other)
-        except ValidityError:
-            o = None
+        return bitsBitOp__shl_inplace(self.__copy__(), other)
 
-        v = self.__copy__()
-        if o is None:
-            v.vld_mask = 0
-            v.val = 0
-        elif o == 0:
-            return v
-        else:
-            if o < 0:
-                raise ValueError("negative shift count")
-            t = self._dtype
-            m = t.all_mask()
-            v.vld_mask <<= o
-            v.vld_mask |= mask(o)
-            v.vld_mask &= m
-            v.val <<= o
-            v.val &= m
-            assert v.val >= 0, v.val
-        return v
+    def __ilshift__(self, other: Union[int, Self]) -> Self:
+        "Operator <<=. (shifts in 0, modifies self)"
+        return bitsBitOp__shl_inplace(self._writable(), other)
 
     def __floordiv__(self, other: Union[int, Self]) -> Self:
         "Operator //."
@@ -682,8 +1004,8 @@ class Bits3val():
             if t.signed:
                 w = t.bit_length()
                 v0 = to_signed(v0, w)
-            v = v0 // other
             m = self._dtype.all_mask()
+            v = (v0 // other) & m
         else:
             if self._is_full_valid() and other._is_full_valid():
                 v0 = self.val
@@ -692,8 +1014,8 @@ class Bits3val():
                     w = t.bit_length()
                     v0 = to_signed(v0, w)
                     v1 = to_signed(v1, w)
-                v = v0 // v1
                 m = self._dtype.all_mask()
+                v = (v0 // v1) & m
             else:
                 v = 0
                 m = 0
@@ -723,8 +1045,6 @@ class Bits3val():
             raise TypeError(other)
 
         v &= resT.all_mask()
-        if resT.signed:
-            v = to_signed(v, resT.bit_length())
 
         if self._is_full_valid() and (other_is_int
                                       or other._is_full_valid()):
@@ -758,8 +1078,6 @@ class Bits3val():
             raise TypeError(other)
 
         v &= resT.all_mask()
-        if resT.signed:
-            v = to_signed(v, resT.bit_length())
 
         if self._is_full_valid() and (other_is_int
                                       or other._is_full_valid()):
@@ -799,6 +1117,101 @@ class Bits3val():
                 f" {to_signed(self.val, t.bit_length()) if t.signed else self.val:d}{m:s}>")
 
 
+def _concat_ints(items: List[Tuple[int, int]]) -> int:
+    """
+    Concatenate ints (items[0] will be at MSB side)
+
+    :param items: list of tuples (value, width)
+    :note: the items are merged in pairs, so each bit is copied only log2(len(items)) times
+        (instead of len(items) times for the concatenation one by one)
+    """
+    while len(items) > 1:
+        merged = []
+        for i in range(0, len(items) - 1, 2):
+            hi, hi_w = items[i]
+            lo, lo_w = items[i + 1]
+            merged.append(((hi << lo_w) | lo, hi_w + lo_w))
+        if len(items) % 2:
+            merged.append(items[-1])
+        items = merged
+    return items[0][0]
+
+
+def _replicate_int(v: int, width: int, n: int) -> int:
+    """
+    Concatenate n copies of the value of specified width
+
+    :note: the pattern is doubled, which is linear in the size of the result
+    """
+    res = 0
+    while n:
+        if n & 1:
+            res = (res << width) | v
+        n >>= 1
+        if n:
+            v |= v << width
+            width *= 2
+    return res
+
+
+def Concat(*values: Bits3val) -> Bits3val:
+    """
+    Concatenate bit vectors together (values[0] will be at MSB side)
+    Verilog: {a, b, c}, VHDL: a & b & c
+
+    :note: same as a._concat(b)._concat(c) but the value and validity are computed in one pass
+        and only the type of the result is constructed
+    :note: the class of the result is selected as in :meth:`~.Bits3val._concat` of values[0]
+    """
+    if not values:
+        raise ValueError("Concat requires at least one value")
+    vals = []
+    vlds = []
+    full_vld = True
+    width = 0
+    for v in values:
+        t = getattr(v, "_dtype", None)
+        if not isinstance(t, Bits3t):
+            raise TypeError(v)
+        w = t._bit_length
+        width += w
+        vals.append((v.val, w))
+        if full_vld and not v._is_full_valid():
+            full_vld = False
+        vlds.append((v.vld_mask, w))
+
+    first = values[0]
+    resT = first._dtype.__class__._get(width, signed=first._SIGNED_FOR_CONCAT_RESULT)
+    val = _concat_ints(vals)
+    if full_vld:
+        vld = resT._all_mask
+    else:
+        vld = _concat_ints(vlds)
+    return first._new_of_type(resT, val, vld)
+
+
+def Replicate(n: int, v: Bits3val) -> Bits3val:
+    """
+    Concatenate n copies of the value
+    Verilog: {n{v}}
+
+    :note: same as Concat(*(v for _ in range(n))) but the value is built by doubling
+    """
+    if n <= 0:
+        raise ValueError("Replication count has to be positive", n)
+    t = getattr(v, "_dtype", None)
+    if not isinstance(t, Bits3t):
+        raise TypeError(v)
+    w = t._bit_length
+    resT = t.__class__._get(w * n, signed=v._SIGNED_FOR_CONCAT_RESULT)
+    val = _replicate_int(v.val, w, n)
+    if v._is_full_valid():
+        vld = resT._all_mask
+    else:
+        vld = _replicate_int(v.vld_mask, w, n)
+    return v._new_of_type(resT, val, vld)
+
+
 def bitsBitOp__ror(self: Bits3val, shAmount: Union[Bits3val, int]):
     """
     rotate right by specified amount
@@ -812,6 +1225,8 @@ def bitsBitOp__ror(self: Bits3val, shAmount: Union[Bits3val, int]):
     assert shAmount >= 0
 
     v = rotate_right(self.val, width, shAmount)
+    if self._is_full_valid():
+        return t._from_py(v, t._all_mask)
     if t.signed:
         v = to_signed(v, width)
     return t.from_py(v, rotate_right(self.vld_mask, width, shAmount))
@@ -829,11 +1244,40 @@ def bitsBitOp__rol(self: Bits3val, shAmount: Union[Bits3val, int]):
         return t.from_py(None)
     assert shAmount >= 0
     v = rotate_left(self.val, width, shAmount)
+    if self._is_full_valid():
+        return t._from_py(v, t._all_mask)
     if t.signed:
         v = to_signed(v, width)
     return t.from_py(v, rotate_left(self.vld_mask, width, shAmount))
 
 
+def bitsBitOp__shl_inplace(v: Bits3val, shAmount: Union[Bits3val, int]) -> Bits3val:
+    """
+    shift left (shifts in 0), modifies v
+    """
+    try:
+        o = int(shAmount)
+    except ValidityError:
+        o = None
+
+    if o is None:
+        v.vld_mask = 0
+        v.val = 0
+    elif o == 0:
+        return v
+    else:
+        if o < 0:
+            raise ValueError("negative shift count")
+        t = v._dtype
+        m = t._all_mask
+        if not v._is_full_valid():
+            v.vld_mask = ((v.vld_mask << o) | mask(o)) & m
+        # else fully valid stays fully valid, because shifted in bits are valid
+        v.val = (v.val << o) & m
+        assert v.val >= 0, v.val
+    return v
+
+
 def bitsBitOp__lshr(self: Bits3val, shAmount: Union[Bits3val, int]) -> Bits3val:
     """
     logical shift right (shifts in 0)
@@ -850,6 +1294,9 @@ def bitsBitOp__lshr(self: Bits3val, shAmount: Union[Bits3val, int]) -> Bits3val:
         # all bits are shifted out
         return t.from_py(0, mask(width))
 
+    if self._is_full_valid():
+        return t._from_py(self.val >> sh, t._all_mask)
+
     v = self.val >> sh
     if t.signed:
         v = to_signed(v, width)
@@ -857,16 +1304,50 @@ def bitsBitOp__lshr(self: Bits3val, shAmount: Union[Bits3val, int]) -> Bits3val:
     return t.from_py(v, (self.vld_mask >> sh) | newBitsMask)
 
 
+def bitsBitOp__lshr_inplace(v: Bits3val, shAmount: Union[Bits3val, int]) -> Bits3val:
+    """
+    logical shift right (shifts in 0), modifies v
+
+    :see: :func:`~.bitsBitOp__lshr`
+    """
+    width = v._dtype.bit_length()
+    try:
+        sh = int(shAmount)
+    except ValidityError:
+        v.val = 0
+        v.vld_mask = 0
+        return v
+    assert sh >= 0, sh
+
+    if sh >= width:
+        # all bits are shifted out
+        v.val = 0
+        v.vld_mask = v._dtype._all_mask
+    elif v._is_full_valid():
+        v.val >>= sh
+    else:
+        vld = (v.vld_mask >> sh) | bit_field(width - sh, width)
+        v.val = (v.val >> sh) & vld
+        v.vld_mask = vld
+    return v
+
+
 def bitsBitOp__ashr(self: Bits3val, shAmount: Union[Bits3val, int]) -> Bits3val:
     """
     arithmetic shift right (shifts in MSB)
     """
+    return bitsBitOp__ashr_inplace(self.__copy__(), shAmount)
+
+
+def bitsBitOp__ashr_inplace(v: Bits3val, shAmount: Union[Bits3val, int]) -> Bits3val:
+    """
+    arithmetic shift right (shifts in MSB), modifies v
+    """
     try:
         sh = int(shAmount)
     except ValidityError:
         sh = None
 
-    v = self.__copy__()
     if sh is None:
         v.vld_mask = 0
         v.val = 0
@@ -875,39 +1356,77 @@ def bitsBitOp__ashr(self: Bits3val, shAmount: Union[Bits3val, int]) -> Bits3val:
     else:
         if shAmount < 0:
             raise ValueError("negative shift count")
-        w = self._dtype.bit_length()
+        w = v._dtype.bit_length()
         if sh < w:
             msb = v.val >> (w - 1)
             newBitsMask = bit_field(w - sh, w)
-            v.vld_mask >>= sh
-            v.vld_mask |= newBitsMask  # set newly shifted-in bits to defined
+            if not v._is_full_valid():
+                v.vld_mask >>= sh
+                v.vld_mask |= newBitsMask  # set newly shifted-in bits to defined
             v.val >>= sh
             if msb:
                 v.val |= newBitsMask
         else:
             # completely shifted out
             v.val = 0
-            v.vld_mask = mask(w)
+            v.vld_mask = v._dtype._all_mask
     return v
 
 
 def bitsBitOp__val(self: Bits3val, other: Union[Bits3val, int],
-                   evalFn, getVldFn) -> "Bits3val":
+                   evalFn, getVldFnRaw) -> "Bits3val":
     """
     Apply bitwise operator
+
+    :param getVldFnRaw: function to resolve validity mask from val and vld_mask of operands
+        (e.g. :func:`~.vld_mask_for_and_raw`)
     """
     res_t = self._dtype
+    m = res_t._all_mask
     if isinstance(other, int):
-        other = res_t.from_py(other)
-    w = res_t.bit_length()
-    assert w == other._dtype.bit_length(), (res_t, other._dtype)
-    vld = getVldFn(self, other)
-    res = evalFn(self.val, other.val) & vld
+        o_val = res_t._int_operand_to_val(other)
+        o_vld = m
+    else:
+        assert res_t.bit_length() == other._dtype.bit_length(), (res_t, other._dtype)
+        o_val = other.val
+        o_vld = other.vld_mask
+    if (o_vld is m or o_vld == m) and self._is_full_valid():
+        return res_t._from_py(evalFn(self.val, o_val), m)
+
+    vld = getVldFnRaw(self.val, self.vld_mask, o_val, o_vld)
+    res = evalFn(self.val, o_val) & vld
     assert res >= 0, res
 
     return res_t._from_py(res, vld)
 
 
+def bitsBitOp__val_inplace(self: Bits3val, other: Union[Bits3val, int],
+                           evalFn, getVldFnRaw) -> "Bits3val":
+    """
+    Apply bitwise operator and store result to self
+
+    :param getVldFnRaw: function to resolve validity mask from val and vld_mask of operands
+        (e.g. :func:`~.vld_mask_for_and_raw`)
+    """
+    if isinstance(other, int):
+        o_val = self._dtype._int_operand_to_val(other)
+        o_vld = self._dtype._all_mask
+    else:
+        assert self._dtype.bit_length() == other._dtype.bit_length(), (self._dtype, other._dtype)
+        o_val = other.val
+        o_vld = other.vld_mask
+    m = self._dtype._all_mask
+    if (o_vld is m or o_vld == m) and self._is_full_valid():
+        self.val = evalFn(self.val, o_val)
+        self.vld_mask = m
+        return self
+
+    vld = getVldFnRaw(self.val, self.vld_mask, o_val, o_vld)
+    self.val = evalFn(self.val, o_val) & vld
+    self.vld_mask = vld
+    return self
+
+
 def bitsCmp__val(self: Bits3val, other: Union[Bits3val, int],
                  evalFn: Callable[[int, int], bool]) -> "Bits3val":
     """
@@ -916,22 +1435,27 @@ def bitsCmp__val(self: Bits3val, other: Union[Bits3val, int],
     assert evalFn is not eq and evalFn is not ne, ("use bitsCmp__val_EQ/bitsCmp__val_NE instead")
     t = self._dtype
     w = t.bit_length()
+    m = t._all_mask
     if isinstance(other, int):
-        other = t.from_py(other)
-        ot = other._dtype
+        v1 = t._int_operand_to_val(other)
+        o_vld = m
     else:
         ot = other._dtype
         if bool(t.signed) != bool(ot.signed) or w != ot.bit_length():
             raise TypeError("Value compare supports only same width and sign type", t, ot)
+        v1 = other.val
+        o_vld = other.vld_mask
 
     v0 = self.val
-    v1 = other.val
     if t.signed:
         v0 = to_signed(v0, w)
         v1 = to_signed(v1, w)
 
-    vld = self.vld_mask & other.vld_mask
-    _vld = int(vld == t._all_mask)
+    if (o_vld is m or o_vld == m) and self._is_full_valid():
+        return self._BOOL._from_py(int(evalFn(v0, v1)), 1)
+
+    vld = self.vld_mask & o_vld
+    _vld = int(vld == m)
     res = evalFn(v0, v1) & _vld
 
     return self._BOOL._from_py(int(res), int(_vld))
@@ -943,19 +1467,23 @@ def bitsCmp__val_NE(self: Bits3val, other: Union[Bits3val, int]) -> "Bits3val":
     """
     t = self._dtype
     w = t.bit_length()
+    m = t._all_mask
     if isinstance(other, int):
-        other = t.from_py(other)
-        ot = other._dtype
+        v1 = t._int_operand_to_val(other)
+        o_vld = m
     else:
         ot = other._dtype
         if bool(t.signed) != bool(ot.signed) or w != ot.bit_length():
             raise TypeError("Value compare supports only same width and sign type", t, ot)
+        v1 = other.val
+        o_vld = other.vld_mask
 
     v0 = self.val
-    v1 = other.val
+    if (o_vld is m or o_vld == m) and self._is_full_valid():
+        return self._BOOL._from_py(int(v0 != v1), 1)
 
-    vld = self.vld_mask & other.vld_mask
-    _vld = int(vld == t._all_mask)
+    vld = self.vld_mask & o_vld
+    _vld = int(vld == m)
     res = ((v0 ^ v1) & vld) != 0  # at least some valid bit non equal
 
     return self._BOOL._from_py(int(res), _vld | int(res))
@@ -967,19 +1495,23 @@ def bitsCmp__val_EQ(self: Bits3val, other: Union[Bits3val, int]) -> "Bits3val":
     """
     t = self._dtype
     w = t.bit_length()
+    m = t._all_mask
     if isinstance(other, int):
-        other = t.from_py(other)
-        ot = other._dtype
+        v1 = t._int_operand_to_val(other)
+        o_vld = m
     else:
         ot = other._dtype
         if bool(t.signed) != bool(ot.signed) or w != ot.bit_length():
             raise TypeError("Value compare supports only same width and sign type", t, ot)
+        v1 = other.val
+        o_vld = other.vld_mask
 
     v0 = self.val
-    v1 = other.val
+    if (o_vld is m or o_vld == m) and self._is_full_valid():
+        return self._BOOL._from_py(int(v0 == v1), 1)
 
-    vld = self.vld_mask & other.vld_mask
-    _vld = int(vld == t._all_mask)
+    vld = self.vld_mask & o_vld
+    _vld = int(vld == m)
     ne = ((v0 ^ v1) & vld) != 0  # all valid bits equal
     res = int(not ne)
     if not _vld:
@@ -991,19 +1523,34 @@ def bitsCmp__val_EQ(self: Bits3val, other: Union[Bits3val, int]) -> "Bits3val":
 
 
 def bitsArithOp__val(self: Bits3val, other: Union[Bits3val, int],
-                     evalFn: Callable[[int, int], int]) -> "Bits3val":
+                     evalFn: Callable[[int, int], int], reflected: bool=False) -> "Bits3val":
     """
     Apply arithmetic operator
+
+    :param reflected: if True compute evalFn(other, self) (for reflected operators, e.g. 1 - x)
     """
+    t = self._dtype
     if isinstance(other, int):
-        other = self._dtype.from_py(other)
+        o_val = t._int_operand_to_val(other)
+        other_vld = True
+    else:
+        o_val = other.val
+        other_vld = other._is_full_valid()
     v = self.__copy__()
     self_vld = self._is_full_valid()
-    other_vld = other._is_full_valid()
     v0 = self.val
-    v1 = other.val
-    w = v._dtype.bit_length()
-    t = self._dtype
+    v1 = o_val
+    if reflected:
+        v0, v1 = v1, v0
+    if self_vld and other_vld and (evalFn is add or evalFn is sub):
+        # the result of + and - is the same for signed and unsigned representation
+        # after the cut off of the upper bits
+        m = t._all_mask
+        v.val = evalFn(v0, v1) & m
+        v.vld_mask = m
+        return v
+
+    w = t.bit_length()
     if t.signed:
         v0 = to_signed(v0, w)
         v1 = to_signed(v1, w)
@@ -1017,9 +1564,33 @@ def bitsArithOp__val(self: Bits3val, other: Union[Bits3val, int],
 
     v.val = _v
     if self_vld and other_vld:
-        v.vld_mask = mask(w)
+        v.vld_mask = t._all_mask
     else:
         v.vld_mask = 0
 
     return v
 
+
+def bitsArithOp__val_inplace(self: Bits3val, other: Union[Bits3val, int],
+                             evalFn: Callable[[int, int], int]) -> "Bits3val":
+    """
+    Apply arithmetic operator (+, -) and store result to self
+
+    :note: the result of + and - is the same for signed and unsigned representation
+        after the cut off of the upper bits and thus the sign does not have to be resolved
+    """
+    t = self._dtype
+    m = t._all_mask
+    if isinstance(other, int):
+        o_val = t._int_operand_to_val(other)
+        other_vld = True
+    else:
+        o_val = other.val
+        other_vld = other._is_full_valid()
+
+    self.val = evalFn(self.val, o_val) & m
+    if other_vld and self._is_full_valid():
+        self.vld_mask = m
+    else:
+        self.vld_mask = 0
+    return self
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Kernels for batches of values of the same :class:`~.Bits3t` type
+specified by numpy arrays of val and vld_mask (always unsigned representation, same as in :class:`~.Bits3val`).
+
+Values of width <= BATCH_MAX_NATIVE_WIDTH are stored in uint64 arrays,
+wider values are stored in uint64 arrays of limbs (:mod:`pyMathBitPrecise.limb_utils`)
+with limbs in the last dimension.
+Kernels have the same semantic as the operators of :class:`~.Bits3val`
+and return a tuple (val, vld_mask), comparisons return a tuple of bool arrays (result, valid).
+"""
+
+from operator import lt, le, gt, ge, eq, ne
+from typing import Tuple, Union, Optional, Callable
+
+import numpy as np
+
+from pyMathBitPrecise.bit_utils import mask, bit_field
+from pyMathBitPrecise.bits3t_vld_masks import vld_mask_for_and_raw, \
+    vld_mask_for_or_raw, vld_mask_for_xor_raw
+from pyMathBitPrecise.limb_utils import limbs_mask, int_to_limbs, limb_cnt, \
+    limbs_resize, limbs_shr, limbs_shl, limbs_get_bit
+
+# maximum width of the value which is stored in a single uint64
+BATCH_MAX_NATIVE_WIDTH = 64
+
+
+def batch_width_mask(width: int) -> Union[np.uint64, np.ndarray]:
+    """
+    :return: :func:`pyMathBitPrecise.bit_utils.mask` of specified width
+        as uint64 scalar or as limbs for width > BATCH_MAX_NATIVE_WIDTH
+    """
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        return np.uint64(mask(width))
+    else:
+        return limbs_mask(width)
+
+
+def batch_and(a_val: np.ndarray, a_vld: np.ndarray, b_val: np.ndarray, b_vld: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched operator &, a valid 0 in any operand makes the result bit valid
+
+    :see: :func:`pyMathBitPrecise.bits3t_vld_masks.vld_mask_for_and`
+    """
+    vld = vld_mask_for_and_raw(a_val, a_vld, b_val, b_vld)
+    return a_val & b_val & vld, vld
+
+
+def batch_or(a_val: np.ndarray, a_vld: np.ndarray, b_val: np.ndarray, b_vld: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched operator |, a valid 1 in any operand makes the result bit valid
+
+    :see: :func:`pyMathBitPrecise.bits3t_vld_masks.vld_mask_for_or`
+    """
+    vld = vld_mask_for_or_raw(a_val, a_vld, b_val, b_vld)
+    return (a_val | b_val) & vld, vld
+
+
+def batch_xor(a_val: np.ndarray, a_vld: np.ndarray, b_val: np.ndarray, b_vld: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched operator ^
+
+    :see: :func:`pyMathBitPrecise.bits3t_vld_masks.vld_mask_for_xor`
+    """
+    vld = vld_mask_for_xor_raw(a_val, a_vld, b_val, b_vld)
+    return (a_val ^ b_val) & vld, vld
+
+
+def batch_invert(val: np.ndarray, vld: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched operator ~
+    """
+    return ~val & batch_width_mask(width), vld.copy()
+
+
+def batch_to_signed(val: np.ndarray, width: int) -> np.ndarray:
+    """
+    Convert uint64 array with unsigned representation of values to int64 array with signed values
+    (the same as :func:`pyMathBitPrecise.bit_utils.to_signed`)
+
+    :attention: only for width <= BATCH_MAX_NATIVE_WIDTH
+    """
+    assert width <= BATCH_MAX_NATIVE_WIDTH, width
+    v = np.asarray(val).astype(np.int64)
+    if width < 64:
+        sign = np.int64(1 << (width - 1))
+        v = (v ^ sign) - sign
+    return v
+
+
+def _batch_full_valid(vld: np.ndarray, width: int) -> np.ndarray:
+    """
+    :return: bool array, True for values where all bits are valid
+    """
+    m = batch_width_mask(width)
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        return vld == m
+    else:
+        return (vld == m).all(axis=-1)
+
+
+def _limbs_lt_eq(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :return: tuple of bool arrays (a < b, a == b) for unsigned values stored in limbs
+    """
+    K = a.shape[-1]
+    shape = np.broadcast_shapes(a.shape, b.shape)[:-1]
+    res_lt = np.zeros(shape, dtype=bool)
+    res_eq = np.ones(shape, dtype=bool)
+    # from the most significant limb
+    for k in range(K - 1, -1, -1):
+        _a = a[..., k]
+        _b = b[..., k]
+        res_lt |= res_eq & (_a < _b)
+        res_eq &= _a == _b
+    return res_lt, res_eq
+
+
+def batch_cmp(a_val: np.ndarray, a_vld: np.ndarray, b_val: np.ndarray, b_vld: np.ndarray,
+              width: int, signed: Optional[bool],
+              evalFn: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched comparison operator (<, <=, >, >=), the result is valid only if both operands are fully valid
+
+    :param evalFn: one of operator.lt, le, gt, ge
+    :return: tuple of bool arrays (result, valid), result is False for invalid results
+    :see: :func:`pyMathBitPrecise.bits3t.bitsCmp__val`
+    """
+    assert evalFn is not eq and evalFn is not ne, ("use batch_eq/batch_ne instead")
+    vld = _batch_full_valid(a_vld & b_vld, width)
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        if signed:
+            a_val = batch_to_signed(a_val, width)
+            b_val = batch_to_signed(b_val, width)
+        res = evalFn(a_val, b_val)
+    else:
+        if signed:
+            # flip of sign bit converts the order of two's complement values to the order of unsigned values
+            sign = int_to_limbs(1 << (width - 1), a_val.shape[-1])
+            a_val = a_val ^ sign
+            b_val = b_val ^ sign
+        _lt, _eq = _limbs_lt_eq(a_val, b_val)
+        if evalFn is lt:
+            res = _lt
+        elif evalFn is le:
+            res = _lt | _eq
+        elif evalFn is gt:
+            res = ~(_lt | _eq)
+        elif evalFn is ge:
+            res = ~_lt
+        else:
+            raise ValueError("Unsupported compare operator", evalFn)
+    return res & vld, vld
+
+
+def _batch_any_valid_bit_ne(a_val: np.ndarray, b_val: np.ndarray, vld: np.ndarray, width: int) -> np.ndarray:
+    """
+    :return: bool array, True if some bit valid in both operands differs
+    """
+    ne_bits = (a_val ^ b_val) & vld
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        return ne_bits != 0
+    else:
+        return (ne_bits != 0).any(axis=-1)
+
+
+def batch_eq(a_val: np.ndarray, a_vld: np.ndarray, b_val: np.ndarray, b_vld: np.ndarray,
+             width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched operator ==, the result is valid also if some bits are invalid,
+    but some bit valid in both operands differs (the values are known to be unequal)
+
+    :return: tuple of bool arrays (result, valid), result is False for invalid results
+    :see: :func:`pyMathBitPrecise.bits3t.bitsCmp__val_EQ`
+    """
+    vld = a_vld & b_vld
+    full_vld = _batch_full_valid(vld, width)
+    _ne = _batch_any_valid_bit_ne(a_val, b_val, vld, width)
+    return ~_ne & full_vld, full_vld | _ne
+
+
+def batch_ne(a_val: np.ndarray, a_vld: np.ndarray, b_val: np.ndarray, b_vld: np.ndarray,
+             width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched operator !=, the result is valid also if some bits are invalid,
+    but some bit valid in both operands differs (the values are known to be unequal)
+
+    :return: tuple of bool arrays (result, valid), result is False for invalid results
+    :see: :func:`pyMathBitPrecise.bits3t.bitsCmp__val_NE`
+    """
+    vld = a_vld & b_vld
+    full_vld = _batch_full_valid(vld, width)
+    _ne = _batch_any_valid_bit_ne(a_val, b_val, vld, width)
+    return _ne, full_vld | _ne
+
+
+def _batch_to_limbs(a: np.ndarray, width: int, K: int) -> np.ndarray:
+    """
+    :return: values of specified width converted to array of K limbs
+    """
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        a = np.asarray(a)[..., None]
+    return limbs_resize(a, K)
+
+
+def _batch_from_limbs(a: np.ndarray, width: int) -> np.ndarray:
+    """
+    :return: values stored in limbs converted to the layout for specified width (cut off of upper limbs)
+    """
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        return a[..., 0]
+    else:
+        return limbs_resize(a, limb_cnt(width))
+
+
+def batch_get_bit_range(val: np.ndarray, vld: np.ndarray, width: int,
+                        firstBitNo: int, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched extraction of the static bit range [firstBitNo + size:firstBitNo] (as value[firstBitNo + size:firstBitNo])
+
+    :see: :func:`pyMathBitPrecise.bit_utils.get_bit_range`, :meth:`pyMathBitPrecise.bits3t.Bits3val.__getitem__`
+    """
+    assert size > 0 and firstBitNo >= 0 and firstBitNo + size <= width, (firstBitNo, size, width)
+    m = batch_width_mask(size)
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        sh = np.uint64(firstBitNo)
+        return (val >> sh) & m, (vld >> sh) & m
+
+    K = limb_cnt(size)
+    return (_batch_from_limbs(limbs_resize(limbs_shr(val, firstBitNo), K), size) & m,
+            _batch_from_limbs(limbs_resize(limbs_shr(vld, firstBitNo), K), size) & m)
+
+
+def batch_concat(a_val: np.ndarray, a_vld: np.ndarray, a_width: int,
+                 b_val: np.ndarray, b_vld: np.ndarray, b_width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched concatenation (a will be at MSB side), result has a_width + b_width bits
+
+    :see: :meth:`pyMathBitPrecise.bits3t.Bits3val._concat`
+    """
+    res_width = a_width + b_width
+    if res_width <= BATCH_MAX_NATIVE_WIDTH:
+        sh = np.uint64(b_width)
+        return (a_val << sh) | b_val, (a_vld << sh) | b_vld
+
+    K = limb_cnt(res_width)
+    return (limbs_shl(_batch_to_limbs(a_val, a_width, K), b_width) | _batch_to_limbs(b_val, b_width, K),
+            limbs_shl(_batch_to_limbs(a_vld, a_width, K), b_width) | _batch_to_limbs(b_vld, b_width, K))
+
+
+def batch_zext(val: np.ndarray, vld: np.ndarray, width: int, new_width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched zero extension, the new bits are valid 0
+
+    :see: :meth:`pyMathBitPrecise.bits3t.Bits3val._zext`
+    """
+    assert new_width >= width, (new_width, width)
+    if new_width <= BATCH_MAX_NATIVE_WIDTH:
+        return val.copy(), vld | np.uint64(bit_field(width, new_width))
+
+    K = limb_cnt(new_width)
+    return (_batch_to_limbs(val, width, K).copy(),
+            _batch_to_limbs(vld, width, K) | int_to_limbs(bit_field(width, new_width), K))
+
+
+def batch_sext(val: np.ndarray, vld: np.ndarray, width: int, new_width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched sign extension, the new bits have the value and the validity of the MSB
+
+    :see: :meth:`pyMathBitPrecise.bits3t.Bits3val._sext`
+    """
+    assert new_width >= width, (new_width, width)
+    if new_width <= BATCH_MAX_NATIVE_WIDTH:
+        new_bits = np.uint64(bit_field(width, new_width))
+        msb_sh = np.uint64(width - 1)
+        one = np.uint64(1)
+        val = np.where((val >> msb_sh) & one, val | new_bits, val)
+        vld = np.where((vld >> msb_sh) & one, vld | new_bits, vld)
+        return val, vld
+
+    K = limb_cnt(new_width)
+    new_bits = int_to_limbs(bit_field(width, new_width), K)
+    _val = _batch_to_limbs(val, width, K)
+    _vld = _batch_to_limbs(vld, width, K)
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        msb_sh = np.uint64(width - 1)
+        one = np.uint64(1)
+        val_msb = (np.asarray(val) >> msb_sh) & one
+        vld_msb = (np.asarray(vld) >> msb_sh) & one
+    else:
+        val_msb = limbs_get_bit(val, width - 1)
+        vld_msb = limbs_get_bit(vld, width - 1)
+    _val = np.where(val_msb.astype(bool)[..., None], _val | new_bits, _val)
+    _vld = np.where(vld_msb.astype(bool)[..., None], _vld | new_bits, _vld)
+    return _val, _vld
+
+
+def batch_trunc(val: np.ndarray, vld: np.ndarray, width: int, new_width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched truncation, cut off of the upper bits
+
+    :see: :meth:`pyMathBitPrecise.bits3t.Bits3val._trunc`
+    """
+    assert 0 < new_width <= width, (new_width, width)
+    return batch_get_bit_range(val, vld, width, 0, new_width)
+
+
+def _batch_reverse_words(a: np.ndarray, width: int, word_width: int) -> np.ndarray:
+    """
+    :see: :func:`~.batch_reverse_byte_order`
+    """
+    native = width <= BATCH_MAX_NATIVE_WIDTH
+    if native:
+        a = a[..., None]
+    K = a.shape[-1]
+    r = width % word_width
+    full_w = width - r
+    # little endian bytes of each value (LSB first)
+    b = np.ascontiguousarray(limbs_shr(a, r), dtype="<u8").view(np.uint8)
+    nb = full_w // 8
+    wb = word_width // 8
+    prefix = b.shape[:-1]
+    res = np.zeros_like(b)
+    res[..., :nb] = b[..., :nb].reshape(prefix + (nb // wb, wb))[..., ::-1, :].reshape(prefix + (nb,))
+    res = res.view("<u8").astype(np.uint64)
+    if r:
+        res |= limbs_shl(a & int_to_limbs(mask(r), K), full_w)
+    if native:
+        return res[..., 0]
+    return res
+
+
+def batch_reverse_byte_order(val: np.ndarray, vld: np.ndarray, width: int,
+                             word_width: int=8) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched reverse of byteorder (or order of words of word_width bits, word_width has to be a multiple of 8)
+
+    :see: :func:`pyMathBitPrecise.bit_utils.reverse_byte_order`
+    """
+    if word_width % 8:
+        raise ValueError("Word width has to be a multiple of 8", word_width)
+    return _batch_reverse_words(val, width, word_width), _batch_reverse_words(vld, width, word_width)
+
+
+# numpy >= 2.0
+_np_bitwise_count = getattr(np, "bitwise_count", None)
+
+
+def _batch_ctpop_u64(v: np.ndarray) -> np.ndarray:
+    """
+    :return: number of 1 in each uint64
+    """
+    if _np_bitwise_count is not None:
+        return _np_bitwise_count(v).astype(np.uint64)
+    # SWAR, the multiplication overflows the same as in C
+    v = v - ((v >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    v = (v & np.uint64(0x3333333333333333)) + ((v >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    v = (v + (v >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (v * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+def _batch_ctlz_u64(v: np.ndarray) -> np.ndarray:
+    """
+    :return: number of leading zeros in each uint64
+    """
+    for sh in (1, 2, 4, 8, 16, 32):
+        v = v | (v >> np.uint64(sh))
+    return np.uint64(64) - _batch_ctpop_u64(v)
+
+
+def _batch_cttz_u64(v: np.ndarray) -> np.ndarray:
+    """
+    :return: number of trailing zeros in each uint64 (64 for 0)
+    """
+    # mask of the bits below the lowest 1 (all bits for 0)
+    return _batch_ctpop_u64((v & (~v + np.uint64(1))) - np.uint64(1))
+
+
+def _batch_sum_until_nonzero(cnt: np.ndarray, limbs: np.ndarray) -> np.ndarray:
+    """
+    :return: sum of cnt for limbs up to first non zero limb (including), limbs in the last dimension
+    """
+    nonzero = limbs != 0
+    seen_before = np.logical_or.accumulate(nonzero, axis=-1)
+    seen_before[..., 1:] = seen_before[..., :-1].copy()
+    seen_before[..., 0] = False
+    return np.where(seen_before, np.uint64(0), cnt).sum(axis=-1, dtype=np.uint64)
+
+
+def batch_ctpop(val: np.ndarray, width: int) -> np.ndarray:
+    """
+    Batched population count (number of 1)
+
+    :return: uint64 array of counts
+    :see: :func:`pyMathBitPrecise.bit_utils.ctpop`
+    """
+    res = _batch_ctpop_u64(val & batch_width_mask(width))
+    if width > BATCH_MAX_NATIVE_WIDTH:
+        res = res.sum(axis=-1, dtype=np.uint64)
+    return res
+
+
+def batch_ctlz(val: np.ndarray, width: int) -> np.ndarray:
+    """
+    Batched count of leading zeros
+
+    :return: uint64 array of counts
+    :see: :func:`pyMathBitPrecise.bit_utils.ctlz`
+    """
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        return _batch_ctlz_u64(val) - np.uint64(64 - width)
+    # from the most significant limb
+    limbs = val[..., ::-1]
+    K = val.shape[-1]
+    return _batch_sum_until_nonzero(_batch_ctlz_u64(limbs), limbs) - np.uint64(K * 64 - width)
+
+
+def batch_cttz(val: np.ndarray, width: int) -> np.ndarray:
+    """
+    Batched count of trailing zeros
+
+    :return: uint64 array of counts
+    :see: :func:`pyMathBitPrecise.bit_utils.cttz`
+    """
+    if width <= BATCH_MAX_NATIVE_WIDTH:
+        res = _batch_cttz_u64(val)
+    else:
+        res = _batch_sum_until_nonzero(_batch_cttz_u64(val), val)
+    return np.minimum(res, np.uint64(width))
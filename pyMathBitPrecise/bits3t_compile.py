@@ -0,0 +1,564 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Compilation of functions written with :class:`~.Bits3val` operators to straight-line python code.
+
+The function is traced once on symbolic inputs (:meth:`~.Bits3LazyNode.symbolic`),
+the resulting expression graph is translated to python source which works on (val, vld_mask) int pairs
+and compiled. The compiled function is cached in memory and optionally the source is cached on disk
+(keyed by hash of the function code, values of globals and closure variables it reads and argument types),
+the tracing is skipped if the source is found in the cache.
+
+.. code-block:: python
+
+    def f(a, b):
+        return (a + b) & 0xf0
+
+    f_c = compile_bits3_fn(f, uint8_t, uint8_t)
+    f_c(1, 2)  # Bits3val
+    f_c.raw(1, 0xff, 2, 0xff)  # (val, vld_mask)
+
+:note: The disk cache is used only if cache_dir is specified or if the PYMATHBITPRECISE_CACHE_DIR
+    environment variable is set (e.g. to ~/.cache/pyMathBitPrecise).
+:note: Functions which read global or closure variables other than modules, functions, ints, strings, floats, None
+    and Bits3t types are not cached at all (the functions and module attributes are checked recursively).
+    Use cache_dir=None to disable the cache explicitly.
+"""
+
+from hashlib import sha256
+import inspect
+import os
+import sys
+from types import CodeType, ModuleType, FunctionType, BuiltinFunctionType
+from typing import Callable, Optional, Tuple, List, Union, Dict, Sequence, Literal, \
+    FrozenSet, Set
+
+from pyMathBitPrecise.bit_utils import mask, bit_field
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val, _NOT_SPECIFIED
+from pyMathBitPrecise.bits3t_lazy import Bits3LazyNode, lazy
+
+# increment if format of generated code changes
+_COMPILER_VERSION = 1
+# default directory for generated code, None to disable disk cache (the disk cache is opt-in)
+BITS3T_COMPILE_CACHE_DIR: Optional[str] = os.environ.get("PYMATHBITPRECISE_CACHE_DIR", None)
+
+# key: cache key, value: compiled function
+_COMPILED_CACHE: Dict[str, "Bits3CompiledFn"] = {}
+
+
+class Bits3CompiledFn():
+    """
+    Function compiled by :func:`~.compile_bits3_fn`
+
+    :ivar ~.raw: the generated function, arguments are val, vld_mask for each argument,
+        returns tuple val, vld_mask for each result (flat)
+    :ivar ~.arg_types: types of arguments
+    :ivar ~.result_types: types of results
+    :ivar ~.single_result: if True the traced function returned a single value instead of tuple
+    :ivar ~.source: generated source code
+    """
+    __slots__ = ("raw", "arg_types", "result_types", "single_result", "source")
+
+    def __init__(self, raw: Callable[..., Tuple[int, ...]], arg_types: Tuple[Bits3t, ...],
+                 result_types: Tuple[Bits3t, ...], single_result: bool, source: str):
+        self.raw = raw
+        self.arg_types = arg_types
+        self.result_types = result_types
+        self.single_result = single_result
+        self.source = source
+
+    def __call__(self, *args: Union[int, Bits3val, None]) -> Union[Bits3val, Tuple[Bits3val, ...]]:
+        if len(args) != len(self.arg_types):
+            raise TypeError("Invalid number of arguments", len(args), len(self.arg_types))
+        raw_args = []
+        for t, a in zip(self.arg_types, args):
+            if isinstance(a, Bits3val):
+                assert a._dtype.bit_length() == t.bit_length(), (a, t)
+                raw_args.append(a.val)
+                raw_args.append(a.vld_mask)
+            else:
+                raw_args.extend(t._normalize_val_and_mask(a, None))
+
+        res = self.raw(*raw_args)
+        res = tuple(t._from_py(res[i * 2], res[i * 2 + 1])
+                    for i, t in enumerate(self.result_types))
+        if self.single_result:
+            return res[0]
+        return res
+
+
+def _lit(v: int) -> str:
+    return f"0x{v:x}" if v > 9 else f"{v:d}"
+
+
+def _emit_arith(op: str):
+
+    def emit(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+        m = _lit(mask(n._width))
+        mb = _lit(mask(b._width))
+        # + - * results are the same for signed and unsigned after the cut off of the upper bits
+        return [
+            f"{{v}} = ({{a}} {op} {{b}}) & {m}",
+            f"{{m}} = {m} if {{a_m}} == {m} and {{b_m}} == {mb} else 0",
+        ]
+
+    return emit
+
+
+def _emit_and(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    return [
+        "{m} = ({a_m} & {b_m}) | ({a_m} & ~{a}) | ({b_m} & ~{b})",
+        "{v} = {a} & {b} & {m}",
+    ]
+
+
+def _emit_or(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    return [
+        "{m} = ({a_m} & {b_m}) | ({a_m} & {a}) | ({b_m} & {b})",
+        "{v} = ({a} | {b}) & {m}",
+    ]
+
+
+def _emit_xor(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    return [
+        "{m} = {a_m} & {b_m}",
+        "{v} = ({a} ^ {b}) & {m}",
+    ]
+
+
+def _emit_invert(n: Bits3LazyNode, a: Bits3LazyNode):
+    return [
+        f"{{v}} = ~{{a}} & {_lit(mask(n._width))}",
+        "{m} = {a_m}",
+    ]
+
+
+def _emit_neg(n: Bits3LazyNode, a: Bits3LazyNode):
+    return [
+        f"{{v}} = -{{a}} & {_lit(mask(n._width))}",
+        "{m} = {a_m}",
+    ]
+
+
+def _emit_invalid_shift(n: Bits3LazyNode, a: Bits3LazyNode) -> Optional[List[str]]:
+    sh = n.param
+    if sh is None:
+        return ["{v} = 0", "{m} = 0"]
+    elif sh >= n._width:
+        return ["{v} = 0", f"{{m}} = {_lit(mask(n._width))}"]
+    return None
+
+
+def _emit_shl(n: Bits3LazyNode, a: Bits3LazyNode):
+    sh = n.param
+    if sh is None:
+        return ["{v} = 0", "{m} = 0"]
+    m = _lit(mask(n._width))
+    return [
+        f"{{v}} = ({{a}} << {sh:d}) & {m}",
+        f"{{m}} = (({{a_m}} << {sh:d}) | {_lit(mask(sh))}) & {m}",
+    ]
+
+
+def _emit_lshr(n: Bits3LazyNode, a: Bits3LazyNode):
+    res = _emit_invalid_shift(n, a)
+    if res is not None:
+        return res
+    sh = n.param
+    w = n._width
+    return [
+        f"{{m}} = ({{a_m}} >> {sh:d}) | {_lit(bit_field(w - sh, w))}",
+        f"{{v}} = ({{a}} >> {sh:d}) & {{m}}",
+    ]
+
+
+def _emit_ashr(n: Bits3LazyNode, a: Bits3LazyNode):
+    res = _emit_invalid_shift(n, a)
+    if res is not None:
+        return res
+    sh = n.param
+    w = n._width
+    newBits = _lit(bit_field(w - sh, w))
+    return [
+        f"{{m}} = ({{a_m}} >> {sh:d}) | {newBits}",
+        f"{{v}} = ({{a}} >> {sh:d}) | {newBits} if {{a}} >> {w - 1:d} else {{a}} >> {sh:d}",
+    ]
+
+
+def _emit_slice(n: Bits3LazyNode, a: Bits3LazyNode):
+    firstBitNo, size = n.param
+    if firstBitNo is None:
+        return ["{v} = 0", "{m} = 0"]
+    m = _lit(mask(size))
+    return [
+        f"{{v}} = ({{a}} >> {firstBitNo:d}) & {m}",
+        f"{{m}} = ({{a_m}} >> {firstBitNo:d}) & {m}",
+    ]
+
+
+def _emit_concat(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    w = b._width
+    return [
+        f"{{v}} = ({{a}} << {w:d}) | {{b}}",
+        f"{{m}} = ({{a_m}} << {w:d}) | {{b_m}}",
+    ]
+
+
+def _emit_zext(n: Bits3LazyNode, a: Bits3LazyNode):
+    return [
+        f"{{m}} = {{a_m}} | {_lit(bit_field(a._width, n._width))}",
+        "{v} = {a} & {m}",
+    ]
+
+
+def _emit_sext(n: Bits3LazyNode, a: Bits3LazyNode):
+    w = a._width
+    newBits = _lit(bit_field(w, n._width))
+    return [
+        f"{{v}} = {{a}} | {newBits} if ({{a}} >> {w - 1:d}) & 1 else {{a}}",
+        f"{{m}} = {{a_m}} | {newBits} if ({{a_m}} >> {w - 1:d}) & 1 else {{a_m}}",
+    ]
+
+
+def _emit_trunc(n: Bits3LazyNode, a: Bits3LazyNode):
+    m = _lit(mask(n._width))
+    return [
+        f"{{v}} = {{a}} & {m}",
+        f"{{m}} = {{a_m}} & {m}",
+    ]
+
+
+def _emit_cmp(op: str):
+
+    def emit(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+        w = a._width
+        if a._signed:
+            # signed comparison of unsigned representations
+            sign_flip = f" ^ {_lit(1 << (w - 1))}"
+        else:
+            sign_flip = ""
+        return [
+            f"{{m}} = int({{a_m}} & {{b_m}} == {_lit(mask(w))})",
+            f"{{v}} = int(({{a}}{sign_flip}) {op} ({{b}}{sign_flip})) & {{m}}",
+        ]
+
+    return emit
+
+
+def _emit_eq(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    m = _lit(mask(a._width))
+    # if some bits are invalid but from valid bits we already know that the value does not equal
+    # the result is valid 0
+    return [
+        "{m} = {a_m} & {b_m}",
+        "{v} = ({a} ^ {b}) & {m}",
+        f"{{m}}, {{v}} = int({{m}} == {m} or {{v}} != 0), int({{m}} == {m} and {{v}} == 0)",
+    ]
+
+
+def _emit_ne(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    m = _lit(mask(a._width))
+    return [
+        "{m} = {a_m} & {b_m}",
+        "{v} = int((({a} ^ {b}) & {m}) != 0)",
+        f"{{m}} = int({{m}} == {m}) | {{v}}",
+    ]
+
+
+_EMITTERS: Dict[str, Callable[..., List[str]]] = {
+    "add": _emit_arith("+"),
+    "sub": _emit_arith("-"),
+    "mul": _emit_arith("*"),
+    "and": _emit_and,
+    "or": _emit_or,
+    "xor": _emit_xor,
+    "invert": _emit_invert,
+    "neg": _emit_neg,
+    "shl": _emit_shl,
+    "lshr": _emit_lshr,
+    "ashr": _emit_ashr,
+    "slice": _emit_slice,
+    "concat": _emit_concat,
+    "zext": _emit_zext,
+    "sext": _emit_sext,
+    "trunc": _emit_trunc,
+    "lt": _emit_cmp("<"),
+    "le": _emit_cmp("<="),
+    "gt": _emit_cmp(">"),
+    "ge": _emit_cmp(">="),
+    "eq": _emit_eq,
+    "ne": _emit_ne,
+}
+
+
+def _toposort(outputs: Sequence[Bits3LazyNode]) -> List[Bits3LazyNode]:
+    """
+    :return: list of all nodes in expressions, operands before the node which uses them
+    """
+    res = []
+    seen = set()
+    stack = [(o, False) for o in reversed(outputs)]
+    while stack:
+        n, operands_done = stack.pop()
+        if operands_done:
+            res.append(n)
+            continue
+        if n in seen:
+            continue
+        seen.add(n)
+        stack.append((n, True))
+        for o in reversed(n.operands):
+            if o not in seen:
+                stack.append((o, False))
+    return res
+
+
+def _type_to_src(t: Bits3t) -> str:
+    if t.__class__ is not Bits3t:
+        # the generated code constructs the result types by Bits3t constructor
+        raise TypeError("Only Bits3t types are supported", t)
+    return f"({t._bit_length:d}, {t.signed!r}, {t.name!r}, {t.force_vector!r}, {t.strict_sign!r}, {t.strict_width!r})"
+
+
+def _gen_source(name: str, inputs: Sequence[Bits3LazyNode], outputs: Sequence[Bits3LazyNode],
+                single_result: bool) -> str:
+    """
+    Generate source code of the function which computes outputs from inputs
+
+    :note: the source contains RESULT_TYPES (arguments of Bits3t constructor), SINGLE_RESULT flag
+        and the function itself
+    """
+    names = {}
+    args = []
+    for i, inp in enumerate(inputs):
+        v = f"i{i:d}"
+        names[inp] = (v, f"{v:s}_vld")
+        args.extend(names[inp])
+
+    body = []
+    for n in _toposort(outputs):
+        if n in names:
+            continue
+        if n.op == "const":
+            names[n] = (_lit(n._val), _lit(n._vld))
+            continue
+        elif n.op == "input":
+            raise ValueError("Expression uses input which is not an argument of the function", n)
+
+        v = f"v{len(names):d}"
+        m = f"m{len(names):d}"
+        names[n] = (v, m)
+        fmt = {"v": v, "m": m}
+        for o_name, o in zip(("a", "b"), n.operands):
+            o_v, o_m = names[o]
+            fmt[o_name] = o_v
+            fmt[f"{o_name:s}_m"] = o_m
+        for line in _EMITTERS[n.op](n, *n.operands):
+            body.append("    " + line.format(**fmt))
+
+    res = []
+    for o in outputs:
+        res.extend(names[o])
+    body.append(f"    return ({', '.join(res):s},)")
+
+    result_types = "".join(f"{_type_to_src(o.dtype):s}, " for o in outputs)
+    return "\n".join([
+        f"# generated by {__name__:s} from {name:s}",
+        f"RESULT_TYPES = ({result_types:s})",
+        f"SINGLE_RESULT = {single_result!r}",
+        "",
+        "",
+        f"def {name:s}({', '.join(args):s}):",
+        *body,
+        ""
+    ])
+
+
+def _code_key(code: CodeType) -> tuple:
+    """
+    :return: representation of the code object (including nested functions) which does not depend on memory addresses
+    """
+    return (code.co_code, code.co_names,
+            tuple(_code_key(c) if isinstance(c, CodeType) else repr(c) for c in code.co_consts))
+
+
+def _code_names(code: CodeType):
+    """
+    :return: generator of names of globals (and attributes) used in the code and nested code objects
+    """
+    yield from code.co_names
+    for c in code.co_consts:
+        if isinstance(c, CodeType):
+            yield from _code_names(c)
+
+
+def _value_key(v, names: FrozenSet[str], seen: Set[object]) -> Optional[str]:
+    """
+    :param names: names of globals and attributes used by the code which reads the value
+        (the attributes of modules with these names are part of the key)
+    :param seen: ids of functions and (module, names) already in the key (for recursive references)
+    :return: representation of a value of global or closure variable or None if the value can not be part of the cache key
+    """
+    if v is None or type(v) in (int, bool, float, str, bytes):
+        return repr(v)
+    elif v.__class__ is Bits3t:
+        return _type_to_src(v)
+    elif isinstance(v, BuiltinFunctionType):
+        return f"builtin {v.__module__}.{v.__qualname__:s}"
+    elif isinstance(v, FunctionType):
+        if id(v) in seen:
+            # already in the key
+            return f"function {v.__module__:s}.{v.__qualname__:s}"
+        seen.add(id(v))
+        k = _fn_key(v, seen)
+        return None if k is None else repr(k)
+    elif isinstance(v, ModuleType):
+        seen_key = (id(v), names)
+        if seen_key in seen:
+            return f"module {v.__name__:s}"
+        seen.add(seen_key)
+        attrs = []
+        # the code of anything used through the module has to be in the key as well
+        for name in sorted(names):
+            try:
+                a = getattr(v, name)
+            except AttributeError:
+                continue
+            a = _value_key(a, names, seen)
+            if a is None:
+                return None
+            attrs.append((name, a))
+        return repr((v.__name__, attrs))
+    return None
+
+
+def _fn_key(fn: FunctionType, seen: Set[object]) -> Optional[tuple]:
+    """
+    :return: tuple with the code of function and the keys of global and closure variables it reads
+        or None if the function can not be cached
+    """
+    code = fn.__code__
+    names = frozenset(_code_names(code))
+    variables = []
+    closure = fn.__closure__
+    if closure:
+        for name, cell in zip(code.co_freevars, closure):
+            try:
+                v = cell.cell_contents
+            except ValueError:
+                # cell is empty
+                return None
+            v = _value_key(v, names, seen)
+            if v is None:
+                return None
+            variables.append((name, v))
+
+    fn_globals = fn.__globals__
+    for name in sorted(names):
+        try:
+            v = fn_globals[name]
+        except KeyError:
+            # builtin or attribute name
+            continue
+        v = _value_key(v, names, seen)
+        if v is None:
+            return None
+        variables.append((name, v))
+
+    return (fn.__module__, fn.__qualname__, _code_key(code), variables)
+
+
+def _cache_key(fn: Callable, arg_types: Sequence[Bits3t]) -> Optional[str]:
+    """
+    :return: hash of function code, the values of global and closure variables it reads
+        (including the code of functions it calls) and argument types or None if the function can not be cached
+    """
+    if not isinstance(fn, FunctionType):
+        return None
+    fn_key = _fn_key(fn, {id(fn)})
+    if fn_key is None:
+        return None
+
+    types = tuple(_type_to_src(t) for t in arg_types)
+    key = repr((_COMPILER_VERSION, sys.implementation.cache_tag, fn_key, types))
+    return sha256(key.encode("utf-8")).hexdigest()
+
+
+def _load_source(fn_name: str, src: str, file_name: str, arg_types: Tuple[Bits3t, ...]) -> Bits3CompiledFn:
+    ns = {}
+    exec(compile(src, file_name, "exec"), ns)
+    result_types = tuple(Bits3t(*t) for t in ns["RESULT_TYPES"])
+    return Bits3CompiledFn(ns[fn_name], arg_types, result_types, ns["SINGLE_RESULT"], src)
+
+
+def _trace(fn: Callable, arg_types: Tuple[Bits3t, ...]) -> Tuple[List[Bits3LazyNode], List[Bits3LazyNode], bool]:
+    params = list(inspect.signature(fn).parameters)
+    if len(params) != len(arg_types):
+        raise TypeError("Invalid number of argument types", fn, len(params), len(arg_types))
+    inputs = [Bits3LazyNode.symbolic(t, name) for t, name in zip(arg_types, params)]
+    outputs = fn(*inputs)
+    single_result = not isinstance(outputs, (tuple, list))
+    if single_result:
+        outputs = (outputs,)
+    outputs = [lazy(o) for o in outputs]
+    return inputs, outputs, single_result
+
+
+def compile_bits3_fn(fn: Callable[..., Union[Bits3val, Tuple[Bits3val, ...]]], *arg_types: Bits3t,
+                     cache_dir: Union[str, None, Literal[_NOT_SPECIFIED]]=_NOT_SPECIFIED) -> Bits3CompiledFn:
+    """
+    Trace function fn on symbolic inputs of specified types and compile it to a python function
+    which works on ints (val and vld_mask for each argument and result).
+
+    :param fn: function which uses only :class:`~.Bits3val` operators supported by :class:`~.Bits3LazyNode`
+        and returns a value or tuple of values, the control flow must not depend on argument values
+    :param arg_types: types of arguments of fn
+    :param cache_dir: directory where generated sources are stored, None to disable both memory and disk cache,
+        if not specified the memory cache and :data:`~.BITS3T_COMPILE_CACHE_DIR` (if not None) is used
+    """
+    if cache_dir is None:
+        key = None
+    else:
+        if cache_dir is _NOT_SPECIFIED:
+            cache_dir = BITS3T_COMPILE_CACHE_DIR
+        key = _cache_key(fn, arg_types)
+
+    if key is not None:
+        res = _COMPILED_CACHE.get(key, None)
+        if res is not None:
+            return res
+
+    fn_name = fn.__name__ if fn.__name__.isidentifier() else "bits3_fn"
+    file_name = None
+    if key is not None and cache_dir is not None:
+        file_name = os.path.join(cache_dir, f"{key:s}.py")
+        try:
+            with open(file_name) as f:
+                src = f.read()
+        except OSError:
+            src = None
+
+        if src is not None:
+            res = _load_source(fn_name, src, file_name, arg_types)
+            _COMPILED_CACHE[key] = res
+            return res
+
+    inputs, outputs, single_result = _trace(fn, arg_types)
+    src = _gen_source(fn_name, inputs, outputs, single_result)
+
+    if file_name is not None:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_file_name = f"{file_name:s}.{os.getpid():d}.tmp"
+            with open(tmp_file_name, "w") as f:
+                f.write(src)
+            os.replace(tmp_file_name, file_name)
+        except OSError:
+            # cache is not writable, compile without cache
+            file_name = None
+
+    res = _load_source(fn_name, src, file_name or f"<{__name__:s} {fn_name:s}>", arg_types)
+    if key is not None:
+        _COMPILED_CACHE[key] = res
+    return res
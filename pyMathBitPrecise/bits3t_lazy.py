@@ -0,0 +1,569 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Lazy evaluated expressions of :class:`~.Bits3val`.
+
+The operators of :class:`~.Bits3LazyNode` do not compute anything, they only build
+an expression graph (DAG). The nodes are hash-consed, an expression built twice
+from the same operands is the same node (common subexpression elimination).
+The graph is evaluated by :meth:`~.Bits3LazyNode.evaluate`, ``int()``, ``bool()``
+or :meth:`~.Bits3LazyNode._eq`. The evaluation computes the value and validity mask
+of each node in a single pass over python ints, no intermediate :class:`~.Bits3val`
+objects or intermediate types are created.
+
+.. code-block:: python
+
+    a = lazy(uint8_t.from_py(1))
+    e = ((a + b) & m) >> 3
+    e.evaluate()  # Bits3val
+"""
+
+from typing import Union, Optional, Tuple, Callable, Dict
+from weakref import WeakValueDictionary
+
+from pyMathBitPrecise.bit_utils import mask, ValidityError, normalize_slice, \
+    bit_field, to_signed
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+from pyMathBitPrecise.bits3t_vld_masks import vld_mask_for_and_raw, \
+    vld_mask_for_or_raw, vld_mask_for_xor_raw
+
+# key: (op, operands, param), value: node
+_LAZY_NODES: "WeakValueDictionary[tuple, Bits3LazyNode]" = WeakValueDictionary()
+
+
+class Bits3LazyNode():
+    """
+    Node of lazy evaluated :class:`~.Bits3val` expression
+
+    :ivar ~.op: name of the operator ("const" for leafs)
+    :ivar ~.operands: tuple of operand nodes
+    :ivar ~.param: additional hashable parameter of operator (shift amount, slice range, ...)
+    :ivar ~._dtype: type of the result or a tuple (base type, width, signed)
+        for types which are constructed only when the result is evaluated (see :meth:`~.dtype`)
+    :ivar ~._width: bit width of the result
+    :ivar ~._signed: signed flag of the result type
+    :ivar ~._val: None or evaluated value (unsigned) of this node
+    :ivar ~._vld: None or evaluated validity mask of this node
+    :ivar ~._symbolic: True if the expression depends on a symbolic input (see :meth:`~.symbolic`)
+        and thus it can not be evaluated
+    """
+    __slots__ = ("op", "operands", "param", "_dtype", "_width", "_signed",
+                 "_val", "_vld", "_symbolic", "__weakref__")
+    _SIGNED_FOR_SLICE_RESULT = Bits3val._SIGNED_FOR_SLICE_RESULT
+    _SIGNED_FOR_CONCAT_RESULT = Bits3val._SIGNED_FOR_CONCAT_RESULT
+    _BOOL = Bits3val._BOOL
+
+    def __init__(self, op: str, operands: Tuple["Bits3LazyNode", ...], param,
+                 dtype: Union[Bits3t, Tuple[Bits3t, int, Optional[bool]]], width: int, signed: Optional[bool]):
+        self.op = op
+        self.operands = operands
+        self.param = param
+        self._dtype = dtype
+        self._width = width
+        self._signed = signed
+        self._val = None
+        self._vld = None
+        self._symbolic = any(o._symbolic for o in operands)
+
+    @classmethod
+    def _get(cls, op: str, operands: Tuple["Bits3LazyNode", ...], param,
+             dtype: Union[Bits3t, Tuple[Bits3t, int, Optional[bool]]], width: int, signed: Optional[bool]):
+        """
+        Get existing node for this expression or create a new one
+        """
+        key = (op, operands, param)
+        n = _LAZY_NODES.get(key, None)
+        if n is None:
+            n = cls(op, operands, param, dtype, width, signed)
+            _LAZY_NODES[key] = n
+        return n
+
+    @classmethod
+    def from_val(cls, v: Bits3val) -> "Bits3LazyNode":
+        """
+        Get leaf node for a value (the value is copied, later modifications of v are not reflected)
+        """
+        t = v._dtype
+        n = cls._get("const", (), (t, v.val, v.vld_mask), t, t.bit_length(), t.signed)
+        n._val = v.val
+        n._vld = v.vld_mask
+        return n
+
+    @classmethod
+    def symbolic(cls, t: Bits3t, name: str) -> "Bits3LazyNode":
+        """
+        Get leaf node for an input with unknown value, used for tracing of expressions
+        """
+        n = cls._get("input", (), (t, name), t, t.bit_length(), t.signed)
+        n._symbolic = True
+        return n
+
+    def _operand(self, other: Union[int, Bits3val, "Bits3LazyNode"]) -> "Bits3LazyNode":
+        if isinstance(other, Bits3LazyNode):
+            return other
+        elif isinstance(other, Bits3val):
+            return self.from_val(other)
+        elif isinstance(other, int):
+            return self.from_val(self.dtype.from_py(other))
+        else:
+            raise TypeError(other)
+
+    @property
+    def dtype(self) -> Bits3t:
+        """
+        Type of the result
+        """
+        t = self._dtype
+        if isinstance(t, tuple):
+            base_t, width, signed = t
+            if base_t is None:
+                t = Bits3t._get(width, signed=signed)
+            else:
+                t = base_t._createMutated(width, signed=signed)
+            self._dtype = t
+        return t
+
+    def evaluate(self) -> Bits3val:
+        """
+        Compute the value of the expression
+
+        :note: the results of all nodes in expression are cached in nodes
+        """
+        if self._vld is None:
+            _evaluate(self)
+        return self.dtype._from_py(self._val, self._vld)
+
+    def __int__(self) -> int:
+        "int(self)"
+        if self._vld is None:
+            _evaluate(self)
+        if self._vld != mask(self._width):
+            raise ValidityError(self)
+        if self._signed:
+            return to_signed(self._val, self._width)
+        else:
+            return self._val
+
+    def __bool__(self) -> bool:
+        "bool(self)"
+        return bool(self.__int__())
+
+    def _eq(self, other: Union[int, Bits3val, "Bits3LazyNode"]) -> Union[Bits3val, "Bits3LazyNode"]:
+        """
+        Operator self._eq(other) as self == other (evaluates the expression immediately
+        if it does not contain symbolic inputs)
+        """
+        res = self._cmp_op("eq", other)
+        if res._symbolic:
+            return res
+        return res.evaluate()
+
+    def _binop(self, op: str, other: Union[int, Bits3val, "Bits3LazyNode"]):
+        """
+        Binary operator with result of the same type as self
+        """
+        other = self._operand(other)
+        return self._get(op, (self, other), None, self._dtype, self._width, self._signed)
+
+    def _rbinop(self, op: str, other: Union[int, Bits3val, "Bits3LazyNode"]):
+        """
+        Reflected binary operator (other op self) with result of the same type as self
+        """
+        other = self._operand(other)
+        return self._get(op, (other, self), None, self._dtype, self._width, self._signed)
+
+    def _bitwise_op(self, op: str, other: Union[int, Bits3val, "Bits3LazyNode"]):
+        other = self._operand(other)
+        assert self._width == other._width, (self, other)
+        return self._get(op, (self, other), None, self._dtype, self._width, self._signed)
+
+    def _cmp_op(self, op: str, other: Union[int, Bits3val, "Bits3LazyNode"]):
+        other = self._operand(other)
+        if bool(self._signed) != bool(other._signed) or self._width != other._width:
+            raise TypeError("Value compare supports only same width and sign type", self.dtype, other.dtype)
+        t = self._BOOL
+        return self._get(op, (self, other), None, t, 1, t.signed)
+
+    def __add__(self, other):
+        "Operator +."
+        return self._binop("add", other)
+
+    def __radd__(self, other):
+        "Operator +."
+        return self._binop("add", other)
+
+    def __sub__(self, other):
+        "Operator -."
+        return self._binop("sub", other)
+
+    def __rsub__(self, other):
+        "Operator -."
+        return self._rbinop("sub", other)
+
+    def __mul__(self, other):
+        "Operator *."
+        return self._binop("mul", other)
+
+    def __floordiv__(self, other):
+        "Operator // (evaluated immediately)"
+        if isinstance(other, Bits3LazyNode):
+            other = other.evaluate()
+        return self.from_val(self.evaluate() // other)
+
+    def __mod__(self, other):
+        "Operator % (evaluated immediately)"
+        if isinstance(other, Bits3LazyNode):
+            other = other.evaluate()
+        return self.from_val(self.evaluate() % other)
+
+    def __and__(self, other):
+        "Operator &."
+        return self._bitwise_op("and", other)
+
+    def __rand__(self, other):
+        "Operator &."
+        return self._bitwise_op("and", other)
+
+    def __or__(self, other):
+        "Operator |."
+        return self._bitwise_op("or", other)
+
+    def __ror__(self, other):
+        "Operator |."
+        return self._bitwise_op("or", other)
+
+    def __xor__(self, other):
+        "Operator ^."
+        return self._bitwise_op("xor", other)
+
+    def __rxor__(self, other):
+        "Operator ^."
+        return self._bitwise_op("xor", other)
+
+    def __invert__(self):
+        "Operator ~x."
+        return self._get("invert", (self,), None, self._dtype, self._width, self._signed)
+
+    def __neg__(self):
+        "Operator -x."
+        return self._get("neg", (self,), None, self._dtype, self._width, self._signed)
+
+    def _shift(self, op: str, sh: Union[int, Bits3val, "Bits3LazyNode"]):
+        try:
+            sh = int(sh)
+        except ValidityError:
+            sh = None
+        if sh is not None and sh < 0:
+            raise ValueError("negative shift count")
+        return self._get(op, (self,), sh, self._dtype, self._width, self._signed)
+
+    def __lshift__(self, other):
+        "Operator <<. (shifts in 0)"
+        return self._shift("shl", other)
+
+    def __rshift__(self, other):
+        "Operator >>."
+        return self._shift("ashr" if self._signed else "lshr", other)
+
+    def __lt__(self, other):
+        "Operator <."
+        return self._cmp_op("lt", other)
+
+    def __le__(self, other):
+        "Operator <=."
+        return self._cmp_op("le", other)
+
+    def __gt__(self, other):
+        "Operator >."
+        return self._cmp_op("gt", other)
+
+    def __ge__(self, other):
+        "Operator >=."
+        return self._cmp_op("ge", other)
+
+    def __ne__(self, other):
+        "Operator !=."
+        return self._cmp_op("ne", other)
+
+    __hash__ = object.__hash__
+
+    def __getitem__(self, key: Union[int, slice, Bits3val]) -> "Bits3LazyNode":
+        "self[key]"
+        if isinstance(key, slice):
+            firstBitNo, size = normalize_slice(key, self._width)
+        elif isinstance(key, (int, Bits3val, Bits3LazyNode)):
+            size = 1
+            try:
+                firstBitNo = int(key)
+            except ValidityError:
+                firstBitNo = None
+            if firstBitNo is not None and (firstBitNo < 0 or firstBitNo >= self._width):
+                raise IndexError("Index out of range", firstBitNo)
+        else:
+            raise TypeError(key)
+        signed = self._SIGNED_FOR_SLICE_RESULT
+        return self._get("slice", (self,), (firstBitNo, size),
+                         (self._base_dtype(), size, signed), size, signed)
+
+    def _base_dtype(self) -> Bits3t:
+        """
+        :return: type which should be used as a base for types derived from type of this node
+        """
+        t = self._dtype
+        if isinstance(t, tuple):
+            base_t, _, _ = t
+            if base_t is not None:
+                return base_t
+            return self.dtype
+        return t
+
+    def _concat(self, other: Union[Bits3val, "Bits3LazyNode"]) -> "Bits3LazyNode":
+        """
+        Concatenate two bit vectors together (self will be at MSB side)
+        """
+        if not isinstance(other, (Bits3val, Bits3LazyNode)):
+            raise TypeError(other)
+        other = self._operand(other)
+        w = self._width + other._width
+        signed = self._SIGNED_FOR_CONCAT_RESULT
+        return self._get("concat", (self, other), None, (None, w, signed), w, signed)
+
+    def _zext(self, newWidth: int) -> "Bits3LazyNode":
+        """
+        zero extension, pad with 0 on msb side to newWidth result width
+        """
+        return self._resize("zext", newWidth)
+
+    def _sext(self, newWidth: int) -> "Bits3LazyNode":
+        """
+        signed extension, pad with MSB bit on MSB side to newWidth result width
+        """
+        return self._resize("sext", newWidth)
+
+    def _trunc(self, newWidth: int) -> "Bits3LazyNode":
+        assert newWidth > 0, newWidth
+        assert newWidth <= self._width, newWidth
+        return self._resize("trunc", newWidth)
+
+    def _resize(self, op: str, newWidth: int) -> "Bits3LazyNode":
+        if newWidth == self._width:
+            return self
+        if op != "trunc":
+            assert newWidth > self._width, (newWidth, self._width)
+        return self._get(op, (self,), newWidth,
+                         (self._base_dtype(), newWidth, self._signed), newWidth, self._signed)
+
+    def __repr__(self):
+        if self.op == "const":
+            return repr(self.evaluate())
+        elif self.op == "input":
+            return self.param[1]
+        args = [repr(o) for o in self.operands]
+        if self.param is not None:
+            args.append(repr(self.param))
+        return f"{self.op:s}({', '.join(args):s})"
+
+
+def lazy(v: Union[Bits3val, Bits3LazyNode]) -> Bits3LazyNode:
+    """
+    Convert value to lazy expression, operators on the result build an expression graph
+    which is evaluated only on :meth:`~.Bits3LazyNode.evaluate`, ``int()`` or :meth:`~.Bits3LazyNode._eq`
+    """
+    if isinstance(v, Bits3LazyNode):
+        return v
+    return Bits3LazyNode.from_val(v)
+
+
+def _kernel_add(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    m = mask(n._width)
+    # + - * results are the same for signed and unsigned after the cut off of the upper bits
+    return ((a._val + b._val) & m,
+            m if a._vld == m and b._vld == mask(b._width) else 0)
+
+
+def _kernel_sub(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    m = mask(n._width)
+    return ((a._val - b._val) & m,
+            m if a._vld == m and b._vld == mask(b._width) else 0)
+
+
+def _kernel_mul(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    m = mask(n._width)
+    return ((a._val * b._val) & m,
+            m if a._vld == m and b._vld == mask(b._width) else 0)
+
+
+def _kernel_and(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    vld = vld_mask_for_and_raw(a._val, a._vld, b._val, b._vld)
+    return (a._val & b._val & vld, vld)
+
+
+def _kernel_or(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    vld = vld_mask_for_or_raw(a._val, a._vld, b._val, b._vld)
+    return ((a._val | b._val) & vld, vld)
+
+
+def _kernel_xor(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    vld = vld_mask_for_xor_raw(a._val, a._vld, b._val, b._vld)
+    return ((a._val ^ b._val) & vld, vld)
+
+
+def _kernel_invert(n: Bits3LazyNode, a: Bits3LazyNode):
+    return (~a._val & mask(n._width), a._vld)
+
+
+def _kernel_neg(n: Bits3LazyNode, a: Bits3LazyNode):
+    return (-a._val & mask(n._width), a._vld)
+
+
+def _kernel_shl(n: Bits3LazyNode, a: Bits3LazyNode):
+    sh = n.param
+    if sh is None:
+        return (0, 0)
+    m = mask(n._width)
+    return ((a._val << sh) & m, ((a._vld << sh) | mask(sh)) & m)
+
+
+def _kernel_lshr(n: Bits3LazyNode, a: Bits3LazyNode):
+    sh = n.param
+    if sh is None:
+        return (0, 0)
+    w = n._width
+    if sh >= w:
+        return (0, mask(w))
+    vld = (a._vld >> sh) | bit_field(w - sh, w)
+    return ((a._val >> sh) & vld, vld)
+
+
+def _kernel_ashr(n: Bits3LazyNode, a: Bits3LazyNode):
+    sh = n.param
+    if sh is None:
+        return (0, 0)
+    w = n._width
+    if sh >= w:
+        return (0, mask(w))
+    val = a._val
+    newBitsMask = bit_field(w - sh, w)
+    vld = (a._vld >> sh) | newBitsMask
+    msb = val >> (w - 1)
+    val >>= sh
+    if msb:
+        val |= newBitsMask
+    return (val, vld)
+
+
+def _kernel_slice(n: Bits3LazyNode, a: Bits3LazyNode):
+    firstBitNo, size = n.param
+    if firstBitNo is None:
+        return (0, 0)
+    m = mask(size)
+    return ((a._val >> firstBitNo) & m, (a._vld >> firstBitNo) & m)
+
+
+def _kernel_concat(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    w = b._width
+    return ((a._val << w) | b._val, (a._vld << w) | b._vld)
+
+
+def _kernel_zext(n: Bits3LazyNode, a: Bits3LazyNode):
+    vld = a._vld | bit_field(a._width, n._width)
+    return (a._val & vld, vld)
+
+
+def _kernel_sext(n: Bits3LazyNode, a: Bits3LazyNode):
+    w = a._width
+    newBitsMask = bit_field(w, n._width)
+    val = a._val
+    if (val >> (w - 1)) & 1:
+        val |= newBitsMask
+    vld = a._vld
+    if (vld >> (w - 1)) & 1:
+        vld |= newBitsMask
+    return (val, vld)
+
+
+def _kernel_trunc(n: Bits3LazyNode, a: Bits3LazyNode):
+    m = mask(n._width)
+    return (a._val & m, a._vld & m)
+
+
+def _make_cmp_kernel(evalFn: Callable[[int, int], bool]):
+
+    def _kernel_cmp(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+        w = a._width
+        if a._vld & b._vld != mask(w):
+            return (0, 0)
+        v0 = a._val
+        v1 = b._val
+        if a._signed:
+            # signed comparison of unsigned representations
+            msb = 1 << (w - 1)
+            v0 ^= msb
+            v1 ^= msb
+        return (int(evalFn(v0, v1)), 1)
+
+    return _kernel_cmp
+
+
+def _kernel_eq(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    vld = a._vld & b._vld
+    ne = (a._val ^ b._val) & vld
+    full_vld = vld == mask(a._width)
+    # if some bits are invalid but from valid bits we already know that the value does not equal
+    # the result is valid 0
+    return (int(full_vld and not ne), int(full_vld or ne != 0))
+
+
+def _kernel_ne(n: Bits3LazyNode, a: Bits3LazyNode, b: Bits3LazyNode):
+    vld = a._vld & b._vld
+    res = int(((a._val ^ b._val) & vld) != 0)
+    return (res, int(vld == mask(a._width)) | res)
+
+
+_KERNELS: Dict[str, Callable[..., Tuple[int, int]]] = {
+    "add": _kernel_add,
+    "sub": _kernel_sub,
+    "mul": _kernel_mul,
+    "and": _kernel_and,
+    "or": _kernel_or,
+    "xor": _kernel_xor,
+    "invert": _kernel_invert,
+    "neg": _kernel_neg,
+    "shl": _kernel_shl,
+    "lshr": _kernel_lshr,
+    "ashr": _kernel_ashr,
+    "slice": _kernel_slice,
+    "concat": _kernel_concat,
+    "zext": _kernel_zext,
+    "sext": _kernel_sext,
+    "trunc": _kernel_trunc,
+    "lt": _make_cmp_kernel(lambda a, b: a < b),
+    "le": _make_cmp_kernel(lambda a, b: a <= b),
+    "gt": _make_cmp_kernel(lambda a, b: a > b),
+    "ge": _make_cmp_kernel(lambda a, b: a >= b),
+    "eq": _kernel_eq,
+    "ne": _kernel_ne,
+}
+
+
+def _evaluate(root: Bits3LazyNode):
+    """
+    Compute _val and _vld for all not yet evaluated nodes in expression
+
+    :note: not recursive to support deep expressions, each node is evaluated only once
+    """
+    if root._symbolic:
+        raise ValueError("Expression with symbolic inputs can not be evaluated", root)
+    stack = [root]
+    while stack:
+        n = stack[-1]
+        if n._vld is not None:
+            stack.pop()
+            continue
+        pending = [o for o in n.operands if o._vld is None]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        n._val, n._vld = _KERNELS[n.op](n, *n.operands)
@@ -24,3 +24,24 @@ def vld_mask_for_or(a, b) -> int:
 
 def vld_mask_for_xor(a, b) -> int:
     return a.vld_mask & b.vld_mask
+
+
+def vld_mask_for_and_raw(a_val: int, a_vld: int, b_val: int, b_vld: int) -> int:
+    """
+    :see: :func:`~.vld_mask_for_and`, operands are specified by val and vld_mask
+    """
+    return (a_vld & b_vld) | (a_vld & ~a_val) | (b_vld & ~b_val)
+
+
+def vld_mask_for_or_raw(a_val: int, a_vld: int, b_val: int, b_vld: int) -> int:
+    """
+    :see: :func:`~.vld_mask_for_or`, operands are specified by val and vld_mask
+    """
+    return (a_vld & b_vld) | (a_vld & a_val) | (b_vld & b_val)
+
+
+def vld_mask_for_xor_raw(a_val: int, a_vld: int, b_val: int, b_vld: int) -> int:
+    """
+    :see: :func:`~.vld_mask_for_xor`, operands are specified by val and vld_mask
+    """
+    return a_vld & b_vld
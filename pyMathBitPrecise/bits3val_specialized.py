@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Generator of :class:`~.Bits3val` subclasses specialized for a specific bit width and signedness.
+
+The operators of :class:`~.Bits3val` resolve the width, sign and masks of the type on each call.
+The specialized class has these values compiled in its source code
+and uses the generic implementation only as a fallback for operands of a different type
+(the results and exceptions are the same as for :class:`~.Bits3val`).
+
+:note: The + - * results are the same for signed and unsigned representation after the cut off of upper bits
+    and signed comparison of unsigned representations can be done by flipping the sign bit.
+    Because of this the specialized code does not have to convert values to signed form.
+:see: :meth:`pyMathBitPrecise.bits3t.Bits3t.enable_specialization`
+"""
+
+import linecache
+from typing import Dict, Tuple, Type
+
+from pyMathBitPrecise.bit_utils import mask
+from pyMathBitPrecise.bits3t import Bits3val
+
+# key: (base class, bit_length, signed), value: specialized class
+_SPECIALIZED_CLS_CACHE: Dict[Tuple[Type[Bits3val], int, bool], Type[Bits3val]] = {}
+
+_RESULT_TMPL = """\
+    t = self._dtype
+    pool = t._const_pool
+    if pool is not None:
+        return pool[(vld << {W}) | v]
+    res = _new(_cls)
+    res._dtype = t
+    res.val = v
+    res.vld_mask = vld
+    return res
+"""
+
+# operand resolution for binary operators, sets o_val, o_vld
+_OPERAND_TMPL = """\
+    if type(other) is _cls:
+        o_val = other.val
+        o_vld = other.vld_mask
+    elif type(other) is int and {LO} <= other <= {UP}:
+        o_val = other & {M}
+        o_vld = {M}
+    else:
+        return _base.{name}(self, other)
+"""
+
+_ARITH_TMPL = """\
+def {name}(self, other):
+    "Operator {op}."
+{OPERAND}\
+    v = (self.val {op} o_val) & {M}
+    if self.vld_mask == {M} and o_vld == {M}:
+        vld = {M}
+    else:
+        vld = 0
+{RESULT}"""
+
+_BITWISE_TMPL = """\
+def {name}(self, other):
+    "Operator {op}."
+{OPERAND}\
+    s_val = self.val
+    s_vld = self.vld_mask
+    vld = {VLD}
+    v = (s_val {op} o_val) & vld
+{RESULT}"""
+
+_BITWISE_VLD = {
+    "&": "(s_vld & o_vld) | (s_vld & ~s_val) | (o_vld & ~o_val)",
+    "|": "(s_vld & o_vld) | (s_vld & s_val) | (o_vld & o_val)",
+    "^": "s_vld & o_vld",
+}
+
+_CMP_TMPL = """\
+def {name}(self, other):
+    "Operator {op}."
+{OPERAND}\
+    if self.vld_mask & o_vld == {M}:
+        return _bool(int((self.val{SIGN_FLIP}) {op} (o_val{SIGN_FLIP})), 1)
+    else:
+        return _bool(0, 0)
+"""
+
+_EQ_TMPL = """\
+def {name}(self, other):
+    "Operator {op}."
+{OPERAND}\
+    vld = self.vld_mask & o_vld
+    ne = (self.val ^ o_val) & vld
+    if vld == {M}:
+        return _bool({RES_VLD}, 1)
+    elif ne:
+        # some bits invalid, but from valid bits we already know that the value does not equal
+        return _bool({RES_NE}, 1)
+    else:
+        return _bool(0, 0)
+"""
+
+_UNARY_TMPL = """\
+def {name}(self):
+    "Operator {op}x."
+    v = ({op}self.val) & {M}
+    vld = self.vld_mask
+{RESULT}"""
+
+
+# constructor of a value of base._BOOL type
+# (the const pool of the type may be enabled later, _from_py resolves it)
+_BOOL_CONSTRUCTOR_SRC = "def _bool(v, vld):\n    return _BOOL._from_py(v, vld)\n"
+
+
+def _gen_specialized_src(base: Type[Bits3val], bit_length: int, signed: bool) -> str:
+    """
+    Generate source code of operator functions for :func:`~.get_specialized_bits3val_cls`
+    """
+    w = bit_length
+    m = mask(w)
+    if signed:
+        lo = -(1 << (w - 1))
+        up = (1 << (w - 1)) - 1
+    else:
+        lo = 0
+        up = m
+    consts = {"W": w, "M": m, "LO": lo, "UP": up}
+    result = _RESULT_TMPL.format(**consts)
+
+    def operand(name: str):
+        return _OPERAND_TMPL.format(name=name, **consts)
+
+    src = [_BOOL_CONSTRUCTOR_SRC]
+    for name, op in [("__add__", "+"), ("__sub__", "-"), ("__mul__", "*")]:
+        src.append(_ARITH_TMPL.format(name=name, op=op, OPERAND=operand(name), RESULT=result, **consts))
+
+    for name, op in [("__and__", "&"), ("__or__", "|"), ("__xor__", "^")]:
+        src.append(_BITWISE_TMPL.format(name=name, op=op, VLD=_BITWISE_VLD[op],
+                                        OPERAND=operand(name), RESULT=result, **consts))
+
+    sign_flip = f" ^ {1 << (w - 1):d}" if signed else ""
+    for name, op in [("__lt__", "<"), ("__le__", "<="), ("__gt__", ">"), ("__ge__", ">=")]:
+        src.append(_CMP_TMPL.format(name=name, op=op, SIGN_FLIP=sign_flip,
+                                    OPERAND=operand(name), **consts))
+
+    src.append(_EQ_TMPL.format(name="_eq", op="==", RES_VLD="int(not ne)", RES_NE="0",
+                               OPERAND=operand("_eq"), **consts))
+    src.append(_EQ_TMPL.format(name="__ne__", op="!=", RES_VLD="int(ne != 0)", RES_NE="1",
+                               OPERAND=operand("__ne__"), **consts))
+
+    for name, op in [("__invert__", "~"), ("__neg__", "-")]:
+        src.append(_UNARY_TMPL.format(name=name, op=op, RESULT=result, **consts))
+
+    return "\n\n".join(src)
+
+
+_SPECIALIZED_OPERATORS = ("__add__", "__sub__", "__mul__",
+                          "__and__", "__or__", "__xor__",
+                          "__lt__", "__le__", "__gt__", "__ge__", "_eq", "__ne__",
+                          "__invert__", "__neg__")
+
+
+def _specialized_reduce(self):
+    # the class is generated and can not be found by pickle, the type will construct the value
+    return (self._dtype._from_py, (self.val, self.vld_mask))
+
+
+def get_specialized_bits3val_cls(bit_length: int, signed: bool, base: Type[Bits3val]=Bits3val) -> Type[Bits3val]:
+    """
+    Get (or generate) a subclass of base with operators specialized for the bit width and signedness.
+
+    :note: The class is cached and shared between all types of the same width and signedness.
+    :note: The generated source is registered in :mod:`linecache` so it is visible in tracebacks.
+    """
+    signed = bool(signed)
+    key = (base, bit_length, signed)
+    cls = _SPECIALIZED_CLS_CACHE.get(key, None)
+    if cls is not None:
+        return cls
+
+    src = _gen_specialized_src(base, bit_length, signed)
+    cls_name = f"{base.__name__:s}_{'i' if signed else 'u'}{bit_length:d}"
+    file_name = f"<{__name__:s} {cls_name:s}>"
+    linecache.cache[file_name] = (len(src), None, src.splitlines(True), file_name)
+
+    ns = {
+        "_base": base,
+        "_new": object.__new__,
+        "_BOOL": base._BOOL,
+    }
+    exec(compile(src, file_name, "exec"), ns)
+
+    cls_dict = {name: ns[name] for name in _SPECIALIZED_OPERATORS}
+    cls_dict["__slots__"] = ()
+    cls_dict["__module__"] = __name__
+    cls_dict["__reduce__"] = _specialized_reduce
+    cls_dict["_SPECIALIZED_SRC"] = src
+    cls = type(cls_name, (base,), cls_dict)
+    ns["_cls"] = cls
+
+    _SPECIALIZED_CLS_CACHE[key] = cls
+    return cls
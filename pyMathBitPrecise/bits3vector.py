@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from operator import le, ge, gt, lt, sub, add, floordiv, mod
+from typing import Union, Optional, Callable, Self, Sequence, List, Tuple
+
+import numpy as np
+
+from pyMathBitPrecise.bit_utils import mask, ValidityError, normalize_slice, \
+    bit_field
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+from pyMathBitPrecise.bits3t_batch import batch_xor, batch_and, batch_or, \
+    batch_invert, batch_cmp, batch_eq, batch_ne, batch_to_signed, \
+    batch_get_bit_range
+
+# maximum width of the item which fits into uint64 array
+BITS3VECTOR_MAX_WIDTH = 64
+
+
+class Bits3Vector():
+    """
+    Vector of values of the same :class:`~.Bits3t` type (up to 64 bits)
+    stored in two parallel uint64 numpy arrays.
+    Operators have the same semantic as operators of :class:`~.Bits3val`
+    and are applied on each item of the vector.
+
+    :ivar ~._dtype: type of items of this vector
+    :ivar ~.val: uint64 array, always unsigned representation of values
+    :ivar ~.vld_mask: uint64 array, if bit in mask is '0'
+            the corresponding bit in val is invalid
+    :note: the operand may be also a :class:`~.Bits3val` or an int,
+        in that case the same value is used for all items
+    :note: __getitem__ is a bit slicing the same as for :class:`~.Bits3val`,
+        use :meth:`~.to_values` to access individual items
+    """
+    __slots__ = ("_dtype", "val", "vld_mask")
+    _BOOL = Bits3val._BOOL
+    _SIGNED_FOR_SLICE_RESULT = Bits3val._SIGNED_FOR_SLICE_RESULT
+
+    def __init__(self, t: Bits3t, val: np.ndarray, vld_mask: np.ndarray):
+        _check_width(t)
+        if val.dtype != np.uint64:
+            raise TypeError(val.dtype)
+        if vld_mask.dtype != np.uint64:
+            raise TypeError(vld_mask.dtype)
+        self._dtype = t
+        self.val = val
+        self.vld_mask = vld_mask
+
+    @classmethod
+    def from_py(cls, t: Bits3t, val: Union[Sequence[Optional[int]], np.ndarray],
+                vld_mask: Union[Sequence[int], np.ndarray, None]=None) -> Self:
+        """
+        Construct vector from a sequence of pythonic values (same as :meth:`Bits3t.from_py` for each item)
+
+        :note: if val is numpy array of integers the range is checked for whole array at once
+        """
+        _check_width(t)
+        if isinstance(val, np.ndarray) and val.dtype.kind in "iu":
+            intMin, intMax = t.get_domain_range()
+            if val.size and (val.min() < intMin or val.max() > intMax):
+                raise ValueError("Value out of range of type", t)
+            m = np.uint64(t.all_mask())
+            _val = val.astype(np.uint64) & m
+            if vld_mask is None:
+                _vld = np.full(_val.shape, m, dtype=np.uint64)
+            else:
+                _vld = np.asarray(vld_mask, dtype=np.uint64)
+                if _vld.shape != _val.shape or (_vld > m).any():
+                    raise ValueError("Mask in incorrect format", t)
+                _val &= _vld
+            return cls(t, _val, _vld)
+
+        if vld_mask is None:
+            vld_mask = (None for _ in val)
+        vals = []
+        vlds = []
+        for v, m in zip(val, vld_mask):
+            v, m = t._normalize_val_and_mask(v, m)
+            vals.append(v)
+            vlds.append(m)
+        return cls(t, np.array(vals, dtype=np.uint64), np.array(vlds, dtype=np.uint64))
+
+    @classmethod
+    def from_values(cls, t: Bits3t, values: Sequence[Bits3val]) -> Self:
+        """
+        Construct vector from a sequence of values of type t
+        """
+        _check_width(t)
+        m = t.all_mask()
+        vals = []
+        vlds = []
+        for v in values:
+            if v._dtype != t:
+                raise TypeError("Value of a different type", v._dtype, t)
+            vals.append(v.val & m)
+            vlds.append(v.vld_mask)
+        return cls(t, np.array(vals, dtype=np.uint64), np.array(vlds, dtype=np.uint64))
+
+    def to_values(self) -> List[Bits3val]:
+        """
+        :return: list of :class:`~.Bits3val` for every item of this vector
+        """
+        t = self._dtype
+        return [t._from_py(v, m) for v, m in zip(self.val.tolist(), self.vld_mask.tolist())]
+
+    def to_py(self) -> List[int]:
+        """
+        :return: list of ints for every item of this vector
+        :raise ValidityError: if any item is not fully valid
+        """
+        if not self._is_full_valid().all():
+            raise ValidityError(self)
+        if self._dtype.signed:
+            return batch_to_signed(self.val, self._dtype.bit_length()).tolist()
+        else:
+            return self.val.tolist()
+
+    def __copy__(self) -> Self:
+        return self.__class__(self._dtype, self.val.copy(), self.vld_mask.copy())
+
+    def _is_full_valid(self) -> np.ndarray:
+        """
+        :return: bool array, True for items where all bits in value are valid
+        """
+        return self.vld_mask == np.uint64(self._dtype.all_mask())
+
+    def __getitem__(self, key: Union[int, slice, Bits3val]) -> Self:
+        "self[key], bit slicing for every item"
+        w = self._dtype.bit_length()
+        if isinstance(key, slice):
+            firstBitNo, size = normalize_slice(key, w)
+            val, vld = batch_get_bit_range(self.val, self.vld_mask, w, firstBitNo, size)
+        elif isinstance(key, (int, Bits3val)):
+            size = 1
+            try:
+                _i = int(key)
+            except ValidityError:
+                _i = None
+
+            if _i is None:
+                val = np.zeros_like(self.val)
+                vld = np.zeros_like(self.vld_mask)
+            else:
+                if _i < 0 or _i >= w:
+                    raise IndexError("Index out of range", _i)
+                sh = np.uint64(_i)
+                one = np.uint64(1)
+                val = (self.val >> sh) & one
+                vld = (self.vld_mask >> sh) & one
+        else:
+            raise TypeError(key)
+
+        new_t = self._dtype._createMutated(size, signed=self._SIGNED_FOR_SLICE_RESULT)
+        return self.__class__(new_t, val, vld)
+
+    def __invert__(self) -> Self:
+        "Operator ~x."
+        return self.__class__(self._dtype, *batch_invert(self.val, self.vld_mask, self._dtype.bit_length()))
+
+    def __neg__(self) -> Self:
+        "Operator -x."
+        m = np.uint64(self._dtype.all_mask())
+        return self.__class__(self._dtype, (~self.val + np.uint64(1)) & m, self.vld_mask.copy())
+
+    def _eq(self, other: Union[int, Bits3val, Self]) -> Self:
+        """
+        Operator self._eq(other) as self == other
+        """
+        return bits3vectorCmp__val_EQ(self, other)
+
+    def __ne__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator !=."
+        return bits3vectorCmp__val_NE(self, other)
+
+    def __lt__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator <."
+        return bits3vectorCmp__val(self, other, lt)
+
+    def __gt__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator >."
+        return bits3vectorCmp__val(self, other, gt)
+
+    def __ge__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator >=."
+        return bits3vectorCmp__val(self, other, ge)
+
+    def __le__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator <=."
+        return bits3vectorCmp__val(self, other, le)
+
+    def __xor__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator ^."
+        return bits3vectorBitOp__val(self, other, batch_xor)
+
+    def __rxor__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator ^."
+        return bits3vectorBitOp__val(self, other, batch_xor)
+
+    def __and__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator &."
+        return bits3vectorBitOp__val(self, other, batch_and)
+
+    def __rand__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator &."
+        return bits3vectorBitOp__val(self, other, batch_and)
+
+    def __or__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator |."
+        return bits3vectorBitOp__val(self, other, batch_or)
+
+    def __ror__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator |."
+        return bits3vectorBitOp__val(self, other, batch_or)
+
+    def __sub__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator -."
+        return bits3vectorArithOp__val(self, _operand(self, other), sub)
+
+    def __rsub__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator -."
+        return bits3vectorArithOp__val(_operand(self, other), self, sub)
+
+    def __add__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator +."
+        return bits3vectorArithOp__val(self, _operand(self, other), add)
+
+    def __radd__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator +."
+        return bits3vectorArithOp__val(_operand(self, other), self, add)
+
+    def __rshift__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator >>."
+        if self._dtype.signed:
+            return bits3vectorBitOp__ashr(self, other)
+        else:
+            return bits3vectorBitOp__lshr(self, other)
+
+    def __lshift__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator <<. (shifts in 0)"
+        try:
+            o = int(other)
+        except ValidityError:
+            o = None
+
+        v = self.__copy__()
+        if o is None:
+            v.val[:] = 0
+            v.vld_mask[:] = 0
+        elif o == 0:
+            return v
+        else:
+            if o < 0:
+                raise ValueError("negative shift count")
+            t = self._dtype
+            m = np.uint64(t.all_mask())
+            if o >= t.bit_length():
+                # all bits are shifted out
+                v.val[:] = 0
+                v.vld_mask[:] = m
+            else:
+                sh = np.uint64(o)
+                v.vld_mask <<= sh
+                v.vld_mask |= np.uint64(mask(o))
+                v.vld_mask &= m
+                v.val <<= sh
+                v.val &= m
+        return v
+
+    def __floordiv__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator //."
+        t = self._dtype
+        m = np.uint64(t.all_mask())
+        if isinstance(other, int):
+            # the same as for Bits3val the validity of the dividend is not checked for int divisor
+            v = _int_divisor_op(self, other, floordiv)
+            return self.__class__(t, v, np.full_like(self.vld_mask, m))
+
+        other = _operand(self, other)
+        w = t.bit_length()
+        vld = self._is_full_valid() & other._is_full_valid()
+        v1 = other.val
+        if (vld & (v1 == 0)).any():
+            raise ZeroDivisionError()
+        v1 = np.where(v1 == 0, np.uint64(1), v1)
+        v0 = self.val
+        if t.signed:
+            v0 = batch_to_signed(v0, w)
+            v1 = batch_to_signed(v1, w)
+        with np.errstate(over="ignore"):
+            v = (v0 // v1).astype(np.uint64) & m
+        return self.__class__(t, np.where(vld, v, np.uint64(0)), np.where(vld, m, np.uint64(0)))
+
+    def __mul__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator *."
+        t = self._dtype
+        m = np.uint64(t.all_mask())
+        if isinstance(other, int):
+            # the same as for Bits3val the int is not converted to type of this value,
+            # the result is cut to the width, the int can be cut the same
+            v1 = np.uint64(other & t.all_mask())
+            vld = self._is_full_valid()
+        elif isinstance(other, (Bits3val, Bits3Vector)):
+            other = _operand(self, other)
+            v1 = other.val
+            vld = self._is_full_valid() & other._is_full_valid()
+        else:
+            raise TypeError(other)
+
+        v = (self.val * v1) & m
+        return self.__class__(t, v, np.where(vld, m, np.uint64(0)))
+
+    def __mod__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator %."
+        t = self._dtype
+        w = t.bit_length()
+        m = np.uint64(t.all_mask())
+        if isinstance(other, int):
+            v = _int_divisor_op(self, other, mod)
+            return self.__class__(t, v, np.where(self._is_full_valid(), m, np.uint64(0)))
+
+        v0 = self.val
+        if t.signed:
+            v0 = batch_to_signed(v0, w)
+        if isinstance(other, (Bits3val, Bits3Vector)):
+            other = _operand(self, other)
+            vld = self._is_full_valid() & other._is_full_valid()
+            v1 = other.val
+            if (vld & (v1 == 0)).any():
+                raise ZeroDivisionError()
+            v1 = np.where(v1 == 0, np.uint64(1), v1)
+            if t.signed:
+                v1 = batch_to_signed(v1, w)
+        else:
+            raise TypeError(other)
+
+        v = (v0 % v1).astype(np.uint64) & m
+        return self.__class__(t, v, np.where(vld, m, np.uint64(0)))
+
+    def __repr__(self):
+        t = self._dtype
+        typeDescrChar = 'b' if t.signed is None else 'i' if t.signed else 'u'
+        items = []
+        for v in self.to_values():
+            if v._is_full_valid():
+                items.append(str(int(v)))
+            elif v.vld_mask == 0:
+                items.append("X")
+            else:
+                items.append(f"{v.val:d} mask {v.vld_mask:x}")
+        return f"<{self.__class__.__name__:s} {typeDescrChar:s}{t.bit_length():d} [{', '.join(items):s}]>"
+
+
+def _check_width(t: Bits3t):
+    if not isinstance(t, Bits3t):
+        raise TypeError(t)
+    if t.bit_length() > BITS3VECTOR_MAX_WIDTH:
+        raise ValueError("Type is too wide for Bits3Vector", t)
+
+
+def _operand(self: Bits3Vector, other: Union[int, Bits3val, Bits3Vector]) -> Bits3Vector:
+    """
+    Convert other operand of the operator to a Bits3Vector,
+    scalar values are stored as numpy scalars and are broadcasted to all items
+    """
+    if isinstance(other, Bits3Vector):
+        return other
+    elif isinstance(other, int):
+        # the same conversion as in Bits3val operators
+        t = self._dtype
+        o = Bits3Vector.__new__(Bits3Vector)
+        o._dtype = t
+        o.val = np.uint64(t._int_operand_to_val(other))
+        o.vld_mask = np.uint64(t.all_mask())
+        return o
+    elif not isinstance(other, Bits3val):
+        raise TypeError(other)
+    t = other._dtype
+    _check_width(t)
+    o = Bits3Vector.__new__(Bits3Vector)
+    o._dtype = t
+    o.val = np.uint64(other.val & t.all_mask())
+    o.vld_mask = np.uint64(other.vld_mask)
+    return o
+
+
+def _int_divisor_op(self: Bits3Vector, other: int, op: Callable[[object, object], object]) -> np.ndarray:
+    """
+    Apply operator // or % with int divisor the same as :class:`~.Bits3val` does
+    (the int is not converted to the type of the value, the result is cut to the width)
+
+    :return: unsigned representation of the result
+    """
+    if other == 0:
+        raise ZeroDivisionError()
+    t = self._dtype
+    w = t.bit_length()
+    m = np.uint64(t.all_mask())
+    v0 = self.val
+    if t.signed:
+        v0 = batch_to_signed(v0, w)
+        # -1 may overflow for the minimal int64
+        if -(1 << 63) <= other < (1 << 63) and other != -1:
+            return op(v0, np.int64(other)).astype(np.uint64) & m
+    elif 0 < other < (1 << 64):
+        return op(v0, np.uint64(other)) & m
+
+    # the divisor does not fit to numpy int type, compute on python ints
+    return (op(v0.astype(object), other) & int(m)).astype(np.uint64)
+
+
+def bits3vectorBitOp__lshr(self: Bits3Vector, shAmount: Union[Bits3val, int]) -> Bits3Vector:
+    """
+    logical shift right (shifts in 0)
+    """
+    t = self._dtype
+    width = t.bit_length()
+    try:
+        sh = int(shAmount)
+    except ValidityError:
+        return self.__class__(t, np.zeros_like(self.val), np.zeros_like(self.vld_mask))
+    assert sh >= 0, sh
+
+    m = np.uint64(t.all_mask())
+    if sh >= width:
+        # all bits are shifted out
+        return self.__class__(t, np.zeros_like(self.val), np.full_like(self.vld_mask, m))
+
+    _sh = np.uint64(sh)
+    vld = (self.vld_mask >> _sh) | np.uint64(bit_field(width - sh, width))
+    return self.__class__(t, (self.val >> _sh) & vld, vld)
+
+
+def bits3vectorBitOp__ashr(self: Bits3Vector, shAmount: Union[Bits3val, int]) -> Bits3Vector:
+    """
+    arithmetic shift right (shifts in MSB)
+    """
+    try:
+        sh = int(shAmount)
+    except ValidityError:
+        sh = None
+
+    v = self.__copy__()
+    if sh is None:
+        v.vld_mask[:] = 0
+        v.val[:] = 0
+    elif sh == 0:
+        pass
+    else:
+        if sh < 0:
+            raise ValueError("negative shift count")
+        w = self._dtype.bit_length()
+        if sh < w:
+            msb = (v.val >> np.uint64(w - 1)).astype(bool)
+            newBitsMask = np.uint64(bit_field(w - sh, w))
+            _sh = np.uint64(sh)
+            v.vld_mask >>= _sh
+            v.vld_mask |= newBitsMask  # set newly shifted-in bits to defined
+            v.val >>= _sh
+            v.val[msb] |= newBitsMask
+        else:
+            # completely shifted out
+            v.val[:] = 0
+            v.vld_mask[:] = np.uint64(mask(w))
+    return v
+
+
+def bits3vectorBitOp__val(self: Bits3Vector, other: Union[Bits3Vector, Bits3val, int],
+                          kernel: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+                          ) -> Bits3Vector:
+    """
+    Apply bitwise operator
+
+    :param kernel: batched operator from :mod:`pyMathBitPrecise.bits3t_batch` (e.g. :func:`~.batch_and`)
+    """
+    res_t = self._dtype
+    other = _operand(self, other)
+    w = res_t.bit_length()
+    assert w == other._dtype.bit_length(), (res_t, other._dtype)
+    return self.__class__(res_t, *kernel(self.val, self.vld_mask, other.val, other.vld_mask))
+
+
+def _cmp_operands(self: Bits3Vector, other: Union[Bits3Vector, Bits3val, int]) -> Bits3Vector:
+    t = self._dtype
+    if isinstance(other, int):
+        return _operand(self, other)
+    other = _operand(self, other)
+    ot = other._dtype
+    if bool(t.signed) != bool(ot.signed) or t.bit_length() != ot.bit_length():
+        raise TypeError("Value compare supports only same width and sign type", t, ot)
+    return other
+
+
+def bits3vectorCmp__val(self: Bits3Vector, other: Union[Bits3Vector, Bits3val, int],
+                        evalFn: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> Bits3Vector:
+    """
+    Apply comparative operator
+    """
+    t = self._dtype
+    other = _cmp_operands(self, other)
+    res, vld = batch_cmp(self.val, self.vld_mask, other.val, other.vld_mask, t.bit_length(), t.signed, evalFn)
+    return self.__class__(self._BOOL, res.astype(np.uint64), vld.astype(np.uint64))
+
+
+def bits3vectorCmp__val_NE(self: Bits3Vector, other: Union[Bits3Vector, Bits3val, int]) -> Bits3Vector:
+    """
+    Apply != operator
+    """
+    other = _cmp_operands(self, other)
+    res, vld = batch_ne(self.val, self.vld_mask, other.val, other.vld_mask, self._dtype.bit_length())
+    return self.__class__(self._BOOL, res.astype(np.uint64), vld.astype(np.uint64))
+
+
+def bits3vectorCmp__val_EQ(self: Bits3Vector, other: Union[Bits3Vector, Bits3val, int]) -> Bits3Vector:
+    """
+    Apply == operator
+    """
+    other = _cmp_operands(self, other)
+    res, vld = batch_eq(self.val, self.vld_mask, other.val, other.vld_mask, self._dtype.bit_length())
+    return self.__class__(self._BOOL, res.astype(np.uint64), vld.astype(np.uint64))
+
+
+def bits3vectorArithOp__val(self: Bits3Vector, other: Bits3Vector,
+                            evalFn: Callable[[np.ndarray, np.ndarray], np.ndarray]) -> Bits3Vector:
+    """
+    Apply arithmetic operator (+, -), overflow wraps the same as for :class:`~.Bits3val`
+    """
+    t = self._dtype
+    m = np.uint64(t.all_mask())
+    # uint64 arithmetic is modulo 2**64 and thus the lower bits are the same for signed and unsigned
+    v = evalFn(self.val, other.val) & m
+    vld = self._is_full_valid() & other._is_full_valid()
+    if not isinstance(v, np.ndarray):
+        # both operands were scalars
+        v = np.array(v, dtype=np.uint64)
+    return Bits3Vector(t, v, np.where(vld, m, np.uint64(0)))
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from typing import Union, Optional, Self, Sequence, List, Callable, Tuple
+
+import numpy as np
+
+from pyMathBitPrecise.bit_utils import ValidityError, normalize_slice, \
+    bit_field, to_signed, mask
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+from pyMathBitPrecise.bits3t_batch import batch_xor, batch_and, batch_or, \
+    batch_invert
+from pyMathBitPrecise.limb_utils import limb_cnt, ints_to_limbs, limbs_to_ints, \
+    limbs_mask, limbs_resize, limbs_shl, limbs_shr, limbs_get_bit, limbs_add, \
+    limbs_sub, limbs_all_eq, int_to_limbs
+
+
+class Bits3WideVector():
+    """
+    Vector of values of the same :class:`~.Bits3t` type of any width,
+    values and validity masks are stored in two uint64 numpy arrays of shape (N, K),
+    where N is number of values and K is number of 64b limbs (limb 0 is the least significant).
+    Operators have the same semantic as operators of :class:`~.Bits3val`
+    and are applied on each item of the vector.
+
+    :ivar ~._dtype: type of items of this vector
+    :ivar ~.val: uint64 array of limbs, always unsigned representation of values
+    :ivar ~.vld_mask: uint64 array of limbs, if bit in mask is '0'
+            the corresponding bit in val is invalid
+    :note: the operand may be also a :class:`~.Bits3val` or an int,
+        in that case the same value is used for all items
+    :note: __getitem__ is a bit slicing the same as for :class:`~.Bits3val`,
+        use :meth:`~.to_values` to access individual items
+    """
+    __slots__ = ("_dtype", "val", "vld_mask")
+    _SIGNED_FOR_SLICE_RESULT = Bits3val._SIGNED_FOR_SLICE_RESULT
+    _SIGNED_FOR_CONCAT_RESULT = Bits3val._SIGNED_FOR_CONCAT_RESULT
+
+    def __init__(self, t: Bits3t, val: np.ndarray, vld_mask: np.ndarray):
+        if not isinstance(t, Bits3t):
+            raise TypeError(t)
+        K = limb_cnt(t.bit_length())
+        if val.dtype != np.uint64 or val.ndim != 2 or val.shape[1] != K:
+            raise TypeError(val.dtype, val.shape)
+        if vld_mask.dtype != np.uint64 or vld_mask.shape != val.shape:
+            raise TypeError(vld_mask.dtype, vld_mask.shape)
+        self._dtype = t
+        self.val = val
+        self.vld_mask = vld_mask
+
+    @classmethod
+    def from_py(cls, t: Bits3t, val: Sequence[Optional[int]],
+                vld_mask: Optional[Sequence[int]]=None) -> Self:
+        """
+        Construct vector from a sequence of pythonic values (same as :meth:`Bits3t.from_py` for each item)
+        """
+        if vld_mask is None:
+            vld_mask = (None for _ in val)
+        vals = []
+        vlds = []
+        for v, m in zip(val, vld_mask):
+            v, m = t._normalize_val_and_mask(v, m)
+            vals.append(v)
+            vlds.append(m)
+        K = limb_cnt(t.bit_length())
+        return cls(t, ints_to_limbs(vals, K), ints_to_limbs(vlds, K))
+
+    @classmethod
+    def from_values(cls, t: Bits3t, values: Sequence[Bits3val]) -> Self:
+        """
+        Construct vector from a sequence of values of type t
+        """
+        m = t.all_mask()
+        vals = []
+        vlds = []
+        for v in values:
+            if v._dtype != t:
+                raise TypeError("Value of a different type", v._dtype, t)
+            vals.append(v.val & m)
+            vlds.append(v.vld_mask)
+        K = limb_cnt(t.bit_length())
+        return cls(t, ints_to_limbs(vals, K), ints_to_limbs(vlds, K))
+
+    def to_values(self) -> List[Bits3val]:
+        """
+        :return: list of :class:`~.Bits3val` for every item of this vector
+        """
+        t = self._dtype
+        return [t._from_py(v, m) for v, m in zip(limbs_to_ints(self.val), limbs_to_ints(self.vld_mask))]
+
+    def to_py(self) -> List[int]:
+        """
+        :return: list of ints for every item of this vector
+        :raise ValidityError: if any item is not fully valid
+        """
+        if not self._is_full_valid().all():
+            raise ValidityError(self)
+        t = self._dtype
+        vals = limbs_to_ints(self.val)
+        if t.signed:
+            w = t.bit_length()
+            return [to_signed(v, w) for v in vals]
+        else:
+            return vals
+
+    def __copy__(self) -> Self:
+        return self.__class__(self._dtype, self.val.copy(), self.vld_mask.copy())
+
+    def _is_full_valid(self) -> np.ndarray:
+        """
+        :return: bool array, True for items where all bits in value are valid
+        """
+        return limbs_all_eq(self.vld_mask, limbs_mask(self._dtype.bit_length()))
+
+    def _concat(self, other: Union[Bits3val, Self]) -> Self:
+        """
+        Concatenate two bit vectors together (self will be at MSB side)
+        """
+        other = _operand(self, other)
+        other_w = other._dtype.bit_length()
+        resWidth = self._dtype.bit_length() + other_w
+        resT = self._dtype.__class__._get(resWidth, signed=self._SIGNED_FOR_CONCAT_RESULT)
+        K = limb_cnt(resWidth)
+        val = limbs_shl(limbs_resize(self.val, K), other_w) | limbs_resize(other.val, K)
+        vld = limbs_shl(limbs_resize(self.vld_mask, K), other_w) | limbs_resize(other.vld_mask, K)
+        return self.__class__(resT, val, vld)
+
+    def __getitem__(self, key: Union[int, slice, Bits3val]) -> Self:
+        "self[key], bit slicing for every item"
+        w = self._dtype.bit_length()
+        if isinstance(key, slice):
+            firstBitNo, size = normalize_slice(key, w)
+            K = limb_cnt(size)
+            m = limbs_mask(size)
+            val = limbs_resize(limbs_shr(self.val, firstBitNo), K) & m
+            vld = limbs_resize(limbs_shr(self.vld_mask, firstBitNo), K) & m
+        elif isinstance(key, (int, Bits3val)):
+            size = 1
+            try:
+                _i = int(key)
+            except ValidityError:
+                _i = None
+
+            N = self.val.shape[0]
+            if _i is None:
+                val = np.zeros((N, 1), dtype=np.uint64)
+                vld = np.zeros((N, 1), dtype=np.uint64)
+            else:
+                if _i < 0 or _i >= w:
+                    raise IndexError("Index out of range", _i)
+                val = limbs_get_bit(self.val, _i).reshape(N, 1)
+                vld = limbs_get_bit(self.vld_mask, _i).reshape(N, 1)
+        else:
+            raise TypeError(key)
+
+        new_t = self._dtype._createMutated(size, signed=self._SIGNED_FOR_SLICE_RESULT)
+        return self.__class__(new_t, val, vld)
+
+    def __invert__(self) -> Self:
+        "Operator ~x."
+        return self.__class__(self._dtype, *batch_invert(self.val, self.vld_mask, self._dtype.bit_length()))
+
+    def __neg__(self) -> Self:
+        "Operator -x."
+        m = limbs_mask(self._dtype.bit_length())
+        v, _ = limbs_sub(np.zeros_like(self.val), self.val)
+        return self.__class__(self._dtype, v & m, self.vld_mask.copy())
+
+    def __xor__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator ^."
+        return bits3wideVectorBitOp__val(self, other, batch_xor)
+
+    def __rxor__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator ^."
+        return bits3wideVectorBitOp__val(self, other, batch_xor)
+
+    def __and__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator &."
+        return bits3wideVectorBitOp__val(self, other, batch_and)
+
+    def __rand__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator &."
+        return bits3wideVectorBitOp__val(self, other, batch_and)
+
+    def __or__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator |."
+        return bits3wideVectorBitOp__val(self, other, batch_or)
+
+    def __ror__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator |."
+        return bits3wideVectorBitOp__val(self, other, batch_or)
+
+    def __sub__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator -."
+        other = _operand(self, other)
+        v, _ = limbs_sub(self.val, other.val)
+        return bits3wideVectorArithOp__val(self, other, v)
+
+    def __rsub__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator -."
+        other = _operand(self, other)
+        v, _ = limbs_sub(other.val, self.val)
+        return bits3wideVectorArithOp__val(self, other, v)
+
+    def __add__(self, other: Union[int, Bits3val, Self]) -> Self:
+        "Operator +."
+        other = _operand(self, other)
+        v, _ = limbs_add(self.val, other.val)
+        return bits3wideVectorArithOp__val(self, other, v)
+
+    def __radd__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator +."
+        return self.__add__(other)
+
+    def __rshift__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator >>."
+        if self._dtype.signed:
+            return bits3wideVectorBitOp__ashr(self, other)
+        else:
+            return bits3wideVectorBitOp__lshr(self, other)
+
+    def __lshift__(self, other: Union[int, Bits3val]) -> Self:
+        "Operator <<. (shifts in 0)"
+        try:
+            o = int(other)
+        except ValidityError:
+            o = None
+
+        v = self.__copy__()
+        if o is None:
+            v.val[:] = 0
+            v.vld_mask[:] = 0
+        elif o == 0:
+            return v
+        else:
+            if o < 0:
+                raise ValueError("negative shift count")
+            w = self._dtype.bit_length()
+            m = limbs_mask(w)
+            v.vld_mask = limbs_shl(v.vld_mask, o)
+            v.vld_mask |= int_to_limbs(mask(min(o, w)), v.val.shape[1])
+            v.vld_mask &= m
+            v.val = limbs_shl(v.val, o) & m
+        return v
+
+    def __repr__(self):
+        t = self._dtype
+        typeDescrChar = 'b' if t.signed is None else 'i' if t.signed else 'u'
+        items = []
+        for v in self.to_values():
+            if v._is_full_valid():
+                items.append(str(int(v)))
+            elif v.vld_mask == 0:
+                items.append("X")
+            else:
+                items.append(f"{v.val:d} mask {v.vld_mask:x}")
+        return f"<{self.__class__.__name__:s} {typeDescrChar:s}{t.bit_length():d} [{', '.join(items):s}]>"
+
+
+def _operand(self: Bits3WideVector, other: Union[int, Bits3val, Bits3WideVector]) -> Bits3WideVector:
+    """
+    Convert other operand of the operator to a Bits3WideVector,
+    scalar values are stored as 1D array of limbs and are broadcasted to all items
+    """
+    if isinstance(other, Bits3WideVector):
+        return other
+    elif isinstance(other, int):
+        other = self._dtype.from_py(other)
+    elif not isinstance(other, Bits3val):
+        raise TypeError(other)
+    t = other._dtype
+    K = limb_cnt(t.bit_length())
+    o = Bits3WideVector.__new__(Bits3WideVector)
+    o._dtype = t
+    o.val = int_to_limbs(other.val & t.all_mask(), K)
+    o.vld_mask = int_to_limbs(other.vld_mask, K)
+    return o
+
+
+def bits3wideVectorBitOp__lshr(self: Bits3WideVector, shAmount: Union[Bits3val, int]) -> Bits3WideVector:
+    """
+    logical shift right (shifts in 0)
+    """
+    t = self._dtype
+    width = t.bit_length()
+    try:
+        sh = int(shAmount)
+    except ValidityError:
+        return self.__class__(t, np.zeros_like(self.val), np.zeros_like(self.vld_mask))
+    assert sh >= 0, sh
+
+    if sh >= width:
+        # all bits are shifted out
+        return self.__class__(t, np.zeros_like(self.val),
+                              np.broadcast_to(limbs_mask(width), self.vld_mask.shape).copy())
+
+    vld = limbs_shr(self.vld_mask, sh) | int_to_limbs(bit_field(width - sh, width), self.val.shape[1])
+    return self.__class__(t, limbs_shr(self.val, sh) & vld, vld)
+
+
+def bits3wideVectorBitOp__ashr(self: Bits3WideVector, shAmount: Union[Bits3val, int]) -> Bits3WideVector:
+    """
+    arithmetic shift right (shifts in MSB)
+    """
+    try:
+        sh = int(shAmount)
+    except ValidityError:
+        sh = None
+
+    v = self.__copy__()
+    if sh is None:
+        v.vld_mask[:] = 0
+        v.val[:] = 0
+    elif sh == 0:
+        pass
+    else:
+        if sh < 0:
+            raise ValueError("negative shift count")
+        w = self._dtype.bit_length()
+        if sh < w:
+            msb = limbs_get_bit(v.val, w - 1).astype(bool)
+            newBitsMask = int_to_limbs(bit_field(w - sh, w), v.val.shape[1])
+            v.vld_mask = limbs_shr(v.vld_mask, sh)
+            v.vld_mask |= newBitsMask  # set newly shifted-in bits to defined
+            v.val = limbs_shr(v.val, sh)
+            v.val[msb] |= newBitsMask
+        else:
+            # completely shifted out
+            v.val[:] = 0
+            v.vld_mask[:] = limbs_mask(w)
+    return v
+
+
+def bits3wideVectorBitOp__val(self: Bits3WideVector, other: Union[Bits3WideVector, Bits3val, int],
+                              kernel: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+                              ) -> Bits3WideVector:
+    """
+    Apply bitwise operator
+
+    :param kernel: batched operator from :mod:`pyMathBitPrecise.bits3t_batch` (e.g. :func:`~.batch_and`)
+    """
+    res_t = self._dtype
+    other = _operand(self, other)
+    assert res_t.bit_length() == other._dtype.bit_length(), (res_t, other._dtype)
+    return self.__class__(res_t, *kernel(self.val, self.vld_mask, other.val, other.vld_mask))
+
+
+def bits3wideVectorArithOp__val(self: Bits3WideVector, other: Bits3WideVector, v: np.ndarray) -> Bits3WideVector:
+    """
+    Construct result of arithmetic operator, v is the result value without the cut off of the upper bits
+    """
+    t = self._dtype
+    m = limbs_mask(t.bit_length())
+    vld = self._is_full_valid() & other._is_full_valid()
+    vld = np.where(vld[..., None], m, np.uint64(0))
+    return Bits3WideVector(t, v & m, vld)
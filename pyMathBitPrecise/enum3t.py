@@ -5,6 +5,7 @@ from pyMathBitPrecise.bits3t import Bits3val
 
 
 class Enum3val():
+    __slots__ = ("_dtype", "val", "vld_mask")
 
     def __init__(self, t, val, vld_mask):
         self._dtype = t
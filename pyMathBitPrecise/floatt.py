@@ -136,6 +136,7 @@ class FloattVal():
     :ivar ~.vld_mask: always unsigned value of the mask, if bit in mask is '0'
             the corresponding bit in val is invalid
     """
+    __slots__ = ("_dtype", "val", "vld_mask")
     _BOOL = Bits3t(1)
 
     def __init__(self, t: Floatt, val: Tuple[int, int, int], vld_mask: int):
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+"""
+Utils for wide integers stored in numpy arrays as sequence of 64b limbs.
+
+The limbs are stored in the last dimension of the array, the limb 0 is the least significant one.
+For example array of shape (N, K) holds N values of K * 64 bits.
+"""
+
+from typing import Sequence, List, Tuple
+
+import numpy as np
+
+from pyMathBitPrecise.bit_utils import mask
+
+LIMB_WIDTH = 64
+_LIMB_BYTES = LIMB_WIDTH // 8
+
+
+def limb_cnt(width: int) -> int:
+    """
+    :return: number of limbs required for value of specified width
+    """
+    return (width + LIMB_WIDTH - 1) // LIMB_WIDTH
+
+
+def int_to_limbs(v: int, K: int) -> np.ndarray:
+    """
+    Convert unsigned int to array of K limbs
+    """
+    return np.frombuffer(v.to_bytes(K * _LIMB_BYTES, "little"), dtype="<u8").astype(np.uint64)
+
+
+def ints_to_limbs(values: Sequence[int], K: int) -> np.ndarray:
+    """
+    Convert sequence of unsigned ints to array of shape (len(values), K)
+    """
+    n = K * _LIMB_BYTES
+    buff = b"".join(v.to_bytes(n, "little") for v in values)
+    return np.frombuffer(buff, dtype="<u8").astype(np.uint64).reshape(len(values), K)
+
+
+def limbs_to_ints(a: np.ndarray) -> List[int]:
+    """
+    Convert array of shape (N, K) to list of N unsigned ints
+    """
+    N, K = a.shape
+    n = K * _LIMB_BYTES
+    buff = a.astype("<u8", copy=False).tobytes()
+    return [int.from_bytes(buff[i * n:(i + 1) * n], "little") for i in range(N)]
+
+
+def limbs_mask(width: int) -> np.ndarray:
+    """
+    :return: limbs of :func:`pyMathBitPrecise.bit_utils.mask` of specified width
+    """
+    return int_to_limbs(mask(width), limb_cnt(width))
+
+
+def limbs_resize(a: np.ndarray, K: int) -> np.ndarray:
+    """
+    Cut off upper limbs or add zero limbs to have K limbs
+    """
+    _K = a.shape[-1]
+    if _K == K:
+        return a
+    elif _K > K:
+        return a[..., :K]
+    else:
+        res = np.zeros(a.shape[:-1] + (K,), dtype=np.uint64)
+        res[..., :_K] = a
+        return res
+
+
+def limbs_shl(a: np.ndarray, sh: int) -> np.ndarray:
+    """
+    Shift left, the bits shifted out of the last limb are lost
+    """
+    K = a.shape[-1]
+    res = np.zeros_like(a)
+    q, r = divmod(sh, LIMB_WIDTH)
+    if q >= K:
+        return res
+    src = a[..., :K - q]
+    if r == 0:
+        res[..., q:] = src
+    else:
+        res[..., q:] = src << np.uint64(r)
+        res[..., q + 1:] |= src[..., :-1] >> np.uint64(LIMB_WIDTH - r)
+    return res
+
+
+def limbs_shr(a: np.ndarray, sh: int) -> np.ndarray:
+    """
+    Logical shift right
+    """
+    K = a.shape[-1]
+    res = np.zeros_like(a)
+    q, r = divmod(sh, LIMB_WIDTH)
+    if q >= K:
+        return res
+    src = a[..., q:]
+    if r == 0:
+        res[..., :K - q] = src
+    else:
+        res[..., :K - q] = src >> np.uint64(r)
+        res[..., :K - q - 1] |= src[..., 1:] << np.uint64(LIMB_WIDTH - r)
+    return res
+
+
+def limbs_get_bit(a: np.ndarray, bitNo: int) -> np.ndarray:
+    """
+    :return: array of 0/1 (uint64) with the specified bit from each value
+    """
+    q, r = divmod(bitNo, LIMB_WIDTH)
+    return (a[..., q] >> np.uint64(r)) & np.uint64(1)
+
+
+def limbs_add(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Add with carry propagation between limbs
+
+    :return: tuple (sum, carry out of the last limb)
+    """
+    res = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.uint64)
+    carry = np.zeros(res.shape[:-1], dtype=np.uint64)
+    for k in range(res.shape[-1]):
+        _a = a[..., k]
+        s = _a + b[..., k]
+        c0 = s < _a
+        s2 = s + carry
+        c1 = s2 < s
+        res[..., k] = s2
+        carry = (c0 | c1).astype(np.uint64)
+    return res, carry
+
+
+def limbs_sub(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Subtract with borrow propagation between limbs
+
+    :return: tuple (difference, borrow out of the last limb)
+    """
+    res = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.uint64)
+    borrow = np.zeros(res.shape[:-1], dtype=np.uint64)
+    for k in range(res.shape[-1]):
+        _a = a[..., k]
+        _b = b[..., k]
+        d = _a - _b
+        b0 = _a < _b
+        d2 = d - borrow
+        b1 = d < borrow
+        res[..., k] = d2
+        borrow = (b0 | b1).astype(np.uint64)
+    return res, borrow
+
+
+def limbs_all_eq(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    :return: bool array, True if all limbs of value are equal
+    """
+    return (a == b).all(axis=-1)
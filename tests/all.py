@@ -3,13 +3,23 @@
 
 import unittest
 
+from tests.array3t_mmap_test import Array3tMmapTC
+from tests.array3t_packed_test import Array3tPackedTC
+from tests.array3t_paged_test import Array3tPagedTC
 from tests.array3t_test import Array3tTC
 from tests.bit_utils_test import BitUtilsTC
+from tests.bits2t_test import Bits2tTC
 from tests.bits3tArithmetic_test import Bits3tArithmeticTC
 from tests.bits3tBasic_test import Bits3tBasicTC
 from tests.bits3tBitwise_test import Bits3tBitwiseTC
 from tests.bits3tCmp_test import Bits3tCmpTC
 from tests.bits3tSlicing_test import BitsSlicingTC
+from tests.bits3t_batch_test import Bits3tBatchTC
+from tests.bits3t_compile_test import Bits3tCompileTC
+from tests.bits3t_lazy_test import Bits3tLazyTC
+from tests.bits3val_specialized_test import Bits3valSpecializedTC
+from tests.bits3vector_test import Bits3VectorTC
+from tests.bits3vector_wide_test import Bits3WideVectorTC
 from tests.enum3t_test import Enum3tTC
 from tests.floatt_test import FloattTC
 
@@ -20,7 +30,17 @@ _ALL_TCs = [
     Bits3tArithmeticTC,
     Bits3tCmpTC,
     BitsSlicingTC,
+    Bits2tTC,
+    Bits3tLazyTC,
+    Bits3tCompileTC,
+    Bits3valSpecializedTC,
+    Bits3tBatchTC,
+    Bits3VectorTC,
+    Bits3WideVectorTC,
     Array3tTC,
+    Array3tPackedTC,
+    Array3tPagedTC,
+    Array3tMmapTC,
     Enum3tTC,
     FloattTC,
 ]
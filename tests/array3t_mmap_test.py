@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from copy import copy
+import os
+from random import Random
+from tempfile import TemporaryDirectory
+import unittest
+
+from pyMathBitPrecise.array3t import Array3t, ARRAY3T_STORAGE_MMAP, \
+    ARRAY3T_STORAGE_PACKED
+from pyMathBitPrecise.array3t_mmap import Array3valMmap, write_array3_mmap_image
+from pyMathBitPrecise.array3t_packed import Array3valPacked
+from pyMathBitPrecise.bits3t import Bits3t
+from tests.bits3tBaseTC import TYPES, random_values
+
+
+class Array3tMmapTC(unittest.TestCase):
+
+    def test_same_as_packed(self):
+        rand = Random(0)
+        with TemporaryDirectory() as d:
+            for ti, element_t in enumerate(TYPES):
+                values = random_values(rand, element_t, 40)
+                v_packed = Array3t(element_t, 40, storage=ARRAY3T_STORAGE_PACKED).from_py(None)
+                for i, x in enumerate(values):
+                    v_packed[i] = x
+                path = os.path.join(d, f"{ti:d}.bin")
+                t = write_array3_mmap_image(path, element_t, v_packed.val, v_packed.vld_mask, chunk_size=7)
+                self.assertEqual(t.size, 40)
+                self.assertEqual(t.storage, ARRAY3T_STORAGE_MMAP)
+                with Array3valMmap.open(path, element_t=element_t) as v:
+                    self.assertEqual(bytes(v.val), bytes(v_packed.val))
+                    self.assertEqual(bytes(v.vld_mask), bytes(v_packed.vld_mask))
+                    for x, y in zip(v, v_packed):
+                        self.assertIs(x._dtype, y._dtype)
+                        self.assertEqual((x.val, x.vld_mask), (y.val, y.vld_mask))
+
+    def test_open(self):
+        element_t = Bits3t(12)
+        with TemporaryDirectory() as d:
+            val_path = os.path.join(d, "val.bin")
+            with open(val_path, "wb") as f:
+                f.write(b"".join(i.to_bytes(2, "little") for i in range(1000)))
+            path = os.path.join(d, "img.bin")
+            write_array3_mmap_image(path, element_t, val_path, b"\xff\x0f" * 999 + b"\x00\x00", chunk_size=64)
+
+            with Array3valMmap.open(path) as v:
+                self.assertEqual(v._dtype.element_t, element_t)
+                self.assertEqual(len(v), 1000)
+                self.assertEqual(v.to_py(), list(range(999)) + [None])
+                v[999] = 0xabc
+                v[0] += 1
+                val, vld = v.plane_views(998, 2)
+                self.assertEqual(bytes(val), b"\xe6\x03\xbc\x0a")
+                self.assertEqual(bytes(vld), b"\xff\x0f\xff\x0f")
+                val.release()
+                vld.release()
+                v2 = copy(v)
+                self.assertIsInstance(v2, Array3valPacked)
+                v2[0] = 0
+
+            with Array3valMmap.open(path, writable=False) as v:
+                self.assertEqual(int(v[999]), 0xabc)
+                self.assertEqual(int(v[0]), 1)
+                with self.assertRaises(TypeError):
+                    v[0] = 2
+
+            with self.assertRaises(TypeError):
+                Array3valMmap.open(path, element_t=Bits3t(12, signed=True))
+
+            with self.assertRaises(ValueError):
+                write_array3_mmap_image(path, element_t, b"\x00\x10")
+            with self.assertRaises(ValueError):
+                write_array3_mmap_image(path, element_t, b"\x00\x00", b"\x00\x10")
+            with self.assertRaises(ValueError):
+                write_array3_mmap_image(path, element_t, b"\x00")
+            with self.assertRaises(ValueError):
+                write_array3_mmap_image(path, element_t, b"\x00\x00", b"")
+
+            with open(path, "wb") as f:
+                f.write(b"\x00" * 128)
+            with self.assertRaises(ValueError):
+                Array3valMmap.open(path)
+
+    def test_from_py(self):
+        t = Array3t(Bits3t(8, signed=True), 4, storage=ARRAY3T_STORAGE_MMAP)
+        v = t.from_py([1, -2, None, 3])
+        self.assertIsInstance(v, Array3valMmap)
+        self.assertEqual(v.to_py(), [1, -2, None, 3])
+        v[2] = -1
+        self.assertEqual(v.to_py(), [1, -2, -1, 3])
+        v.close()
+        v.close()
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Array3tMmapTC("test_open")])
+    suite = testLoader.loadTestsFromTestCase(Array3tMmapTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
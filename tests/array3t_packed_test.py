@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from copy import copy
+from random import Random
+import unittest
+
+from pyMathBitPrecise.array3t import Array3t, ARRAY3T_STORAGE_PACKED
+from pyMathBitPrecise.array3t_packed import Array3valPacked
+from pyMathBitPrecise.bit_utils import ValidityError
+from pyMathBitPrecise.bits2t import Bits2t
+from pyMathBitPrecise.bits3t import Bits3t
+from pyMathBitPrecise.floatt import Floatt
+from tests.bits3tBaseTC import TYPES, random_values
+
+
+class Array3tPackedTC(unittest.TestCase):
+
+    def assertItemsSame(self, a, b):
+        self.assertEqual(len(a), len(b))
+        for x, y in zip(a, b):
+            self.assertIs(x._dtype, y._dtype)
+            self.assertEqual((x.val, x.vld_mask), (y.val, y.vld_mask))
+
+    def test_same_as_dict(self):
+        rand = Random(0)
+        for element_t in TYPES:
+            values = random_values(rand, element_t, 16)
+            t_dict = element_t[16]
+            t = Array3t(element_t, 16, storage=ARRAY3T_STORAGE_PACKED)
+            self.assertEqual(t, t_dict)
+            v_dict = t_dict.from_py(None)
+            v = t.from_py(None)
+            self.assertIsInstance(v, Array3valPacked)
+            self.assertItemsSame(v, v_dict)
+
+            for i, x in enumerate(values):
+                v[i] = x
+                v_dict[i] = x
+            self.assertItemsSame(v, v_dict)
+            for i, x in enumerate(reversed(values)):
+                v[i] = x
+                v_dict[i] = x
+            self.assertItemsSame(v, v_dict)
+
+            py_values = [int(x) if x._is_full_valid() else None
+                         for x in values if x._is_full_valid() or not x.vld_mask]
+            t = Array3t(element_t, len(py_values), storage=ARRAY3T_STORAGE_PACKED)
+            v = t.from_py(py_values)
+            self.assertEqual(v.to_py(), py_values)
+            self.assertEqual(element_t[len(py_values)].from_py(py_values).to_py(), py_values)
+
+    def test_from_py(self):
+        element_t = Bits3t(8, signed=True)
+        t = Array3t(element_t, 4, storage=ARRAY3T_STORAGE_PACKED)
+        v = t.from_py([1, -2, 3, -128])
+        self.assertEqual(v.val, bytearray(b"\x01\xfe\x03\x80"))
+        self.assertEqual(v.vld_mask, bytearray(b"\xff" * 4))
+        self.assertEqual(v.to_py(), [1, -2, 3, -128])
+
+        v = t.from_py({1: -1, 3: "0b0x0x0x0x"})
+        self.assertEqual([v[0].vld_mask, int(v[1]), v[2].vld_mask], [0, -1, 0])
+        self.assertEqual(v[3].vld_mask, 0xaa)
+        with self.assertRaises(ValidityError):
+            v.to_py()
+        self.assertEqual(t.from_py([1, 2], vld_mask=0).to_py(), [None] * 4)
+        self.assertEqual(t.from_py(None).to_py(), [None] * 4)
+        self.assertEqual(t.from_py([1, 2]).to_py(), [1, 2, None, None])
+
+        for val in ([128, 0, 0, 0], [0, 0, 0, 0, 0], {4: 0}, {-1: 0}):
+            with self.assertRaises(ValueError):
+                t.from_py(val)
+
+        # raw planes
+        v = t.from_py(b"\x01\x02\x03\x04", vld_mask=b"\xff\x0f\x00\xff")
+        self.assertEqual(v.val, bytearray(b"\x01\x02\x00\x04"))
+        self.assertEqual(v[1].vld_mask, 0x0f)
+        with self.assertRaises(ValueError):
+            t.from_py(b"\x00")
+
+        t = Array3t(Bits3t(12), 2, storage=ARRAY3T_STORAGE_PACKED)
+        v = t.from_py(b"\xff\x0f\x00\x01")
+        self.assertEqual(v.to_py(), [0xfff, 0x100])
+        with self.assertRaises(ValueError):
+            t.from_py(b"\xff\x1f\x00\x01")
+        with self.assertRaises(ValueError):
+            t.from_py(b"\xff\x0f\x00\x01", b"\xff\x1f\x00\x01")
+
+        with self.assertRaises(TypeError):
+            Array3t(Floatt(11, 52), 4, storage=ARRAY3T_STORAGE_PACKED)
+        with self.assertRaises(ValueError):
+            Array3t(element_t, 4, storage="unknown")
+
+    def test_items(self):
+        element_t = Bits3t(12)
+        t = Array3t(element_t, 3, storage=ARRAY3T_STORAGE_PACKED)
+        v = t.from_py(None)
+        v[0] = 1
+        v[1] = element_t.from_py(0xabc)
+        v[1] += 1
+        self.assertEqual(v.to_py(), [1, 0xabd, None])
+        self.assertIs(v[0].vld_mask, element_t._all_mask)
+        with self.assertRaises(IndexError):
+            v[3]
+        with self.assertRaises(IndexError):
+            v[-1] = 0
+        self.assertEqual(len(list(v)), 3)
+
+        v2 = copy(v)
+        v2[0] = 2
+        self.assertEqual(v.to_py(), [1, 0xabd, None])
+        self.assertEqual(v2.to_py(), [2, 0xabd, None])
+
+        # write to unknown index invalidates everything
+        v[element_t.from_py(None)] = 0
+        self.assertEqual(v.to_py(), [None] * 3)
+        self.assertEqual(v[element_t.from_py(None)].vld_mask, 0)
+
+        t = Array3t(Bits2t(8), 2, storage=ARRAY3T_STORAGE_PACKED)
+        v = t.from_py([1, 2])
+        v[1] = v[0] + 2
+        self.assertEqual(v.to_py(), [1, 3])
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Array3tPackedTC("test_same_as_dict")])
+    suite = testLoader.loadTestsFromTestCase(Array3tPackedTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from copy import copy
+from random import Random
+import unittest
+
+from pyMathBitPrecise.array3t import Array3t, ARRAY3T_STORAGE_PAGED, \
+    ARRAY3T_STORAGE_PACKED
+from pyMathBitPrecise.array3t_paged import Array3valPaged
+from pyMathBitPrecise.bits3t import Bits3t
+from tests.bits3tBaseTC import TYPES, random_values
+
+
+class Array3tPagedTC(unittest.TestCase):
+
+    def test_same_as_packed(self):
+        rand = Random(0)
+        for element_t in TYPES:
+            values = random_values(rand, element_t, 40)
+            t = Array3t(element_t, 40, storage=ARRAY3T_STORAGE_PAGED, page_size=16)
+            t_packed = Array3t(element_t, 40, storage=ARRAY3T_STORAGE_PACKED)
+            v = t.from_py(None)
+            self.assertIsInstance(v, Array3valPaged)
+            v_packed = t_packed.from_py(None)
+            for i, x in enumerate(values):
+                v[i] = x
+                v_packed[i] = x
+            r = v.read_range(0, 40)
+            self.assertEqual((r.val, r.vld_mask), (v_packed.val, v_packed.vld_mask))
+            for x, y in zip(v, v_packed):
+                self.assertEqual((x.val, x.vld_mask), (y.val, y.vld_mask))
+
+            v2 = t.from_py(None)
+            nb = (element_t.bit_length() + 7) // 8
+            v2.write_range(3, v_packed.val[3 * nb:33 * nb], v_packed.vld_mask[3 * nb:33 * nb])
+            for i in range(40):
+                x = v2[i]
+                if 3 <= i < 33:
+                    y = v_packed[i]
+                    self.assertEqual((x.val, x.vld_mask), (y.val, y.vld_mask))
+                else:
+                    self.assertEqual(x.vld_mask, 0)
+
+    def test_sparse(self):
+        element_t = Bits3t(16)
+        t = Array3t(element_t, 1 << 32, storage=ARRAY3T_STORAGE_PAGED)
+        v = t.from_py({5: 1, (1 << 32) - 1: 7})
+        stats = v.page_stats()
+        self.assertEqual(stats.page_cnt, (1 << 32) // t.page_size)
+        self.assertEqual(stats.allocated_page_cnt, 2)
+        self.assertEqual(stats.valid_item_cnt, 2)
+
+        # reads and invalid writes to unallocated pages do not allocate
+        for i in range(0, 1 << 32, 1 << 20):
+            self.assertEqual(v[i + 1].vld_mask, 0)
+            v[i + 1] = None
+        self.assertEqual(v.page_stats().allocated_page_cnt, 2)
+        # the item of unallocated page is not shared, it can be modified
+        x = v[1 << 20]
+        x[0] = 1
+        self.assertEqual(v[1 << 20].vld_mask, 0)
+        self.assertEqual(v.read_range(1 << 20, 8).to_py(), [None] * 8)
+        v.write_range(1 << 20, [None] * 8)
+        self.assertEqual(v.page_stats().allocated_page_cnt, 2)
+
+        v.write_range(t.page_size - 2, [1, 2, 3, 4])
+        stats = v.page_stats()
+        self.assertEqual(stats.allocated_page_cnt, 3)
+        self.assertEqual(stats.page_occupancy, {0: 3, 1: 2, stats.page_cnt - 1: 1})
+        self.assertEqual(v.read_range(t.page_size - 3, 6).to_py(), [None, 1, 2, 3, 4, None])
+        self.assertEqual(v.to_py(), {5: 1, t.page_size - 2: 1, t.page_size - 1: 2,
+                                     t.page_size: 3, t.page_size + 1: 4, (1 << 32) - 1: 7})
+
+        v2 = copy(v)
+        v[(1 << 32) - 1] = None
+        self.assertEqual(v2[(1 << 32) - 1].to_py(), 7)
+        v.trim()
+        self.assertEqual(v.page_stats().allocated_page_cnt, 2)
+        self.assertEqual(v2.page_stats().allocated_page_cnt, 3)
+
+        with self.assertRaises(IndexError):
+            v[1 << 32]
+        with self.assertRaises(IndexError):
+            v.read_range((1 << 32) - 1, 2)
+        with self.assertRaises(IndexError):
+            v.write_range((1 << 32) - 1, [0, 0])
+        with self.assertRaises(ValueError):
+            t.from_py({1 << 32: 0})
+
+        # write to unknown index invalidates everything
+        v[element_t.from_py(None)] = 0
+        self.assertEqual(v.to_py(), {})
+
+        with self.assertRaises(ValueError):
+            Array3t(element_t, 16, storage=ARRAY3T_STORAGE_PAGED, page_size=0)
+
+    def test_snapshot(self):
+        element_t = Bits3t(8)
+        t = Array3t(element_t, 1 << 20, storage=ARRAY3T_STORAGE_PAGED, page_size=256)
+        v = t.from_py({i * 256: i & 0xff for i in range(64)})
+        s0 = v.snapshot()
+        shared = s0._shared
+        self.assertIs(v._shared, shared)
+
+        v[1] = 1
+        v[256] = None
+        v[(1 << 20) - 1] = 2
+        # only the touched pages were copied, the shared pages (and their dict) were not
+        self.assertIs(v._shared, shared)
+        self.assertIs(s0._shared, shared)
+        self.assertEqual(sorted(v.val.keys()), [0, 1, (1 << 20) // 256 - 1])
+        self.assertEqual(s0.val, {})
+        for i in range(2, 64):
+            self.assertIs(v._get_page(i), s0._get_page(i))
+        self.assertIsNot(v._get_page(0), s0._get_page(0))
+        self.assertIsNot(v._get_page(1), s0._get_page(1))
+        self.assertEqual(s0.page_stats().allocated_page_cnt, 64)
+        self.assertEqual(v.page_stats().allocated_page_cnt, 65)
+        self.assertEqual(s0.to_py(), {i * 256: i & 0xff for i in range(64)})
+
+        s1 = copy(v)
+        v.write_range(0, list(range(10)))
+        s0[0] = 9
+        self.assertEqual(v.read_range(0, 3).to_py(), [0, 1, 2])
+        self.assertEqual(s1.read_range(0, 3).to_py(), [0, 1, None])
+        self.assertEqual(s0.read_range(0, 3).to_py(), [9, None, None])
+
+        v.restore(s1)
+        self.assertEqual(v.read_range(0, 3).to_py(), [0, 1, None])
+        v[2] = 3
+        self.assertEqual(s1[2].vld_mask, 0)
+        v.restore(s1)
+        self.assertEqual(v[2].vld_mask, 0)
+        v.trim()
+        self.assertEqual(v.page_stats().allocated_page_cnt, 64)
+        self.assertEqual(s1.page_stats().allocated_page_cnt, 65)
+        s1[element_t.from_py(None)] = 0
+        self.assertEqual(s1.to_py(), {})
+        self.assertEqual(v[(1 << 20) - 1].to_py(), 2)
+
+        # many snapshots, the number of shared layers remains small
+        v = t.from_py(None)
+        snapshots = []
+        for i in range(1000):
+            v[i * 256] = i & 0xff
+            snapshots.append(v.snapshot())
+        layer_cnt = 0
+        layers = v._shared
+        while layers is not None:
+            layers = layers[1]
+            layer_cnt += 1
+        self.assertLessEqual(layer_cnt, 11)
+        for i in range(0, 1000, 99):
+            self.assertEqual(snapshots[i].page_stats().allocated_page_cnt, i + 1)
+            self.assertEqual(snapshots[i][i * 256].to_py(), i & 0xff)
+
+    def test_from_py_list(self):
+        element_t = Bits3t(8)
+        t = Array3t(element_t, 10, storage=ARRAY3T_STORAGE_PAGED, page_size=4)
+        v = t.from_py(list(range(6)))
+        self.assertEqual(v.to_py(), {i: i for i in range(6)})
+        self.assertEqual(v.page_stats().allocated_page_cnt, 2)
+        v = t.from_py(bytes(range(10)), vld_mask=b"\xff" * 5 + b"\x00" * 5)
+        self.assertEqual(v.to_py(), {i: i for i in range(5)})
+        self.assertEqual(v.page_stats().allocated_page_cnt, 2)
+        self.assertEqual(v.page_stats().occupancy, 5 / 8)
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Array3tPagedTC("test_sparse")])
+    suite = testLoader.loadTestsFromTestCase(Array3tPagedTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -1,7 +1,11 @@
+from random import Random
 import unittest
 
+from pyMathBitPrecise.array3t import Array3t, ARRAY3T_STORAGE_DICT, \
+    ARRAY3T_STORAGE_PACKED, ARRAY3T_STORAGE_PAGED, ARRAY3T_STORAGE_MMAP
 from pyMathBitPrecise.bit_utils import ValidityError
-from tests.bits3tBaseTC import uint8_t
+from pyMathBitPrecise.bits3t import Bits3t, Concat
+from tests.bits3tBaseTC import uint8_t, random_values
 
 
 class Array3tTC(unittest.TestCase):
@@ -60,6 +64,57 @@ class Array3tTC(unittest.TestCase):
         with self.assertRaises(IndexError):
             v[0][5]
 
+    def test_write_with_strobe(self):
+        rand = Random(0)
+        element_t = Bits3t(32, signed=True)
+        init = random_values(rand, element_t, 16)
+        writes = []
+        for burst_len in (1, 1, 2, 3, 4, 4, 1, 8):
+            index = rand.randrange(16 - burst_len + 1)
+            data = Concat(*random_values(rand, element_t, burst_len)[::-1])
+            strobe = random_values(rand, Bits3t(4 * burst_len), 1)[0]
+            writes.append((index, data, strobe))
+        writes.append((3, 5, 0b1010))
+        writes.append((2, 7, None))
+        writes.append((4, -3, Bits3t(4).from_py(0b11)))
+
+        # reference: the scalar write for each item of the burst
+        ref = [v.__copy__() for v in init]
+        for index, data, strobe in writes:
+            if isinstance(data, int):
+                data = element_t.from_py(data)
+            for i in range(data._dtype.bit_length() // 32):
+                if strobe is None:
+                    s = None
+                elif isinstance(strobe, int):
+                    s = (strobe >> (4 * i)) & 0xf
+                else:
+                    s = strobe[4 * (i + 1):4 * i]
+                ref[index + i] = ref[index + i]._write_with_strobe(data[32 * (i + 1):32 * i], s)
+
+        for storage in (ARRAY3T_STORAGE_DICT, ARRAY3T_STORAGE_PACKED, ARRAY3T_STORAGE_PAGED, ARRAY3T_STORAGE_MMAP):
+            t = Array3t(element_t, 16, storage=storage, page_size=4)
+            v = t.from_py(None)
+            for i, x in enumerate(init):
+                v[i] = x.__copy__()
+            for index, data, strobe in writes:
+                v.write_with_strobe(index, data, strobe)
+            for i, r in enumerate(ref):
+                x = v[i]
+                self.assertEqual((x.val, x.vld_mask), (r.val, r.vld_mask), (storage, i))
+
+            with self.assertRaises(IndexError):
+                v.write_with_strobe(15, writes[2][1], writes[2][2])
+            with self.assertRaises(TypeError):
+                v.write_with_strobe(0, Bits3t(48).from_py(0))
+            with self.assertRaises(TypeError):
+                v.write_with_strobe(0, 0, Bits3t(8).from_py(0))
+            with self.assertRaises(ValueError):
+                v.write_with_strobe(0, 0, 0x10)
+
+        with self.assertRaises(ValueError):
+            Bits3t(7)[4].from_py(None).write_with_strobe(0, 0)
+
 
 if __name__ == '__main__':
     testLoader = unittest.TestLoader()
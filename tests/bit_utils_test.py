@@ -1,3 +1,4 @@
+from random import Random
 import unittest
 from pyMathBitPrecise.bit_utils import toggle_bit, align, iter_bits, mask_bytes, \
     reverse_bits, bit_list_to_int, int_list_to_int, extend_to_size, \
@@ -6,7 +7,12 @@ from pyMathBitPrecise.bit_utils import toggle_bit, align, iter_bits, mask_bytes,
     clear_least_significant_1, clear_trailing_1s, \
     get_single_1_at_position_of_least_significant_0, \
     get_single_0_at_position_of_least_significant_1, set_least_significant_0, \
-    set_trailing_0s
+    set_trailing_0s, reverse_byte_order, reverse_byte_order_int, \
+    reverse_word_order_int, byte_mask_to_bit_mask_int, bit_mask_to_byte_mask_int, \
+    _reverse_bits_bitwise, _byte_mask_to_bit_mask_int_bitwise, \
+    _bit_mask_to_byte_mask_int_bitwise, _mask_bytes_bitwise, ctpop, ctlz, cttz, \
+    _ctpop_swar, _ctpop_bin, _ctlz_bisection, _cttz_bisection
+from pyMathBitPrecise.bits3t import Bits3t
 
 
 class BitUtilsTC(unittest.TestCase):
@@ -48,6 +54,62 @@ class BitUtilsTC(unittest.TestCase):
     def test_reverse_bits(self):
         self.assertEqual(reverse_bits(0b011, 3), 0b110)
 
+    def test_reverse_byte_order(self):
+        self.assertEqual(reverse_word_order_int(0x123456, 24), 0x563412)
+        self.assertEqual(reverse_word_order_int(0x123456, 24), reverse_byte_order_int(0x123456, 24))
+        self.assertEqual(reverse_word_order_int(0x12345678, 32, 16), 0x56781234)
+        self.assertEqual(reverse_word_order_int(0x123, 12, 4), 0x321)
+        # the lowest byte is shorter and becomes the highest
+        self.assertEqual(reverse_word_order_int(0x1234567, 28), 0x7563412)
+        self.assertEqual(reverse_word_order_int(0x5, 3), 0x5)
+
+        v = Bits3t(16, signed=True).from_py("0h12x4")
+        res = reverse_byte_order(v)
+        self.assertIs(res._dtype, Bits3t(16))
+        self.assertEqual((res.val, res.vld_mask), (0x0412, 0x0fff))
+        res = reverse_byte_order(Bits3t(32).from_py(0x12345678), word_width=16)
+        self.assertEqual((res.val, res.vld_mask), (0x56781234, 0xffffffff))
+        self.assertIs(res.vld_mask, Bits3t(32)._all_mask)
+
+    def test_table_kernels_same_as_bitwise(self):
+        rand = Random(0)
+        for width in (0, 1, 3, 8, 13, 64, 65, 512):
+            for _ in range(10):
+                v = rand.getrandbits(width + 8)
+                self.assertEqual(reverse_bits(v, width), _reverse_bits_bitwise(v, width), (v, width))
+                for byte_width in (1, 3, 8, 16, 24):
+                    self.assertEqual(byte_mask_to_bit_mask_int(v, width, byte_width),
+                                     _byte_mask_to_bit_mask_int_bitwise(v, width, byte_width), (v, width))
+                m = _byte_mask_to_bit_mask_int_bitwise(v, width)
+                self.assertEqual(bit_mask_to_byte_mask_int(m, width * 8), v & ((1 << width) - 1))
+                self.assertEqual(bit_mask_to_byte_mask_int(m, width * 8),
+                                 _bit_mask_to_byte_mask_int_bitwise(m, width * 8))
+                d = rand.getrandbits(width * 8 + 8)
+                self.assertEqual(mask_bytes(d, v, width), _mask_bytes_bitwise(d, v, width))
+
+        self.assertEqual(bit_mask_to_byte_mask_int(0xff000f0f, 32, 4), 0b11000101)
+        with self.assertRaises(AssertionError):
+            bit_mask_to_byte_mask_int(0xff0f, 16)
+
+    def test_bit_count(self):
+        rand = Random(0)
+        for width in (1, 3, 8, 13, 64, 65, 128, 512):
+            values = [0, 1, 1 << (width - 1), (1 << width) - 1]
+            values.extend(rand.getrandbits(width) >> rand.randrange(width) for _ in range(10))
+            values.extend(rand.getrandbits(width) << rand.randrange(width) & ((1 << width) - 1) for _ in range(10))
+            for v in values:
+                ref = bin(v).count("1")
+                self.assertEqual(ctpop(v, width), ref, (v, width))
+                self.assertEqual(_ctpop_swar(v, width), ref, (v, width))
+                self.assertEqual(_ctpop_bin(v, width), ref, (v, width))
+                self.assertEqual(ctlz(v, width), _ctlz_bisection(v, width), (v, width))
+                self.assertEqual(cttz(v, width), _cttz_bisection(v, width), (v, width))
+
+        self.assertEqual(ctpop(-1, 64), 64)
+        self.assertEqual(ctlz(0x0f, 8), 4)
+        self.assertEqual(cttz(0x10, 8), 4)
+        self.assertEqual(cttz(0, 8), 8)
+
     def test_bit_list_to_int(self):
         self.assertEqual(bit_list_to_int([0, 1]), 0b10)
 
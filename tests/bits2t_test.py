@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from operator import add, sub, mul, and_, or_, xor, floordiv, mod, lt, le, \
+    gt, ge, ne, invert, neg, lshift, rshift
+from random import Random
+import unittest
+
+from pyMathBitPrecise.bit_utils import ValidityError
+from pyMathBitPrecise.bits2t import Bits2t, Bits2val, get_bits_t
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+from tests.bits3tBaseTC import TYPES, random_values
+
+
+def _eq(a, b):
+    return a._eq(b)
+
+
+class Bits2tTC(unittest.TestCase):
+    N = 32
+
+    def assertSameAsBits3(self, res: Bits2val, ref: Bits3val):
+        self.assertIsInstance(res, Bits2val)
+        self.assertIs(res._dtype, Bits2t.from_bits3t(ref._dtype))
+        self.assertEqual(res.val, ref.val)
+        self.assertTrue(ref._is_full_valid())
+
+    def test_ops(self):
+        rand = Random(0)
+        for t3 in TYPES:
+            t = Bits2t.from_bits3t(t3)
+            self.assertIs(t.to_bits3t(), t3)
+            w = t.bit_length()
+            a = random_values(rand, t3, self.N, with_x=False)
+            b = random_values(rand, t3, self.N, with_x=False, nonzero=True)
+            b[1::4] = a[1::4]
+            low, up = t.get_domain_range()
+            for x, y in zip(a, b):
+                x2 = t.from_bits3val(x)
+                y2 = t.from_bits3val(y)
+                self.assertTrue(x2.to_bits3val()._is(x))
+                for op in (invert, neg):
+                    self.assertSameAsBits3(op(x2), op(x))
+                for op in (add, sub, mul, and_, or_, xor, floordiv, mod, lt, le, gt, ge, ne, _eq):
+                    if y.val or op not in (floordiv, mod):
+                        self.assertSameAsBits3(op(x2, y2), op(x, y))
+                    for c in (low, up, 1):
+                        if c == 0 and op in (floordiv, mod):
+                            continue
+                        self.assertSameAsBits3(op(x2, c), op(x, c))
+                    if op not in (mul, floordiv, mod):
+                        with self.assertRaises(ValueError):
+                            op(x2, up + 1)
+                for op in (add, sub, and_, or_, xor):
+                    self.assertSameAsBits3(op(low, x2), op(low, x))
+                for sh in (0, 1, w - 1, w, w + 3):
+                    for op in (lshift, rshift):
+                        self.assertSameAsBits3(op(x2, sh), op(x, sh))
+                self.assertSameAsBits3(x2[w - 1], x[w - 1])
+                self.assertSameAsBits3(x2[w:0], x[w:0])
+                self.assertSameAsBits3(x2._concat(y2), x._concat(y))
+                self.assertSameAsBits3(x2._zext(w + 3), x._zext(w + 3))
+                self.assertSameAsBits3(x2._sext(w + 3), x._sext(w + 3))
+                self.assertSameAsBits3(x2._trunc(1), x._trunc(1))
+                self.assertEqual(int(x2), int(x))
+
+                x2c = x2.__copy__()
+                x2c += y2
+                x2c ^= y2
+                x2c >>= 1
+                self.assertSameAsBits3(x2c, ((x + y) ^ y) >> 1)
+
+    def test_from_py(self):
+        t = Bits2t(8, signed=True)
+        self.assertIs(get_bits_t(8, signed=True, two_state=True), t)
+        self.assertIs(get_bits_t(8, signed=True), Bits3t(8, signed=True))
+        self.assertEqual(int(t.from_py(-1)), -1)
+        self.assertEqual(t.from_py(-1).vld_mask, 0xff)
+        self.assertEqual(int(t.from_py("0h7f")), 0x7f)
+        self.assertEqual(repr(t.from_py(-2)), "<Bits2val i8 -2>")
+        for v in (128, -129):
+            with self.assertRaises(ValueError):
+                t.from_py(v)
+        with self.assertRaises(ValidityError):
+            t.from_py(None)
+        with self.assertRaises(ValidityError):
+            t.from_py("0h7x")
+        with self.assertRaises(ValidityError):
+            t.from_py_literals(["0h7f", "0h7x"])
+        self.assertEqual([int(v) for v in t.from_py_literals(["0h7f", "0d3"])], [0x7f, 3])
+        with self.assertRaises(ValidityError):
+            t.from_py(0, vld_mask=1)
+        with self.assertRaises(ValidityError):
+            t.from_bits3val(Bits3t(8, signed=True).from_py(None))
+        with self.assertRaises(TypeError):
+            t.from_py(1) < Bits2t(8).from_py(1)
+
+        v = Bits2t(8).from_py(0)
+        v[3:1] = 3
+        v[7] = 1
+        self.assertEqual(int(v), 0b10000110)
+
+    def test_unsupported_type_features(self):
+        t = Bits2t(4, name="bits2t_unsupported_t")
+        with self.assertRaises(TypeError):
+            t.enable_const_pool()
+        with self.assertRaises(TypeError):
+            t.enable_specialization()
+        self.assertIsNone(t._const_pool)
+        self.assertIsNone(t._value_cls)
+        self.assertIs(t.from_py(3).__class__, Bits2val)
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Bits2tTC("test_ops")])
+    suite = testLoader.loadTestsFromTestCase(Bits2tTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
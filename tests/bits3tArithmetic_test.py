@@ -156,6 +156,8 @@ class Bits3tArithmeticTC(Bits3tBaseTC):
         self.assertEqual((t.from_py(8) // 2), 4)
         self.assertEqual((t.from_py(8) // t.from_py(None)).vld_mask, 0)
         self.assertEqual((t.from_py(None) // t.from_py(2)).vld_mask, 0)
+        with self.assertRaises(ZeroDivisionError):
+            t.from_py(None) // 0
         if t.signed:
             self.assertEqual((t.from_py(-1) // t.from_py(1)), -1)
             self.assertEqual((t.from_py(1) // t.from_py(-1)), -1)
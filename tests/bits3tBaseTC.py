@@ -1,15 +1,49 @@
 #!/usr/bin/env python3
 # -*- coding: UTF-8 -*-
 
-from pyMathBitPrecise.bits3t import Bits3t
+from random import Random
 import unittest
 
+from pyMathBitPrecise.bits3t import Bits3t
+
 int8_t = Bits3t(8, signed=True)
 uint8_t = Bits3t(8, signed=False)
 int512_t = Bits3t(512, signed=True)
 uint512_t = Bits3t(512, signed=False)
 
 
+# types for tests which are comparing implementations on random values
+TYPES = [
+    Bits3t(1),
+    Bits3t(7, signed=True),
+    Bits3t(8),
+    Bits3t(8, signed=True),
+    Bits3t(33),
+    Bits3t(64),
+    Bits3t(64, signed=True),
+]
+
+
+def random_values(rand: Random, t: Bits3t, n: int, with_x=True, nonzero=False):
+    w = t.bit_length()
+    m = t.all_mask()
+    values = []
+    for i in range(n):
+        v = rand.getrandbits(w)
+        if with_x and i % 3 == 0:
+            vld = rand.getrandbits(w)
+        elif with_x and i % 7 == 0:
+            vld = 0
+        else:
+            vld = m
+        if nonzero and v & vld == 0:
+            # the Bits3val raises ZeroDivisionError even for invalid divisor
+            v = 1
+            vld = m
+        values.append(t._from_py(v & vld, vld))
+    return values
+
+
 def Bits3valToInt(val):
     if val._is_full_valid():
         return int(val)
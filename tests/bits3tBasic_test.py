@@ -1,11 +1,32 @@
 #!/usr/bin/env python3
 # -*- coding: UTF-8 -*-
 
-from tests.bits3tBaseTC import Bits3tBaseTC, int8_t, int512_t, \
-    uint512_t, uint8_t
+from copy import copy
+import gc
+import pickle
 import unittest
-from pyMathBitPrecise.bits3t import Bits3t
+
 from pyMathBitPrecise.bit_utils import mask
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val, _BITS3T_INTERNED, \
+    _BITS3T_RECENTLY_CREATED, bitsBitOp__rol, bitsBitOp__ror, Concat, Replicate
+from tests.bits3tBaseTC import Bits3tBaseTC, int8_t, int512_t, \
+    uint512_t, uint8_t
+
+
+class Bits3tWithAttr(Bits3t):
+    """
+    Subclass with a property which is not in the interning key
+    """
+
+    def __init__(self, bit_length: int, attr=None, **kwargs):
+        super().__init__(bit_length, **kwargs)
+        self.attr = attr
+
+
+class Bits3tWithKey(Bits3tWithAttr):
+
+    def _intern_key(self) -> tuple:
+        return (*super()._intern_key(), self.attr)
 
 
 class Bits3tBasicTC(Bits3tBaseTC):
@@ -64,6 +85,38 @@ class Bits3tBasicTC(Bits3tBaseTC):
         self.assertEqual(v.val, 0)
         self.assertEqual(v.vld_mask, mask(6))
 
+    def test_str_literal(self):
+        t = uint8_t
+        for literal, val, vld in [
+                ("0b1x01", 0b1001, 0b1011),
+                ("0hx1", 0x01, 0x0f),
+                ("0hAX", 0xa0, 0xf0),
+                ("0o7x", 0o70, 0o70),
+                ("0h1_f", 0x1f, mask(8)),
+                ("0d255", 255, mask(8)),
+            ]:
+            ref = t._from_py(val, vld)
+            self.assertTrue(t.from_py(literal)._is(ref), literal)
+            v, = t.from_py_literals([literal])
+            self.assertTrue(v._is(ref), literal)
+
+        for literal in ("0d1x", "0q10", "0b", "1b01", "0b012", "0b0x2", "0h1ff", "0b1x0000000"):
+            with self.assertRaises(ValueError, msg=literal):
+                t.from_py(literal)
+            with self.assertRaises(ValueError, msg=literal):
+                t.from_py_literals([literal])
+
+        t = Bits3t(4096)
+        digits = "".join("01x"[i % 3] if i % 7 else "1" for i in range(4096))
+        v = t.from_py("0b" + digits)
+        self.assertEqual(v.val, int(digits.replace("x", "0"), 2))
+        self.assertEqual(v.vld_mask, int(digits.replace("0", "1").replace("x", "0"), 2))
+
+        t = int8_t
+        literals = ["0h7f", "0b1", "0d0", "0b0x0x0x0x", "0hx"]
+        self.assertTrue(all(v._is(t.from_py(literal))
+                            for v, literal in zip(t.from_py_literals(literals), literals)))
+
     def test_512b_cast(self):
         self.test_8b_cast(int512_t)
 
@@ -73,6 +126,169 @@ class Bits3tBasicTC(Bits3tBaseTC):
     def test_u8b_cast(self):
         self.test_8b_cast(uint8_t)
 
+    def test_type_interning(self):
+        self.assertIs(Bits3t(8, signed=True), int8_t)
+        self.assertIs(Bits3t(8), uint8_t)
+        self.assertIsNot(Bits3t(8, name="x"), uint8_t)
+        self.assertIsNot(Bits3t(8, strict_width=False), uint8_t)
+        self.assertIs(copy(uint8_t), uint8_t)
+        self.assertIs(pickle.loads(pickle.dumps(int512_t)), int512_t)
+        self.assertEqual(hash(Bits3t(8)), hash(uint8_t))
+
+        v = uint8_t.from_py(0xf0)
+        self.assertIs(v[4:0]._dtype, Bits3t(4))
+        self.assertIs(v._zext(16)._dtype, Bits3t(16))
+        self.assertIs(v._concat(v)._dtype, Bits3t(16))
+        self.assertIs(int8_t.from_py(-1)._cast_sign(False)._dtype, uint8_t)
+
+    def test_type_interning_subclass(self):
+        # the attribute is not in the key, the subclass is not interned
+        a = Bits3tWithAttr(8, attr=1)
+        b = Bits3tWithAttr(8, attr=2)
+        self.assertIsNot(a, b)
+        self.assertEqual(b.attr, 2)
+        self.assertIsNot(a, uint8_t)
+        self.assertNotEqual(a, uint8_t)
+        b2 = pickle.loads(pickle.dumps(b))
+        self.assertEqual(b2.attr, 2)
+        self.assertEqual(b2.bit_length(), 8)
+
+        self.assertIs(Bits3tWithKey(8, attr=1), Bits3tWithKey(8, attr=1))
+        self.assertIsNot(Bits3tWithKey(8, attr=1), Bits3tWithKey(8, attr=2))
+
+    def test_type_interning_eviction(self):
+        for w in range(10000, 10000 + 4 * _BITS3T_RECENTLY_CREATED.maxlen):
+            Bits3t(w)
+        gc.collect()
+        self.assertLessEqual(len(_BITS3T_INTERNED), 2 * _BITS3T_RECENTLY_CREATED.maxlen)
+
+    def test_slots(self):
+        v = uint8_t.from_py(1)
+        self.assertFalse(hasattr(v, "__dict__"))
+        self.assertFalse(hasattr(uint8_t, "__dict__"))
+
+        class Bits3valWithAttr(Bits3val):
+            pass
+
+        v = Bits3valWithAttr(uint8_t, 1, 0xff)
+        v.attr = 2
+        self.assertEqual(v.attr, 2)
+        self.assertEqual(v + 1, 2)
+        # the class of the value is kept
+        x = Bits3valWithAttr(uint8_t, 0, 0x0f)
+        for res in (v._cast_sign(True), v._concat(v), Concat(v, v), Concat(v, x), Concat(x, v),
+                    Replicate(2, v), Replicate(3, x)):
+            self.assertIs(res.__class__, Bits3valWithAttr)
+        self.assertIs(v._cast_sign(True)._dtype, int8_t)
+        self.assertEqual(v._concat(v), 0x0101)
+        for res in (Concat(v, v), Replicate(2, v)):
+            self.assertTrue(res._is(uint8_t.from_py(1)._concat(uint8_t.from_py(1))), res)
+        self.assertEqual(Concat(v, x).vld_mask, 0xff0f)
+        self.assertEqual(Replicate(3, x).vld_mask, 0x0f0f0f)
+
+    def test_const_pool(self):
+        # the pool is not enabled implicitly
+        t = Bits3t(1)
+        self.assertIsNone(t._const_pool)
+        b = t.from_py(0)
+        b[0] = 1
+        self.assertEqual(b, 1)
+        bit = uint8_t.from_py(5)[0]
+        bit.val = 0
+        self.assertEqual(t.from_py(1).val, 1)
+
+        # the type has an unique name in order to not affect the other tests
+        t = Bits3t(1, name="const_pool_bool_t")
+        t.enable_const_pool()
+        self.assertIs(t.from_py(1), t.from_py(1))
+        self.assertIs(t.from_py(None), t.from_py(None))
+
+        t = Bits3t(4, signed=True, name="const_pool_int4_t")
+        t.enable_const_pool()
+        self.assertIs(t.from_py(-1), t.from_py(-1))
+        self.assertIs(t.from_py(-1), t._from_py(0xf, 0xf))
+        self.assertEqual(t.from_py(-1), -1)
+        self.assertIs(t.from_py("0b01x1"), t.from_py("0b01x1"))
+        self.assertIs(t.from_py(0, vld_mask=0), t.from_py(None))
+        with self.assertRaises(ValueError):
+            t.from_py(8)
+
+        # shared values are not modified
+        v = t.from_py(1)
+        v2 = v
+        v2 += 1
+        self.assertIsNot(v2, v)
+        self.assertEqual(v, 1)
+        self.assertEqual(v2, 2)
+        v3 = v2
+        v3 += 1
+        self.assertIs(v3, v2)
+        with self.assertRaises(TypeError):
+            v[0] = 0
+        v2[0] = 1
+        self.assertEqual(v2, 3)
+
+        with self.assertRaises(ValueError):
+            Bits3t(16).enable_const_pool()
+
+    def test_full_valid_shares_all_mask(self):
+        t = uint512_t
+        m = t._all_mask
+        a = t.from_py(mask(500))
+        b = t.from_py(3, vld_mask=mask(512))
+        self.assertIs(b.vld_mask, m)
+        for res in (a + b, a - b, a * b, a // b, a % b, a & b, a | b, a ^ b, ~a, -a,
+                    a << 3, a >> 3, bitsBitOp__rol(a, 3), bitsBitOp__ror(a, 3)):
+            self.assertIs(res.vld_mask, m)
+        c = a.__copy__()
+        c += b
+        c ^= b
+        c >>= 1
+        self.assertIs(c.vld_mask, m)
+        self.assertIs(a[256:]._concat(a[256:]).vld_mask, m)
+        self.assertIs(a[256:]._zext(512).vld_mask, m)
+        self.assertIs(int512_t.from_py(-1)._sext(600).vld_mask, int512_t._createMutated(600)._all_mask)
+
+        x = t.from_py(0, vld_mask=1)
+        self.assertEqual((a & x).vld_mask, mask(512) ^ mask(500) | 1)
+        self.assertEqual((a + x).vld_mask, 0)
+
+    def test_int_operand(self):
+        # int operand has to behave the same as fully valid value of the same type
+        ops = [
+            # (operator, reflected operator)
+            ("__and__", "__rand__"), ("__or__", "__ror__"), ("__xor__", "__rxor__"),
+            ("__add__", "__radd__"), ("__sub__", "__rsub__"),
+            ("__lt__", "__rlt__"), ("__le__", "__rle__"), ("__gt__", "__rgt__"), ("__ge__", "__rge__"),
+            ("_eq", "__req__"), ("__ne__", "__rne__"),
+        ]
+        for t in (uint8_t, int8_t, Bits3t(8, signed=None), uint512_t, int512_t):
+            low, up = t.get_domain_range()
+            values = [t.from_py(v) for v in (low, low + 1, 0, 1, up)]
+            values.append(t.from_py(1, vld_mask=1))
+            values.append(t.from_py(None))
+            for i in (low, -1 if t.signed else 0, 0, 1, up - 1, up):
+                _i = t.from_py(i)
+                for x in values:
+                    for op, rop in ops:
+                        ref = getattr(x, op)(_i)
+                        res = getattr(x, op)(i)
+                        self.assertTrue(res._is(ref), (t, x, op, i, res, ref))
+                        ref = getattr(_i, op)(x)
+                        res = getattr(x, rop)(i)
+                        self.assertTrue(res._is(ref), (t, x, rop, i, res, ref))
+                    for op in ("__iand__", "__ior__", "__ixor__", "__iadd__", "__isub__"):
+                        ref = getattr(copy(x), op)(_i)
+                        res = getattr(copy(x), op)(i)
+                        self.assertTrue(res._is(ref), (t, x, op, i, res, ref))
+
+            x = values[0]
+            for i in (low - 1, up + 1):
+                for op, rop in ops:
+                    with self.assertRaises(ValueError):
+                        getattr(x, op)(i)
+                    with self.assertRaises(ValueError):
+                        getattr(x, rop)(i)
 
 if __name__ == '__main__':
     testLoader = unittest.TestLoader()
@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: UTF-8 -*-
 
+from copy import copy
+import operator
+from random import Random
 import unittest
 
-from pyMathBitPrecise.bit_utils import to_signed, mask
+from pyMathBitPrecise.bit_utils import to_signed, mask, apply_write_with_mask
 from pyMathBitPrecise.bits3t import Bits3t, bitsBitOp__lshr, bitsBitOp__ashr
 from tests.bits3tBaseTC import Bits3tBaseTC, int8_t, int512_t, \
-    uint512_t, uint8_t
+    uint512_t, uint8_t, random_values
 
 
 class Bits3tBitwiseTC(Bits3tBaseTC):
@@ -212,6 +215,95 @@ class Bits3tBitwiseTC(Bits3tBaseTC):
     def test_u8b_rshift_logical(self):
         self.test_8b_rshift_logical(uint8_t)
 
+    def test_inplace(self):
+        ops = [
+            (operator.and_, operator.iand),
+            (operator.or_, operator.ior),
+            (operator.xor, operator.ixor),
+            (operator.add, operator.iadd),
+            (operator.sub, operator.isub),
+            (operator.lshift, operator.ilshift),
+            (operator.rshift, operator.irshift),
+        ]
+        for t in (int8_t, uint8_t, int512_t, uint512_t):
+            w = t.bit_length()
+            values = [
+                t.from_py(1),
+                t.from_py(None),
+                t._from_py(0b101, mask(w) >> 1),
+                t._from_py(1 << (w - 1), 1 << (w - 1)),
+                t._from_py(t.all_mask() ^ 1, t.all_mask() ^ 0b11),
+            ]
+            for op, iop in ops:
+                if op in (operator.lshift, operator.rshift):
+                    others = [0, 1, 3, w - 1, w, t.from_py(None)]
+                else:
+                    others = [1] + values
+                for a in values:
+                    for b in others:
+                        ref = op(a, b)
+                        res = copy(a)
+                        res2 = iop(res, b)
+                        self.assertIs(res, res2)
+                        self.assertTrue(res._is(ref), (op, a, b, res, ref))
+
+    def test_write_with_strobe(self):
+        rand = Random(0)
+        for t in (Bits3t(8), Bits3t(32, signed=True), Bits3t(64), uint512_t):
+            nb = t.bit_length() // 8
+            strobe_t = Bits3t(nb)
+            values = random_values(rand, t, 20)
+            data = random_values(rand, t, 20)
+            strobes = random_values(rand, strobe_t, 20)
+            for cur, d, s in zip(values, data, strobes):
+                ref = apply_write_with_mask(cur, d, s)
+                res = copy(cur)
+                res2 = res._write_with_strobe(d, s)
+                self.assertIs(res, res2)
+                self.assertTrue(res._is(ref), (cur, d, s, res, ref))
+                if s._is_full_valid():
+                    res = copy(cur)._write_with_strobe(d, s.val)
+                    self.assertTrue(res._is(ref), (cur, d, s, res, ref))
+
+            v = t.from_py(0)._write_with_strobe(t.from_py(-1 if t.signed else t.all_mask()), None)
+            self.assertIs(v.vld_mask, t._all_mask)
+            self.assertEqual(int(v), -1 if t.signed else t.all_mask())
+            with self.assertRaises(ValueError):
+                v._write_with_strobe(0, 1 << nb)
+            with self.assertRaises(TypeError):
+                v._write_with_strobe(0, Bits3t(nb + 1).from_py(0))
+
+        with self.assertRaises(ValueError):
+            Bits3t(7).from_py(0)._write_with_strobe(0, 1)
+
+    def test_bit_count(self):
+        t = Bits3t(8)
+        for name, val, vld, ref_ctpop, ref_ctlz, ref_cttz in (
+                ("full valid", 0b00101100, 0xff, 3, 2, 2),
+                ("zero", 0, 0xff, 0, 8, 8),
+                ("x between 1s", 0b00100100, 0b11110111, None, 2, 2),
+                ("x above top 1", 0b00000100, 0b01111111, None, None, 2),
+                ("x under lowest 1", 0b00100100, 0b11111110, None, 2, None),
+                ("zero with x", 0, 0b11110111, None, None, None),
+            ):
+            v = t._from_py(val, vld)
+            for fn, ref in ((v._ctpop, ref_ctpop), (v._ctlz, ref_ctlz), (v._cttz, ref_cttz)):
+                res = fn()
+                self.assertIs(res._dtype, t, name)
+                if ref is None:
+                    self.assertEqual(res.vld_mask, 0, name)
+                else:
+                    self.assertIs(res.vld_mask, t._all_mask, name)
+                    self.assertEqual(res.val, ref, name)
+
+        # the count does not fit to signed 1b value
+        v = Bits3t(1, signed=True).from_py(-1)
+        res = v._ctpop()
+        self.assertFalse(res._dtype.signed)
+        self.assertEqual(int(res), 1)
+        self.assertEqual(int(uint512_t.from_py(1 << 300)._ctlz()), 211)
+        self.assertEqual(int(uint512_t.from_py(1 << 300)._cttz()), 300)
+
 
 if __name__ == '__main__':
     testLoader = unittest.TestLoader()
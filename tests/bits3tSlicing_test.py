@@ -3,7 +3,9 @@
 
 import unittest
 
-from pyMathBitPrecise.bits3t import Bits3t
+from pyMathBitPrecise.bit_utils import byte_mask_to_bit_mask, ValidityError
+from pyMathBitPrecise.bits2t import Bits2t
+from pyMathBitPrecise.bits3t import Bits3t, Concat, Replicate
 from tests.bits3tBaseTC import uint8_t
 
 
@@ -112,6 +114,54 @@ class BitsSlicingTC(unittest.TestCase):
         with self.assertRaises(TypeError):
             v * "a"
 
+    def test_Concat(self):
+        values = [
+            BIT.from_py(1),
+            Bits3t(7, signed=True).from_py(-3),
+            Bits3t(8).from_py("0b1x0x1x0x"),
+            Bits3t(65).from_py(None),
+            Bits3t(3).from_py(5),
+        ]
+        for i in range(len(values)):
+            for j in range(i + 1, len(values) + 1):
+                ref = values[i]._dtype.__class__._get(values[i]._dtype.bit_length(), signed=False).from_py(
+                    values[i].val, values[i].vld_mask)
+                for v in values[i + 1:j]:
+                    ref = ref._concat(v)
+                res = Concat(*values[i:j])
+                self.assertTrue(res._is(ref), (i, j, res, ref))
+        self.assertIs(Concat(*values[-1:]).vld_mask, Bits3t(3)._all_mask)
+
+        with self.assertRaises(ValueError):
+            Concat()
+        with self.assertRaises(TypeError):
+            Concat(BIT.from_py(1), 1)
+
+        t2 = Bits2t(4)
+        res = Concat(t2.from_py(1), t2.from_py(2))
+        self.assertIs(res._dtype, Bits2t(8))
+        self.assertEqual(int(res), 0x12)
+        with self.assertRaises(ValidityError):
+            Concat(t2.from_py(1), Bits3t(4).from_py(None))
+
+    def test_Replicate(self):
+        for v in (BIT.from_py(1), BIT.from_py(None), Bits3t(5, signed=True)._from_py(0b10001, 0b10101), uint8_t.from_py(0xa5)):
+            for n in (1, 2, 3, 7, 8, 33):
+                ref = Concat(*(v for _ in range(n)))
+                res = Replicate(n, v)
+                self.assertTrue(res._is(ref), (v, n, res, ref))
+        with self.assertRaises(ValueError):
+            Replicate(0, BIT.from_py(1))
+
+    def test_byte_mask_to_bit_mask(self):
+        m = Bits3t(4).from_py("0b1x01")
+        res = byte_mask_to_bit_mask(m)
+        self.assertIs(res._dtype, Bits3t(32))
+        self.assertEqual(res.val, 0xff0000ff)
+        self.assertEqual(res.vld_mask, 0xff00ffff)
+        res = byte_mask_to_bit_mask(BIT.from_py(1), byte_width=4)
+        self.assertTrue(res._is(Bits3t(4).from_py(0xf)))
+
 
 if __name__ == "__main__":
     testLoader = unittest.TestLoader()
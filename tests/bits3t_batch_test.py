@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from operator import and_, or_, xor, invert, lt, le, gt, ge, ne
+from random import Random
+import unittest
+
+from pyMathBitPrecise.bit_utils import reverse_byte_order, ctpop, ctlz, cttz
+from pyMathBitPrecise.bits3t import Bits3t
+from tests.bits3tBaseTC import TYPES, random_values
+
+try:
+    import numpy as np
+    from pyMathBitPrecise.bits3t_batch import batch_and, batch_or, batch_xor, \
+        batch_invert, BATCH_MAX_NATIVE_WIDTH, batch_cmp, batch_eq, batch_ne, \
+        batch_get_bit_range, batch_concat, batch_zext, batch_sext, batch_trunc, \
+        batch_reverse_byte_order, batch_ctpop, batch_ctlz, batch_cttz
+    from pyMathBitPrecise.limb_utils import ints_to_limbs, limbs_to_ints, limb_cnt
+except ImportError:
+    np = None
+
+BATCH_TYPES = TYPES + [
+    Bits3t(65),
+    Bits3t(128, signed=True),
+    Bits3t(130, signed=True),
+]
+
+
+def to_arrays(values):
+    """
+    :return: tuple of arrays val, vld_mask for list of Bits3val
+    """
+    w = values[0]._dtype.bit_length()
+    vals = [v.val for v in values]
+    vlds = [v.vld_mask for v in values]
+    if w <= BATCH_MAX_NATIVE_WIDTH:
+        return np.array(vals, dtype=np.uint64), np.array(vlds, dtype=np.uint64)
+    else:
+        K = limb_cnt(w)
+        return ints_to_limbs(vals, K), ints_to_limbs(vlds, K)
+
+
+def from_arrays(val: "np.ndarray", vld: "np.ndarray"):
+    """
+    :return: list of tuples (val, vld_mask)
+    """
+    if val.ndim == 1:
+        return list(zip(val.tolist(), vld.tolist()))
+    else:
+        return list(zip(limbs_to_ints(val), limbs_to_ints(vld)))
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class Bits3tBatchTC(unittest.TestCase):
+    N = 64
+
+    def assertSameAsScalar(self, res, ref_values):
+        self.assertEqual(from_arrays(*res), [(v.val, v.vld_mask) for v in ref_values])
+
+    def test_bitwise(self):
+        rand = Random(0)
+        for t in BATCH_TYPES:
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, t, self.N)
+            # known 0 and 1 with X on other side
+            b[1::5] = [t._from_py(0, t.all_mask()) for _ in b[1::5]]
+            b[2::5] = [t._from_py(t.all_mask(), t.all_mask()) for _ in b[2::5]]
+            a[1::5] = [t.from_py(None) for _ in a[1::5]]
+            a[2::5] = [t.from_py(None) for _ in a[2::5]]
+            _a = to_arrays(a)
+            _b = to_arrays(b)
+            for kernel, op in ((batch_and, and_), (batch_or, or_), (batch_xor, xor)):
+                self.assertSameAsScalar(kernel(*_a, *_b), [op(x, y) for x, y in zip(a, b)])
+                self.assertSameAsScalar(kernel(*_b, *_a), [op(y, x) for x, y in zip(a, b)])
+            self.assertSameAsScalar(batch_invert(*_a, t.bit_length()), [invert(x) for x in a])
+
+    def assertSameAsScalarBool(self, res, ref_values):
+        res, vld = res
+        self.assertEqual(res.dtype, bool)
+        self.assertEqual(vld.dtype, bool)
+        self.assertEqual(list(zip(res.tolist(), vld.tolist())),
+                         [(bool(v.val), bool(v.vld_mask)) for v in ref_values])
+
+    def test_cmp(self):
+        rand = Random(0)
+        for t in BATCH_TYPES:
+            w = t.bit_length()
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, t, self.N)
+            b[1::4] = a[1::4]
+            # same valid bits
+            b[2::4] = [t._from_py(x.val & y.vld_mask, y.vld_mask) for x, y in zip(a[2::4], b[2::4])]
+            # extremes of the range
+            b[3::8] = [t.from_py(t.get_min_value()) for _ in b[3::8]]
+            a[3::8] = [t.from_py(t.get_max_value()) for _ in a[3::8]]
+            _a = to_arrays(a)
+            _b = to_arrays(b)
+            for op in (lt, le, gt, ge):
+                self.assertSameAsScalarBool(batch_cmp(*_a, *_b, w, t.signed, op), [op(x, y) for x, y in zip(a, b)])
+                self.assertSameAsScalarBool(batch_cmp(*_b, *_a, w, t.signed, op), [op(y, x) for x, y in zip(a, b)])
+            self.assertSameAsScalarBool(batch_eq(*_a, *_b, w), [x._eq(y) for x, y in zip(a, b)])
+            self.assertSameAsScalarBool(batch_ne(*_a, *_b, w), [ne(x, y) for x, y in zip(a, b)])
+
+    def test_slice_concat_ext(self):
+        rand = Random(0)
+        for t in BATCH_TYPES:
+            w = t.bit_length()
+            a = random_values(rand, t, self.N)
+            # valid and invalid MSB with the other bits invalid
+            a[1::8] = [t._from_py(1 << (w - 1), 1 << (w - 1)) for _ in a[1::8]]
+            a[2::8] = [t._from_py(0, t.all_mask() >> 1) for _ in a[2::8]]
+            _a = to_arrays(a)
+            for first, size in {(0, w), (0, 1), (w - 1, 1), (0, w // 2 + 1), (w // 3, w - w // 3)}:
+                self.assertSameAsScalar(batch_get_bit_range(*_a, w, first, size),
+                                        [x[first + size:first] for x in a])
+            for new_w in (w, w + 1, 64, 65, w + 64, 2 * w + 3):
+                if new_w < w:
+                    continue
+                self.assertSameAsScalar(batch_zext(*_a, w, new_w), [x._zext(new_w) for x in a])
+                self.assertSameAsScalar(batch_sext(*_a, w, new_w), [x._sext(new_w) for x in a])
+            for new_w in (1, w // 2 + 1, w):
+                self.assertSameAsScalar(batch_trunc(*_a, w, new_w), [x._trunc(new_w) for x in a])
+            for t2 in (Bits3t(1), Bits3t(7), Bits3t(64 - w % 64), Bits3t(70)):
+                b = random_values(rand, t2, self.N)
+                _b = to_arrays(b)
+                w2 = t2.bit_length()
+                self.assertSameAsScalar(batch_concat(*_a, w, *_b, w2), [x._concat(y) for x, y in zip(a, b)])
+                self.assertSameAsScalar(batch_concat(*_b, w2, *_a, w), [y._concat(x) for x, y in zip(a, b)])
+
+    def test_reverse_byte_order(self):
+        rand = Random(0)
+        for t in BATCH_TYPES:
+            w = t.bit_length()
+            a = random_values(rand, t, self.N)
+            _a = to_arrays(a)
+            for word_width in (8, 16, 32):
+                self.assertSameAsScalar(batch_reverse_byte_order(*_a, w, word_width),
+                                        [reverse_byte_order(x, word_width) for x in a])
+        with self.assertRaises(ValueError):
+            batch_reverse_byte_order(*_a, w, 4)
+
+    def test_bit_count(self):
+        rand = Random(0)
+        for t in BATCH_TYPES:
+            w = t.bit_length()
+            a = random_values(rand, t, self.N, with_x=False)
+            # values with leading and trailing zeros
+            a[1::4] = [t._from_py(x.val >> rand.randrange(w), t._all_mask) for x in a[1::4]]
+            a[2::4] = [t._from_py((x.val << rand.randrange(w)) & t._all_mask, t._all_mask) for x in a[2::4]]
+            a[3] = t._from_py(0, t._all_mask)
+            a[5] = t._from_py(t._all_mask, t._all_mask)
+            val, _ = to_arrays(a)
+            for kernel, fn in ((batch_ctpop, ctpop), (batch_ctlz, ctlz), (batch_cttz, cttz)):
+                res = kernel(val, w)
+                self.assertEqual(res.dtype, np.uint64)
+                self.assertEqual(res.tolist(), [fn(x.val, w) for x in a], (kernel, t))
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Bits3tBatchTC("test_bitwise")])
+    suite = testLoader.loadTestsFromTestCase(Bits3tBatchTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
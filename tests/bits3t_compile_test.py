@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import os
+from random import Random
+from tempfile import TemporaryDirectory
+from types import ModuleType
+import unittest
+from unittest.mock import patch
+
+from pyMathBitPrecise import bits3t_compile
+from pyMathBitPrecise.bits2t import Bits2t
+from pyMathBitPrecise.bits3t import Bits3t
+from pyMathBitPrecise.bits3t_compile import compile_bits3_fn, _COMPILED_CACHE
+from tests.bits3tBaseTC import TYPES, random_values
+
+MASK = 0xf0
+MASK_T = Bits3t(8)
+
+
+class Bits3tSubclass(Bits3t):
+    pass
+
+
+def datapath(a, b):
+    w = a._dtype.bit_length() if hasattr(a, "_dtype") else a._width
+    x = ((a + b) & ~b) ^ (a - 1)
+    y = (x * b) >> 1
+    z = (y << 2) | a
+    c = a < b
+    d = (a >= b)._concat(c)
+    e = -z
+    return (e, c, d, a._eq(b), a != b, z[w - 1], x[w:0]._zext(w + 2), y._sext(w + 1)._trunc(w))
+
+
+class Bits3tCompileTC(unittest.TestCase):
+
+    def test_same_as_eager(self):
+        rand = Random(0)
+        for t in TYPES:
+            fn = compile_bits3_fn(datapath, t, t, cache_dir=None)
+            self.assertEqual(len(fn.result_types), 8)
+            a = random_values(rand, t, 32)
+            b = random_values(rand, t, 32)
+            b[1::4] = a[1::4]
+            for x, y in zip(a, b):
+                for res, ref in zip(fn(x, y), datapath(x, y)):
+                    self.assertIs(res._dtype, ref._dtype)
+                    self.assertEqual((res.val, res.vld_mask), (ref.val, ref.vld_mask), (res, ref))
+
+    def test_call(self):
+        t = Bits3t(8)
+
+        def f(a, b):
+            return (a + b) & 0xf0
+
+        fn = compile_bits3_fn(f, t, t, cache_dir=None)
+        self.assertEqual(int(fn(0x7f, 2)), 0x80)
+        self.assertEqual(fn.raw(0x7f, 0xff, 2, 0xff), (0x80, 0xff))
+        # bits masked by & 0 are valid
+        self.assertEqual(fn(None, 2).vld_mask, 0x0f)
+        with self.assertRaises(ValueError):
+            fn(0x1ff, 2)
+
+        def f_ctrl(a, b):
+            if a < b:
+                return a
+            return b
+
+        with self.assertRaises(ValueError):
+            compile_bits3_fn(f_ctrl, t, t, cache_dir=None)
+
+    def test_unsupported_type(self):
+
+        def f(a):
+            return a + 1
+
+        for t in (Bits2t(8), Bits3tSubclass(8)):
+            with self.assertRaises(TypeError):
+                compile_bits3_fn(f, t)
+            with self.assertRaises(TypeError):
+                compile_bits3_fn(f, t, cache_dir=None)
+
+    def test_disk_cache(self):
+        t = Bits3t(12, signed=True)
+        with TemporaryDirectory() as d, \
+                patch.object(bits3t_compile, "_trace", wraps=bits3t_compile._trace) as trace:
+            fn0 = compile_bits3_fn(datapath, t, t, cache_dir=d)
+            self.assertEqual(trace.call_count, 1)
+            self.assertEqual(len(os.listdir(d)), 1)
+            # from memory
+            self.assertIs(compile_bits3_fn(datapath, t, t, cache_dir=d), fn0)
+
+            _COMPILED_CACHE.clear()
+            fn1 = compile_bits3_fn(datapath, t, t, cache_dir=d)
+            self.assertIsNot(fn1, fn0)
+            self.assertEqual(trace.call_count, 1)
+            self.assertEqual(fn1.source, fn0.source)
+            self.assertEqual(fn1.result_types, fn0.result_types)
+            self.assertEqual(fn1.raw(5, 0xfff, 7, 0xfff), fn0.raw(5, 0xfff, 7, 0xfff))
+
+            # different types
+            compile_bits3_fn(datapath, Bits3t(12), Bits3t(12), cache_dir=d)
+            self.assertEqual(len(os.listdir(d)), 2)
+
+    def test_disk_cache_module_helper(self):
+        t = Bits3t(8)
+        helpers = ModuleType("bits3t_compile_test_helpers")
+
+        def f(a, b):
+            return helpers.combine(a, b)
+
+        with TemporaryDirectory() as d, \
+                patch.object(bits3t_compile, "_trace", wraps=bits3t_compile._trace) as trace:
+            exec("def combine(a, b):\n    return a + b\n", helpers.__dict__)
+            self.assertEqual(int(compile_bits3_fn(f, t, t, cache_dir=d)(3, 5)), 8)
+            _COMPILED_CACHE.clear()
+            self.assertEqual(int(compile_bits3_fn(f, t, t, cache_dir=d)(3, 5)), 8)
+            self.assertEqual(trace.call_count, 1)
+
+            # the code of the helper changed (e.g. after restart of the process)
+            _COMPILED_CACHE.clear()
+            exec("def combine(a, b):\n    return a ^ b\n", helpers.__dict__)
+            self.assertEqual(int(compile_bits3_fn(f, t, t, cache_dir=d)(3, 5)), 6)
+            self.assertEqual(trace.call_count, 2)
+
+            # a value which can not be in the key disables the cache
+            helpers.combine = lambda a, b: a + o[0]
+            o = [1]
+            self.assertIsNot(compile_bits3_fn(f, t, t, cache_dir=d), compile_bits3_fn(f, t, t, cache_dir=d))
+            self.assertEqual(len(os.listdir(d)), 2)
+
+    def test_cache_key(self):
+        t = Bits3t(8)
+        # closure variables
+        fns = [compile_bits3_fn(lambda a: a + k, t) for k in range(3)]
+        self.assertEqual([int(fn(5)) for fn in fns], [5, 6, 7])
+        # lambdas with same source line
+        inc, dec = compile_bits3_fn(lambda a: a + 1, t), compile_bits3_fn(lambda a: a - 1, t)
+        self.assertEqual((int(inc(5)), int(dec(5))), (6, 4))
+
+        global MASK
+        f = lambda a: a & MASK
+        self.assertEqual(int(compile_bits3_fn(f, t)(0xff)), 0xf0)
+        MASK = 0x0f
+        try:
+            self.assertEqual(int(compile_bits3_fn(f, t)(0xff)), 0x0f)
+        finally:
+            MASK = 0xf0
+
+        # the types are part of the key, other objects disable the cache
+        f = lambda a: a & MASK_T.from_py(3)
+        self.assertIs(compile_bits3_fn(f, t), compile_bits3_fn(f, t))
+        o = [1]
+        f = lambda a: a + o[0]
+        self.assertIsNot(compile_bits3_fn(f, t), compile_bits3_fn(f, t))
+
+        # cache_dir=None disables also the memory cache
+        f = lambda a: a + 2
+        self.assertIs(compile_bits3_fn(f, t), compile_bits3_fn(f, t))
+        self.assertIsNot(compile_bits3_fn(f, t, cache_dir=None), compile_bits3_fn(f, t))
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Bits3tCompileTC("test_same_as_eager")])
+    suite = testLoader.loadTestsFromTestCase(Bits3tCompileTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from operator import add, sub, mul, and_, or_, xor, lt, le, gt, ge, ne, \
+    invert, neg, lshift, rshift, floordiv
+from random import Random
+import unittest
+
+from pyMathBitPrecise.bit_utils import ValidityError
+from pyMathBitPrecise.bits3t import Bits3t
+from pyMathBitPrecise.bits3t_lazy import lazy, Bits3LazyNode
+from tests.bits3tBaseTC import TYPES, random_values
+
+
+class Bits3tLazyTC(unittest.TestCase):
+    N = 32
+
+    def assertSameAsEager(self, lazy_res: Bits3LazyNode, ref):
+        res = lazy_res.evaluate()
+        self.assertIs(res._dtype, ref._dtype)
+        self.assertEqual((res.val, res.vld_mask), (ref.val, ref.vld_mask), (lazy_res, ref))
+
+    def test_ops(self):
+        rand = Random(0)
+        for t in TYPES:
+            w = t.bit_length()
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, t, self.N)
+            b[1::4] = a[1::4]
+            for x, y in zip(a, b):
+                lx = lazy(x)
+                ly = lazy(y)
+                for op in (invert, neg):
+                    self.assertSameAsEager(op(lx), op(x))
+                for op in (add, sub, mul, and_, or_, xor, lt, le, gt, ge, ne):
+                    self.assertSameAsEager(op(lx, ly), op(x, y))
+                    self.assertSameAsEager(op(lx, y), op(x, y))
+                    self.assertSameAsEager(op(lx, 1), op(x, 1))
+                for op in (add, sub, and_, or_, xor):
+                    self.assertSameAsEager(op(1, lx), op(1, x))
+                for sh in (0, 1, w - 1, w, t.from_py(None)):
+                    for op in (lshift, rshift):
+                        self.assertSameAsEager(op(lx, sh), op(x, sh))
+                self.assertSameAsEager(lx[w - 1], x[w - 1])
+                self.assertSameAsEager(lx[w:0], x[w:0])
+                if w > 1:
+                    self.assertSameAsEager(lx[w - 1:1], x[w - 1:1])
+                self.assertSameAsEager(lx._concat(ly), x._concat(y))
+                self.assertSameAsEager(lx._zext(w + 3), x._zext(w + 3))
+                self.assertSameAsEager(lx._sext(w + 3), x._sext(w + 3))
+                self.assertSameAsEager(lx._trunc(1), x._trunc(1))
+                self.assertTrue(lx._eq(ly)._is(x._eq(y)))
+
+    def test_expr(self):
+        t = Bits3t(16)
+        a = t.from_py(0x1234)
+        b = t.from_py(0xff00)
+        m = t.from_py(0x0ff0)
+        e = ((lazy(a) + b) & m) >> 3
+        self.assertEqual(int(e), int(((a + b) & m) >> 3))
+        self.assertTrue(e._eq(((a + b) & m) >> 3))
+        # cse
+        self.assertIs((lazy(a) + b), (lazy(a) + b))
+        self.assertIs(lazy(a)[8:]._concat(lazy(a)[8:]), lazy(a)[8:]._concat(lazy(a)[8:]))
+        self.assertIsNot(lazy(a) + b, lazy(b) + a)
+        self.assertEqual(int(floordiv(lazy(a), 2)), int(a // 2))
+
+        with self.assertRaises(ValidityError):
+            int(lazy(a) + t.from_py(None))
+        with self.assertRaises(TypeError):
+            lazy(a) < Bits3t(16, signed=True).from_py(0)
+
+    def test_deep(self):
+        t = Bits3t(8)
+        acc = lazy(t.from_py(0))
+        ref = t.from_py(0)
+        for i in range(20000):
+            acc = (acc + i % 256) ^ 0x5a
+            ref = (ref + i % 256) ^ 0x5a
+        self.assertEqual(int(acc), int(ref))
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Bits3tLazyTC("test_ops")])
+    suite = testLoader.loadTestsFromTestCase(Bits3tLazyTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from operator import add, sub, mul, and_, or_, xor, lt, le, gt, ge, ne, \
+    invert, neg
+import pickle
+from random import Random
+import unittest
+
+from pyMathBitPrecise.bits3t import Bits3t, Bits3val
+from pyMathBitPrecise.bits3val_specialized import get_specialized_bits3val_cls
+from tests.bits3tBaseTC import TYPES, random_values
+
+
+def _eq(a, b):
+    return a._eq(b)
+
+
+class Bits3valSpecializedTC(unittest.TestCase):
+    N = 64
+
+    def assertSameAsGeneric(self, op, spec_args, generic_args):
+        try:
+            ref = op(*generic_args)
+        except Exception as e:
+            with self.assertRaises(e.__class__):
+                op(*spec_args)
+            return
+        res = op(*spec_args)
+        m = ref._dtype.all_mask()
+        self.assertIs(res._dtype, ref._dtype)
+        self.assertEqual((res.val & m, res.vld_mask), (ref.val & m, ref.vld_mask), (op, spec_args, ref))
+
+    def test_same_as_generic(self):
+        rand = Random(0)
+        for t in TYPES:
+            cls = get_specialized_bits3val_cls(t.bit_length(), t.signed)
+            self.assertIs(cls, get_specialized_bits3val_cls(t.bit_length(), t.signed))
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, t, self.N)
+            b[1::4] = a[1::4]
+            a_spec = [cls(t, v.val, v.vld_mask) for v in a]
+            b_spec = [cls(t, v.val, v.vld_mask) for v in b]
+            low, up = t.get_domain_range()
+            other_t = Bits3t(t.bit_length(), signed=not t.signed)
+            for x, y, xs, ys in zip(a, b, a_spec, b_spec):
+                for op in (invert, neg):
+                    self.assertSameAsGeneric(op, (xs,), (x,))
+                for op in (add, sub, mul, and_, or_, xor, lt, le, gt, ge, ne, _eq):
+                    self.assertSameAsGeneric(op, (xs, ys), (x, y))
+                    for c in (low, up, 0, low - 1, up + 1):
+                        self.assertSameAsGeneric(op, (xs, c), (x, c))
+                    # fallback to generic implementation
+                    self.assertSameAsGeneric(op, (xs, y), (x, y))
+                    self.assertSameAsGeneric(op, (xs, other_t.from_py(0)), (x, other_t.from_py(0)))
+
+    def test_enable_specialization(self):
+        t = Bits3t(8, signed=True, name="specialized_int8_t")
+        v = t.from_py(-1)
+        t.enable_specialization()
+        cls = get_specialized_bits3val_cls(8, True)
+        v0 = t.from_py(-1)
+        self.assertIs(v0.__class__, cls)
+        self.assertIsInstance(v0, Bits3val)
+        self.assertIs(v.__class__, Bits3val)
+        self.assertIs((v0 + 1).__class__, cls)
+        self.assertEqual(int(v0 + v0), -2)
+        self.assertFalse(v0._cast_sign(False)._dtype.signed)
+        self.assertIs(v0._cast_sign(False).__class__, Bits3val)
+        self.assertTrue(pickle.loads(pickle.dumps(v0))._is(v0))
+
+        t = Bits3t(4, name="specialized_uint4_t")
+        t.enable_const_pool()
+        v = t.from_py(1)
+        t.enable_specialization()
+        # shared values keep identity
+        self.assertIs(t.from_py(1), v)
+        self.assertIs(v.__class__, get_specialized_bits3val_cls(4, False))
+        self.assertIs(v + 1, t.from_py(2))
+        self.assertTrue((v < 2)._is(Bits3t(1).from_py(1)))
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Bits3valSpecializedTC("test_same_as_generic")])
+    suite = testLoader.loadTestsFromTestCase(Bits3valSpecializedTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
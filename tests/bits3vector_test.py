@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from operator import add, sub, mul, and_, or_, xor, floordiv, mod, lt, le, \
+    gt, ge, ne, invert, neg, lshift, rshift
+from random import Random
+import unittest
+
+from pyMathBitPrecise.bits3t import Bits3t
+from tests.bits3tBaseTC import TYPES, random_values
+
+try:
+    import numpy as np
+    from pyMathBitPrecise.bits3vector import Bits3Vector
+except ImportError:
+    np = None
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class Bits3VectorTC(unittest.TestCase):
+    N = 64
+
+    def assertSameAsScalar(self, vec: "Bits3Vector", values: list):
+        res = vec.to_values()
+        self.assertEqual(len(res), len(values))
+        for v, ref in zip(res, values):
+            self.assertIs(v._dtype, ref._dtype)
+            m = ref._dtype.all_mask()
+            self.assertEqual((v.val, v.vld_mask), (ref.val & m, ref.vld_mask), (v, ref))
+
+    def test_conversions(self):
+        for t in TYPES:
+            values = random_values(Random(0), t, self.N)
+            vec = Bits3Vector.from_values(t, values)
+            self.assertSameAsScalar(vec, values)
+
+            low, up = t.get_domain_range()
+            ints = [low, up, 0, up // 2]
+            vec = Bits3Vector.from_py(t, ints)
+            self.assertEqual(vec.to_py(), ints)
+            self.assertEqual(Bits3Vector.from_py(t, np.array(ints, dtype=np.int64 if t.signed else np.uint64)).to_py(), ints)
+            with self.assertRaises(ValueError):
+                Bits3Vector.from_py(t, [up + 1])
+            vec = Bits3Vector.from_py(t, [None, 1])
+            self.assertEqual(vec.to_values()[0].vld_mask, 0)
+
+    def test_unary(self):
+        for t in TYPES:
+            values = random_values(Random(1), t, self.N)
+            vec = Bits3Vector.from_values(t, values)
+            for op in (invert, neg):
+                self.assertSameAsScalar(op(vec), [op(v) for v in values])
+
+    def test_binary(self):
+        ops = [add, sub, mul, and_, or_, xor]
+        for t in TYPES:
+            rand = Random(2)
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, t, self.N)
+            va = Bits3Vector.from_values(t, a)
+            vb = Bits3Vector.from_values(t, b)
+            low, up = t.get_domain_range()
+            for op in ops:
+                self.assertSameAsScalar(op(va, vb), [op(x, y) for x, y in zip(a, b)])
+                # scalar operands
+                self.assertSameAsScalar(op(va, b[0]), [op(x, b[0]) for x in a])
+                for c in (low, up):
+                    self.assertSameAsScalar(op(va, c), [op(x, c) for x in a])
+                    if op is not mul:
+                        self.assertSameAsScalar(op(c, va), [op(c, x) for x in a])
+
+    def test_div(self):
+        for t in TYPES:
+            rand = Random(3)
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, t, self.N, nonzero=True)
+            va = Bits3Vector.from_values(t, a)
+            vb = Bits3Vector.from_values(t, b)
+            for op in (floordiv, mod):
+                self.assertSameAsScalar(op(va, vb), [op(x, y) for x, y in zip(a, b)])
+                self.assertSameAsScalar(op(va, 1), [op(x, 1) for x in a])
+                with self.assertRaises(ZeroDivisionError):
+                    op(va, 0)
+            # int operands out of range of the type are not converted to the type
+            for c in (3, -1, -3, 300, -300, 1 << 63, -(1 << 63), 1 << 70, -(1 << 70)):
+                for op in (floordiv, mod, mul):
+                    self.assertSameAsScalar(op(va, c), [op(x, c) for x in a])
+            # the same range check as for Bits3val
+            for op in (add, and_):
+                with self.assertRaises(ValueError):
+                    op(a[0], 1 << 70)
+                with self.assertRaises(ValueError):
+                    op(va, 1 << 70)
+
+    def test_cmp(self):
+        for t in TYPES:
+            rand = Random(4)
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, t, self.N)
+            # some equal values to test the ==
+            b[1::4] = a[1::4]
+            va = Bits3Vector.from_values(t, a)
+            vb = Bits3Vector.from_values(t, b)
+            for op in (lt, le, gt, ge, ne):
+                self.assertSameAsScalar(op(va, vb), [op(x, y) for x, y in zip(a, b)])
+                self.assertSameAsScalar(op(va, 1), [op(x, 1) for x in a])
+            self.assertSameAsScalar(va._eq(vb), [x._eq(y) for x, y in zip(a, b)])
+            self.assertSameAsScalar(va._eq(0), [x._eq(0) for x in a])
+
+        with self.assertRaises(TypeError):
+            Bits3Vector.from_py(Bits3t(8), [0]) < Bits3t(8, signed=True).from_py(0)
+
+    def test_shift_and_slice(self):
+        for t in TYPES:
+            w = t.bit_length()
+            values = random_values(Random(5), t, self.N)
+            vec = Bits3Vector.from_values(t, values)
+            for sh in sorted({0, 1, w // 2, w - 1, w, w + 3}):
+                for op in (lshift, rshift):
+                    self.assertSameAsScalar(op(vec, sh), [op(v, sh) for v in values])
+            self.assertSameAsScalar(vec << t.from_py(None), [v << t.from_py(None) for v in values])
+            self.assertSameAsScalar(vec[w - 1], [v[w - 1] for v in values])
+            self.assertSameAsScalar(vec[w:], [v[w:] for v in values])
+            if w > 1:
+                self.assertSameAsScalar(vec[w - 1:1], [v[w - 1:1] for v in values])
+
+    def test_too_wide(self):
+        with self.assertRaises(ValueError):
+            Bits3Vector.from_py(Bits3t(65), [0])
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Bits3VectorTC("test_binary")])
+    suite = testLoader.loadTestsFromTestCase(Bits3VectorTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
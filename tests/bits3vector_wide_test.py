@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+from operator import add, sub, and_, or_, xor, invert, neg, lshift, rshift
+from random import Random
+import unittest
+
+from pyMathBitPrecise.bits3t import Bits3t
+from tests.bits3tBaseTC import random_values
+
+try:
+    import numpy as np
+    from pyMathBitPrecise.bits3vector_wide import Bits3WideVector
+except ImportError:
+    np = None
+
+TYPES = [
+    Bits3t(8),
+    Bits3t(64, signed=True),
+    Bits3t(65),
+    Bits3t(128),
+    Bits3t(200, signed=True),
+    Bits3t(512),
+    Bits3t(4096, signed=True),
+]
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class Bits3WideVectorTC(unittest.TestCase):
+    N = 32
+
+    def assertSameAsScalar(self, vec: "Bits3WideVector", values: list):
+        res = vec.to_values()
+        self.assertEqual(len(res), len(values))
+        for v, ref in zip(res, values):
+            self.assertIs(v._dtype, ref._dtype)
+            m = ref._dtype.all_mask()
+            self.assertEqual((v.val, v.vld_mask), (ref.val & m, ref.vld_mask), (v, ref))
+
+    def test_conversions(self):
+        for t in TYPES:
+            values = random_values(Random(0), t, self.N)
+            vec = Bits3WideVector.from_values(t, values)
+            self.assertSameAsScalar(vec, values)
+
+            low, up = t.get_domain_range()
+            ints = [low, up, 0, up // 2]
+            self.assertEqual(Bits3WideVector.from_py(t, ints).to_py(), ints)
+            with self.assertRaises(ValueError):
+                Bits3WideVector.from_py(t, [up + 1])
+
+    def test_unary(self):
+        for t in TYPES:
+            values = random_values(Random(1), t, self.N)
+            vec = Bits3WideVector.from_values(t, values)
+            for op in (invert, neg):
+                self.assertSameAsScalar(op(vec), [op(v) for v in values])
+
+    def test_binary(self):
+        for t in TYPES:
+            rand = Random(2)
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, t, self.N)
+            # values to test the carry propagation
+            a[1] = t.from_py(-1 if t.signed else t.all_mask())
+            b[1] = t.from_py(1)
+            va = Bits3WideVector.from_values(t, a)
+            vb = Bits3WideVector.from_values(t, b)
+            low, up = t.get_domain_range()
+            for op in (add, sub, and_, or_, xor):
+                self.assertSameAsScalar(op(va, vb), [op(x, y) for x, y in zip(a, b)])
+                self.assertSameAsScalar(op(va, b[0]), [op(x, b[0]) for x in a])
+                for c in (low, up):
+                    self.assertSameAsScalar(op(va, c), [op(x, c) for x in a])
+                    self.assertSameAsScalar(op(c, va), [op(c, x) for x in a])
+
+    def test_shift(self):
+        for t in TYPES:
+            w = t.bit_length()
+            values = random_values(Random(3), t, self.N)
+            vec = Bits3WideVector.from_values(t, values)
+            for sh in sorted({0, 1, 63, 64, 65, w // 2, w - 1, w, w + 3}):
+                for op in (lshift, rshift):
+                    self.assertSameAsScalar(op(vec, sh), [op(v, sh) for v in values])
+            self.assertSameAsScalar(vec >> t.from_py(None), [v >> t.from_py(None) for v in values])
+
+    def test_slice_and_concat(self):
+        for t in TYPES:
+            w = t.bit_length()
+            rand = Random(4)
+            a = random_values(rand, t, self.N)
+            b = random_values(rand, Bits3t(13), self.N)
+            va = Bits3WideVector.from_values(t, a)
+            vb = Bits3WideVector.from_values(b[0]._dtype, b)
+            self.assertSameAsScalar(va[w - 1], [v[w - 1] for v in a])
+            self.assertSameAsScalar(va[w:], [v[w:] for v in a])
+            self.assertSameAsScalar(va[w - 1:w // 2], [v[w - 1:w // 2] for v in a])
+            self.assertSameAsScalar(va._concat(vb), [x._concat(y) for x, y in zip(a, b)])
+            self.assertSameAsScalar(vb._concat(va), [y._concat(x) for x, y in zip(a, b)])
+            self.assertSameAsScalar(va._concat(b[0]), [x._concat(b[0]) for x in a])
+
+
+if __name__ == '__main__':
+    testLoader = unittest.TestLoader()
+    # suite = unittest.TestSuite([Bits3WideVectorTC("test_binary")])
+    suite = testLoader.loadTestsFromTestCase(Bits3WideVectorTC)
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)